@@ -15,9 +15,12 @@ class UserAdmin(DjangoUserAdmin):
                     "phone_number",
                     "profile_photo",
                     "profile_completed",
+                    "max_ongoing_requests",
+                    "ongoing_request_count",
                 )
             },
         ),
     )
     list_display = ("username", "email", "role", "is_active", "profile_completed")
+    readonly_fields = ("ongoing_request_count",)
     list_filter = ("role", "is_active")
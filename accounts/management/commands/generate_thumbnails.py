@@ -0,0 +1,58 @@
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from accounts import thumbnails
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = "Create missing profile-photo thumbnails, e.g. for photos uploaded before thumbnails existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate thumbnails that already exist.")
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete thumbnails that no user's current photo refers to.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        users = User.objects.exclude(profile_photo="").exclude(profile_photo__isnull=True).only(
+            "pk", "profile_photo", "profile_photo_hash"
+        )
+        generated = failed = 0
+        for user in users.iterator():
+            try:
+                with user.profile_photo.open("rb") as photo:
+                    photo_hash = thumbnails.generate(photo, force=options["force"])
+            except OSError as exc:
+                failed += 1
+                self.stderr.write(f"Skipping {user.profile_photo.name}: {exc}")
+                continue
+            generated += 1
+            if photo_hash != user.profile_photo_hash:
+                user.profile_photo_hash = photo_hash
+                user.save(update_fields=["profile_photo_hash"])
+
+        pruned = 0
+        if options["prune"]:
+            in_use = set(User.objects.exclude(profile_photo_hash="").values_list("profile_photo_hash", flat=True))
+            try:
+                _dirs, files = default_storage.listdir(thumbnails.DIRECTORY)
+            except FileNotFoundError:
+                files = []
+            for filename in files:
+                if filename.split("-", 1)[0] not in in_use:
+                    default_storage.delete(f"{thumbnails.DIRECTORY}/{filename}")
+                    pruned += 1
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Thumbnails ready for {generated} photos ({failed} unreadable, {pruned} stale files pruned) "
+                f"in {elapsed * 1000:.1f} ms."
+            )
+        )
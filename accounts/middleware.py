@@ -1,32 +1,88 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
+from django.http import JsonResponse
 from django.shortcuts import redirect
-from django.urls import resolve, Resolver404
+from django.urls import resolve, reverse, Resolver404
 
+# Session flag caching ``not user.must_complete_profile()``; refreshed by
+# ``remember_profile_state`` whenever the profile is saved.
+SESSION_KEY = "_profile_complete"
+ALWAYS_EXEMPT = ("login", "logout", "accounts:update")
+# Views read by scripts and EventSource, which cannot follow a redirect to
+# an HTML form; they get a 403 JSON body instead.
+NON_HTML_VIEWS = ("hub:api-", "hub:account-autocomplete", "hub:notification-stream")
 
-def _is_exempt(view_name: str) -> bool:
-    if not view_name:
-        return False
-    exempt = set(settings.PROFILE_COMPLETION_EXEMPT_URLS)
-    exempt.update({"login", "logout", "accounts:update"})
-    if view_name in exempt:
-        return True
-    if view_name.startswith("admin:"):
-        return True
-    return False
+
+def remember_profile_state(request, user=None):
+    """Store in the session whether the user's profile is complete, and return it."""
+    user = user or request.user
+    complete = not user.must_complete_profile()
+    request.session[SESSION_KEY] = complete
+    return complete
 
 
 class ProfileCompletionMiddleware:
+    """Send signed-in users with an incomplete profile to the profile page.
+
+    The completion state is read once per session and then served from the
+    session, so complete profiles cost a dictionary lookup per request. URLs
+    are only resolved for users who still have to complete their profile.
+    API, autocomplete and stream views, and any request that does not accept
+    HTML, are answered with a 403 JSON body instead of a redirect.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.exempt_names = frozenset(settings.PROFILE_COMPLETION_EXEMPT_URLS).union(ALWAYS_EXEMPT)
+        self.exempt_namespaces = ("admin:",)
+        self.exempt_paths = tuple(
+            url for url in (settings.STATIC_URL, settings.MEDIA_URL) if url and url.startswith("/")
+        )
 
     def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = None if self.skips(request) else self.check(request)
+        return response or self.get_response(request)
+
+    async def __acall__(self, request):
+        # The lazy user and the session load from the database, so they are
+        # read on a worker thread.
+        response = None if self.skips(request) else await sync_to_async(self.check)(request)
+        return response or await self.get_response(request)
+
+    def skips(self, request):
+        return request.path.startswith(self.exempt_paths)
+
+    def check(self, request):
+        """The response that stops ``request``, or ``None`` to let it through."""
         user = getattr(request, "user", None)
-        if user and user.is_authenticated and user.must_complete_profile():
-            try:
-                match = resolve(request.path_info)
-                view_name = match.view_name
-            except Resolver404:
-                view_name = None
-            if not _is_exempt(view_name):
-                return redirect("accounts:update")
-        return self.get_response(request)
+        if not user or not user.is_authenticated:
+            return None
+        complete = request.session.get(SESSION_KEY)
+        if complete is None:
+            complete = remember_profile_state(request, user)
+        if complete:
+            return None
+        view_name = self.view_name(request.path_info)
+        if view_name in self.exempt_names or view_name.startswith(self.exempt_namespaces):
+            return None
+        if view_name.startswith(NON_HTML_VIEWS) or not request.accepts("text/html"):
+            return JsonResponse(
+                {"detail": "Complete your profile to continue.", "redirect": reverse("accounts:update")},
+                status=403,
+            )
+        return redirect("accounts:update")
+
+    @staticmethod
+    def view_name(path):
+        try:
+            return resolve(path).view_name
+        except Resolver404:
+            return ""
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_counts(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Notification = apps.get_model("hub", "Notification")
+    unread = (
+        Notification.objects.filter(recipient=OuterRef("pk"), is_read=False)
+        .order_by()
+        .values("recipient")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    User.objects.update(unread_notification_count=Coalesce(Subquery(unread), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_update_account_manager_contacts"),
+        ("hub", "0004_notification_sla_dedupe"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="unread_notification_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_ongoing_counts(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    Request = apps.get_model("hub", "Request")
+    ongoing = (
+        Request.objects.filter(engineer=OuterRef("pk"), status="ongoing")
+        .order_by()
+        .values("engineer")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    User.objects.update(ongoing_request_count=Coalesce(Subquery(ongoing), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_user_unread_notification_count"),
+        ("hub", "0005_notification_unread_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="ongoing_request_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="max_ongoing_requests",
+            field=models.PositiveSmallIntegerField(
+                default=5,
+                help_text="Maximum number of ongoing requests this engineer can be assigned.",
+            ),
+        ),
+        migrations.RunPython(backfill_ongoing_counts, migrations.RunPython.noop),
+    ]
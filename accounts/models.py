@@ -2,6 +2,8 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
 
+from . import thumbnails
+
 
 class User(AbstractUser):
     class Roles(models.TextChoices):
@@ -15,8 +17,66 @@ class User(AbstractUser):
         validators=[RegexValidator(r"^[0-9+\-() ]*$", "Phone number contains invalid characters.")],
     )
     profile_photo = models.ImageField(upload_to="profile_photos/", blank=True, null=True)
+    # Content hash naming the photo's thumbnails; see accounts.thumbnails.
+    profile_photo_hash = models.CharField(max_length=16, blank=True, default="", editable=False)
     role = models.CharField(max_length=20, choices=Roles.choices, default=Roles.REQUESTOR)
     profile_completed = models.BooleanField(default=False)
+    # Maintained by hub.notifications alongside Notification writes; never
+    # assign it directly.
+    unread_notification_count = models.PositiveIntegerField(default=0, editable=False)
+    # Ongoing requests assigned to this engineer, maintained by Request.save.
+    ongoing_request_count = models.PositiveIntegerField(default=0, editable=False)
+    max_ongoing_requests = models.PositiveSmallIntegerField(
+        default=5,
+        help_text="Maximum number of ongoing requests this engineer can be assigned.",
+    )
+
+    COUNTER_FIELDS = ("unread_notification_count", "ongoing_request_count")
+
+    def save(self, *args, **kwargs):
+        # A full save would write back counters that may have moved since the
+        # user was loaded, so leave them out unless asked for explicitly.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "profile_photo" in update_fields:
+            self._refresh_photo_thumbnails()
+            if update_fields is not None and "profile_photo_hash" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "profile_photo_hash"]
+        super().save(*args, **kwargs)
+
+    def _refresh_photo_thumbnails(self):
+        """Make thumbnails for a newly assigned photo, before the row is written."""
+        if not self.profile_photo:
+            self.profile_photo_hash = ""
+        elif not self.profile_photo._committed:
+            try:
+                self.profile_photo_hash = thumbnails.generate(self.profile_photo)
+            except OSError:
+                # Not decodable by Pillow; templates fall back to the original.
+                self.profile_photo_hash = ""
+
+    def avatar_url(self, size="sm", fmt="webp"):
+        if not self.profile_photo:
+            return ""
+        if self.profile_photo_hash:
+            return thumbnails.url(self.profile_photo_hash, size, fmt)
+        return self.profile_photo.url
+
+    @property
+    def avatar_webp(self):
+        return self.avatar_url("sm", "webp")
+
+    @property
+    def avatar_jpeg(self):
+        return self.avatar_url("sm", "jpg")
 
     def must_complete_profile(self) -> bool:
         required_fields = [self.email, self.phone_number, self.profile_photo]
@@ -0,0 +1,87 @@
+"""Square profile-photo thumbnails at fixed sizes, in WebP and JPEG.
+
+Thumbnails are named after a hash of the source image's contents, e.g.
+``profile_photos/thumbs/3f2a9c0d41e6b7a8-64.webp``. A new photo therefore
+gets new URLs and the files can be served with far-future cache headers.
+Users store the hash in ``profile_photo_hash``; templates build the URLs
+from it without touching storage.
+"""
+
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+DIRECTORY = "profile_photos/thumbs"
+# Pixel widths; "sm" covers the 32-36px avatars on high-density screens.
+SIZES = {"sm": 64}
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+HASH_LENGTH = 16
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def name(photo_hash, size="sm", fmt="webp"):
+    return f"{DIRECTORY}/{photo_hash}-{SIZES[size]}.{fmt}"
+
+
+def url(photo_hash, size="sm", fmt="webp"):
+    return default_storage.url(name(photo_hash, size, fmt))
+
+
+def names(photo_hash):
+    return [name(photo_hash, size, fmt) for size in SIZES for fmt in FORMATS]
+
+
+def generate(file, force=False):
+    """Write every thumbnail of the image in ``file`` and return its content hash.
+
+    Files that already exist are kept unless ``force`` is set, so identical
+    uploads share their thumbnails. Raises ``OSError`` for unreadable images.
+    """
+    photo_hash = content_hash(file)
+    pending = [
+        (size, fmt)
+        for size in SIZES
+        for fmt in FORMATS
+        if force or not default_storage.exists(name(photo_hash, size, fmt))
+    ]
+    if not pending:
+        return photo_hash
+    with Image.open(file) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    file.seek(0)
+    for size, fmt in pending:
+        pixels = SIZES[size]
+        # Crop to a centred square, matching the avatars' object-fit: cover.
+        thumbnail = ImageOps.fit(image, (pixels, pixels), Image.Resampling.LANCZOS)
+        if fmt == "jpg" and thumbnail.mode == "RGBA":
+            background = Image.new("RGB", thumbnail.size, (255, 255, 255))
+            background.paste(thumbnail, mask=thumbnail.getchannel("A"))
+            thumbnail = background
+        format_name, options = FORMATS[fmt]
+        buffer = BytesIO()
+        thumbnail.save(buffer, format_name, **options)
+        target = name(photo_hash, size, fmt)
+        if force and default_storage.exists(target):
+            default_storage.delete(target)
+        default_storage.save(target, ContentFile(buffer.getvalue()))
+    return photo_hash
+
+
+def delete(photo_hash):
+    for target in names(photo_hash):
+        default_storage.delete(target)
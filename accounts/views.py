@@ -14,6 +14,7 @@ from .forms import (
     ROLE_LABELS,
     RoleAuthenticationForm,
 )
+from .middleware import remember_profile_state
 
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
@@ -30,6 +31,7 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         user = self.request.user
         user.profile_completed = True
         user.save(update_fields=["profile_completed"])
+        remember_profile_state(self.request, user)
         if password_changed:
             update_session_auth_hash(self.request, self.object)
             messages.success(self.request, "Profile updated successfully. Your password has been changed.")
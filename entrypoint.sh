@@ -8,4 +8,4 @@ if [ "$#" -gt 0 ]; then
 	exec "$@"
 fi
 
-exec gunicorn request_hub.wsgi:application --bind 0.0.0.0:8000
+exec gunicorn --config gunicorn.conf.py
@@ -0,0 +1,69 @@
+"""Production gunicorn settings, loaded automatically from the working directory.
+
+SERVER_MODE=wsgi (default) runs threaded ``gthread`` workers on the WSGI app.
+SERVER_MODE=asgi runs uvicorn workers on the ASGI app, which also serves the
+live-update stream. The remaining knobs come from ``GUNICORN_*`` environment
+variables; command-line flags still take precedence.
+"""
+
+import multiprocessing
+import os
+
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+cores = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+if SERVER_MODE == "asgi":
+    wsgi_app = "request_hub.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    # One event loop per core; blocking ORM calls run in each worker's thread pool.
+    workers = int(os.getenv("GUNICORN_WORKERS", cores))
+else:
+    wsgi_app = "request_hub.wsgi:application"
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+    # Requests mostly wait on the database, so a few threads per process
+    # serve more concurrent users than extra processes would, for less memory.
+    workers = int(os.getenv("GUNICORN_WORKERS", cores + 1))
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# A per-process cache would keep invalidations and version counters inside
+# one worker, leaving the others stale; share the file cache instead. The
+# workers inherit the environment and read it when they load the app.
+if os.getenv("CACHE_BACKEND") == "locmem" and workers > 1:
+    os.environ["CACHE_BACKEND"] = "file"
+    os.environ.pop("CACHE_LOCATION", None)
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers now and then so slow leaks cannot build up; the jitter
+# keeps them from all restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+# Heartbeat files on tmpfs; a container's overlay filesystem can stall them.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+
+def worker_exit(server, worker):
+    # Runs in the exiting worker: write out what it counted since the last flush.
+    if os.getenv("METRICS_DIR"):
+        from hub import metrics
+
+        metrics.registry.maybe_flush(force=True)
+
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is gone, killed workers included.
+    # The snapshot is folded into the retired totals rather than deleted, so
+    # the summed counters never go backwards.
+    metrics_dir = os.getenv("METRICS_DIR", "")
+    if metrics_dir:
+        from hub import metrics
+
+        metrics.retire(metrics_dir, worker.pid)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Account, Notification, Request, StatusLog
+from .models import Account, ArchivedRequest, EngineerSkill, EventCursor, Job, Notification, Request, RequestEvent, StatusLog
 
 
 @admin.register(Account)
@@ -22,12 +22,23 @@ class RequestAdmin(admin.ModelAdmin):
     list_filter = ("priority", "status", "product_category", "engagement_type")
     search_fields = ("reference_code", "account__name", "account_manager")
     autocomplete_fields = ("requestor", "account", "engineer")
+    list_select_related = ("account",)
+
+
+@admin.register(EngineerSkill)
+class EngineerSkillAdmin(admin.ModelAdmin):
+    list_display = ("engineer", "product_category")
+    list_filter = ("product_category",)
+    search_fields = ("engineer__username", "engineer__first_name", "engineer__last_name")
+    autocomplete_fields = ("engineer",)
+    list_select_related = ("engineer",)
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display = ("recipient", "message", "created_at", "is_read")
     list_filter = ("is_read",)
+    list_select_related = ("recipient",)
     search_fields = ("message", "recipient__username")
 
 
@@ -35,4 +46,49 @@ class NotificationAdmin(admin.ModelAdmin):
 class StatusLogAdmin(admin.ModelAdmin):
     list_display = ("request", "author", "created_at")
     list_filter = ("created_at",)
+    list_select_related = ("request__account", "author")
     search_fields = ("request__reference_code", "author__username", "message")
+
+
+@admin.register(RequestEvent)
+class RequestEventAdmin(admin.ModelAdmin):
+    # The log is append-only; deleted requests keep their events, so show the raw id.
+    list_display = ("id", "request_id", "kind", "actor", "created_at")
+    list_filter = ("kind",)
+    list_select_related = ("actor",)
+    search_fields = ("=request__id",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(EventCursor)
+class EventCursorAdmin(admin.ModelAdmin):
+    list_display = ("name", "position", "updated_at")
+
+
+@admin.register(ArchivedRequest)
+class ArchivedRequestAdmin(admin.ModelAdmin):
+    list_display = ("reference_code", "account", "priority", "end_date", "archived_at")
+    list_filter = ("priority", "product_category")
+    search_fields = ("reference_code", "account__name", "account_manager")
+    list_select_related = ("account",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("status", "task")
+    readonly_fields = ("locked_by", "locked_until", "last_error", "created_at", "finished_at")
@@ -0,0 +1,208 @@
+"""Daily request rollups behind the analytics page.
+
+``DailyRequestStats`` holds one row per day for each (engineer, account,
+priority, product category) combination. A request counts as opened on its
+``start_date`` and as completed on its ``end_date``. Once a request change
+commits, only the days it touches are rebuilt: its start and end dates,
+before and after the change. Reports therefore read a few rows per day and
+never scan ``Request``. Archived requests (``hub.archive``) keep counting,
+so moving rows to the archive needs no rebuild.
+
+``schedule_rebuild`` hands those days to the job worker. Changes that commit
+within the same ``REBUILD_DELAY_SECONDS`` slot share one job per day, so a
+burst of edits costs one rebuild per day instead of one per save. With
+``JOB_QUEUE_ANALYTICS`` off, days are rebuilt right after the commit.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, DurationField, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from . import jobs
+from .models import ArchivedRequest, DailyRequestStats, Request
+
+DIMENSIONS = ("engineer_id", "account_id", "priority", "product_category")
+METRICS = ("opened", "completed", "completed_on_time", "completion_days")
+BATCH_SIZE = 1000
+# PostgreSQL advisory locks: rebuilds of given days hold this key shared
+# plus (LOCK_ID, day ordinal) for each day, so only rebuilds of the same
+# day wait on each other. Range rebuilds hold this key exclusively.
+LOCK_ID = 0x6875625F  # "hub_"
+REBUILD_DELAY_SECONDS = 10
+
+
+def affected_days(instance, changes=None):
+    days = {instance.start_date, instance.end_date}
+    for field in ("start_date", "end_date"):
+        if changes and field in changes:
+            days.add(changes[field].old)
+    return days - {None}
+
+
+def _window(field, start=None, end=None, days=None):
+    filters = {}
+    if days is not None:
+        filters[f"{field}__in"] = days
+    if start is not None:
+        filters[f"{field}__gte"] = start
+    if end is not None:
+        filters[f"{field}__lte"] = end
+    return filters
+
+
+def compute(start=None, end=None, days=None):
+    """Aggregate ``Request`` and ``ArchivedRequest`` into ``{(day, *DIMENSIONS): {metric: value}}``."""
+    buckets = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    for model in (Request, ArchivedRequest):
+        opened = (
+            model.objects.filter(**_window("start_date", start, end, days))
+            .order_by()
+            .values("start_date", *DIMENSIONS)
+            .annotate(total=Count("pk"))
+        )
+        for row in opened.iterator():
+            buckets[(row["start_date"], *(row[name] for name in DIMENSIONS))]["opened"] += row["total"]
+
+        completed = (
+            model.objects.filter(end_date__isnull=False, **_window("end_date", start, end, days))
+            .order_by()
+            .values("end_date", *DIMENSIONS)
+            .annotate(
+                total=Count("pk"),
+                on_time=Count("pk", filter=Q(end_date__lte=F("due_date"))),
+                duration=Sum(F("end_date") - F("start_date"), output_field=DurationField()),
+            )
+        )
+        for row in completed.iterator():
+            bucket = buckets[(row["end_date"], *(row[name] for name in DIMENSIONS))]
+            bucket["completed"] += row["total"]
+            bucket["completed_on_time"] += row["on_time"]
+            bucket["completion_days"] += max(row["duration"].days, 0) if row["duration"] else 0
+    return buckets
+
+
+def rebuild(start=None, end=None, days=None):
+    """Replace the rollup rows for the given days (or date range) from the request tables."""
+    if days is not None:
+        days = sorted(days)
+        if not days:
+            return 0
+    with transaction.atomic():
+        # Compute under the lock, so a rebuild that waited on another one
+        # reads the rows committed since and never writes older figures.
+        _lock(days)
+        rows = [
+            DailyRequestStats(day=key[0], **dict(zip(DIMENSIONS, key[1:])), **metrics)
+            for key, metrics in compute(start, end, days).items()
+        ]
+        DailyRequestStats.objects.filter(**_window("day", start, end, days)).delete()
+        DailyRequestStats.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def _lock(days=None):
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if days is None:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [LOCK_ID])
+            return
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [LOCK_ID])
+        # Sorted, so two rebuilds sharing days always lock them in the same order.
+        for day in days:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s, %s)", [LOCK_ID, day.toordinal()])
+
+
+def schedule_rebuild(days):
+    """Rebuild the rollups of ``days`` after the current transaction commits."""
+    days = sorted(set(days) - {None})
+    if not days:
+        return
+    if settings.JOB_QUEUE_ANALYTICS:
+        transaction.on_commit(lambda: _enqueue_rebuilds(days))
+    else:
+        transaction.on_commit(lambda: rebuild(days=days))
+
+
+def _enqueue_rebuilds(days):
+    # Runs after the commit. The job starts at the end of the current slot,
+    # after this change is visible; later changes in the slot hit the
+    # dedupe key and are picked up by the same job.
+    slot = int(timezone.now().timestamp()) // REBUILD_DELAY_SECONDS + 1
+    run_at = datetime.fromtimestamp(slot * REBUILD_DELAY_SECONDS, tz=dt_timezone.utc)
+    for day in days:
+        jobs.enqueue(
+            "hub.rebuild_request_stats",
+            {"day": day.isoformat()},
+            run_at=run_at,
+            dedupe_key=f"analytics:{day.isoformat()}:{slot}",
+        )
+
+
+def month_starts(first, last):
+    month = first.replace(day=1)
+    while month <= last:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def with_rates(row):
+    completed = row["completed"] or 0
+    row["compliance"] = round(100 * row["completed_on_time"] / completed, 1) if completed else None
+    row["mean_days"] = round(row["completion_days"] / completed, 1) if completed else None
+    return row
+
+
+def _totals():
+    return {metric: Sum(metric) for metric in METRICS}
+
+
+def monthly(since, until):
+    """One row per calendar month in ``since..until``, zero-filled."""
+    found = {
+        row["month"]: row
+        for row in DailyRequestStats.objects.filter(day__gte=since, day__lte=until)
+        .annotate(month=TruncMonth("day"))
+        .values("month")
+        .annotate(**_totals())
+        .order_by("month")
+    }
+    series = []
+    for month in month_starts(since, until):
+        row = dict(found.get(month) or dict.fromkeys(METRICS, 0), month=month)
+        series.append(with_rates(row))
+    return series
+
+
+def by_engineer(since, until):
+    rows = (
+        DailyRequestStats.objects.filter(day__gte=since, day__lte=until)
+        .values("engineer_id")
+        .annotate(**_totals())
+        .order_by("-completed", "engineer_id")
+    )
+    return [with_rates(row) for row in rows]
+
+
+def by_account(since, until, limit=10):
+    rows = (
+        DailyRequestStats.objects.filter(day__gte=since, day__lte=until)
+        .values("account__name")
+        .annotate(**_totals())
+        .order_by("-opened", "account__name")[:limit]
+    )
+    return [with_rates(row) for row in rows]
+
+
+def default_window(months, today=None):
+    today = today or timezone.now().date()
+    start = today.replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+    return start, today
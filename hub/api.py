@@ -0,0 +1,397 @@
+"""JSON API over requests, status logs, request events and notifications.
+
+List endpoints share one contract:
+
+* ``?fields=a,b`` returns only the named fields (all fields by default).
+* ``?after=<cursor>`` continues from the ``next`` cursor of the previous page.
+  Pages are keyset-paginated in change order, so a sync client can follow
+  them to the end and resume later.
+* ``?since=<ISO 8601 datetime>`` limits the result to rows changed after that
+  time.
+* Every response carries an ETag derived from a few index-backed aggregates
+  (no row counts). A matching ``If-None-Match`` returns 304 before any page
+  is built.
+
+Clients authenticate with the regular session login; writes need the CSRF
+token like any other form post.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.views import View
+
+from accounts.models import User
+
+from . import assignment
+from .forms import BulkActionForm, RequestAdminForm, RequestForm, StatusLogForm
+from .models import Notification, Request, RequestEvent, StatusLog
+from .pagination import InvalidCursor, KeysetPaginator
+from .views import RequestDetailView, visible_requests
+
+MAX_PAGE_SIZE = 500
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400, errors=None):
+        super().__init__(message)
+        self.status = status
+        self.errors = errors
+
+
+def _etag(*parts):
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+class ApiView(View):
+    """Base for JSON endpoints: session auth, JSON errors and conditional GETs.
+
+    ``fields`` maps each public field name to the ``values()`` lookup that
+    produces it.
+    """
+
+    fields: dict = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"detail": "Authentication required."}, status=401)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as exc:
+            payload = {"detail": str(exc)}
+            if exc.errors:
+                payload["errors"] = exc.errors
+            return JsonResponse(payload, status=exc.status)
+
+    def selected_fields(self):
+        requested = self.request.GET.get("fields")
+        if not requested:
+            return list(self.fields)
+        names = [name.strip() for name in requested.split(",") if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown field(s): {', '.join(unknown)}.")
+        return names
+
+    def serialize(self, rows, names):
+        return [{name: row[self.fields[name]] for name in names} for row in rows]
+
+    def conditional(self, etag, build):
+        """Answer 304/412 from ``etag`` when the request allows it, else ``build()``."""
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = build()
+        elif response.status_code == 412:
+            raise ApiError("The resource has changed since it was fetched.", status=412)
+        if response.status_code in (200, 201, 304):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def parse_body(self):
+        try:
+            payload = json.loads(self.request.body or b"{}")
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise ApiError("Request body must be valid JSON.") from exc
+        if not isinstance(payload, dict):
+            raise ApiError("Request body must be a JSON object.")
+        return payload
+
+
+class ApiListView(ApiView):
+    """Keyset-paginated, incrementally syncable list endpoint.
+
+    ``keys`` orders the pages (the last key must be unique) and
+    ``changed_field`` is the timestamp compared against ``since``.
+    ``version`` holds aggregates over the matching rows that make up the
+    ETag; ``get_version()`` can add values from elsewhere so that removals are
+    noticed too. Subclasses must define ``get_queryset()``, which is checked
+    when the class is created.
+    """
+
+    keys: tuple = ("id",)
+    changed_field = "created_at"
+    version: dict = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, "get_queryset", None)):
+            raise TypeError(f"{cls.__name__} must define get_queryset().")
+
+    def filter_queryset(self, queryset):
+        since = self.request.GET.get("since")
+        if since:
+            moment = parse_datetime(since)
+            if moment is None:
+                raise ApiError("`since` must be an ISO 8601 datetime.")
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            queryset = queryset.filter(**{f"{self.changed_field}__gt": moment})
+        return queryset
+
+    def get_version(self, queryset):
+        return list(queryset.order_by().aggregate(**self.version).values())
+
+    def page_size(self):
+        try:
+            limit = int(self.request.GET.get("limit", settings.API_PAGE_SIZE))
+        except ValueError as exc:
+            raise ApiError("`limit` must be an integer.") from exc
+        return max(1, min(limit, MAX_PAGE_SIZE))
+
+    def get(self, request, *args, **kwargs):
+        names = self.selected_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = _etag(request.user.pk, request.GET.urlencode(), *self.get_version(queryset))
+
+        def build():
+            lookups = {self.fields[name] for name in names} | set(self.keys)
+            paginator = KeysetPaginator(queryset.values(*lookups), keys=self.keys, per_page=self.page_size())
+            try:
+                page = paginator.page(request.GET.get("after"))
+            except InvalidCursor as exc:
+                raise ApiError(str(exc)) from exc
+            return JsonResponse({"results": self.serialize(page, names), "next": page.next_cursor})
+
+        return self.conditional(etag, build)
+
+
+REQUEST_FIELDS = {
+    "id": "id",
+    "reference_code": "reference_code",
+    "status": "status",
+    "priority": "priority",
+    "engagement_type": "engagement_type",
+    "product_category": "product_category",
+    "account": "account__name",
+    "account_manager": "account_manager",
+    "requestor": "requestor_id",
+    "engineer": "engineer_id",
+    "description": "description",
+    "start_date": "start_date",
+    "due_date": "due_date",
+    "end_date": "end_date",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
+class RequestListApiView(ApiListView):
+    fields = REQUEST_FIELDS
+    keys = ("updated_at", "id")
+    changed_field = "updated_at"
+    version = {"changed": Max("updated_at")}
+
+    def get_queryset(self):
+        return visible_requests(self.request.user)
+
+    def get_version(self, queryset):
+        # Every change that can drop a row from the list without touching the
+        # remaining ones (delete, archive, reassignment) appends an event, so
+        # the newest event id stands in for a row count.
+        last_event = RequestEvent.objects.aggregate(last=Max("pk"))["last"]
+        return [*super().get_version(queryset), last_event]
+
+    def post(self, request):
+        if request.user.role != User.Roles.REQUESTOR:
+            raise ApiError("Only requestors can submit requests.", status=403)
+        form = RequestForm(self.parse_body())
+        if not form.is_valid():
+            raise ApiError("Invalid request.", errors=form.errors.get_json_data())
+        req = form.save(commit=False)
+        req.requestor = request.user
+        req.account_manager = request.user.get_full_name().strip() or request.user.username
+        _save(req, auto_assign=True)
+        return JsonResponse(_request_payload(req.pk), status=201)
+
+
+def _request_payload(pk, names=None):
+    names = names or list(REQUEST_FIELDS)
+    row = Request.objects.filter(pk=pk).values(*{REQUEST_FIELDS[name] for name in names}).get()
+    return {name: row[REQUEST_FIELDS[name]] for name in names}
+
+
+def _save(instance, auto_assign=False):
+    try:
+        if auto_assign:
+            assignment.save_request(instance)
+        else:
+            instance.save()
+    except ValidationError as exc:
+        # A concurrent assignment can still fill the engineer's last slot
+        # between form validation and the guarded counter update.
+        raise ApiError("Conflicting update.", status=409, errors=exc.message_dict) from exc
+
+
+class RequestDetailApiView(ApiView):
+    fields = REQUEST_FIELDS
+
+    def get_object(self, pk):
+        obj = visible_requests(self.request.user).select_related("account").filter(pk=pk).first()
+        if obj is None:
+            raise ApiError("Not found.", status=404)
+        return obj
+
+    def etag(self, obj):
+        return _etag(obj.pk, obj.updated_at.isoformat(), self.request.GET.get("fields", ""))
+
+    def get(self, request, pk):
+        obj = self.get_object(pk)
+        names = self.selected_fields()
+        return self.conditional(self.etag(obj), lambda: JsonResponse(_request_payload(obj.pk, names)))
+
+    def patch(self, request, pk):
+        obj = self.get_object(pk)
+        user = request.user
+        if user.role == User.Roles.ADMIN:
+            form_class = RequestAdminForm
+        elif user.role == User.Roles.REQUESTOR:
+            form_class = RequestForm
+        else:
+            raise ApiError("You cannot edit this request.", status=403)
+
+        def build():
+            # Fields missing from the body keep their current values.
+            current = form_class(instance=obj)
+            data = {name: current[name].value() for name in current.fields}
+            data.update(self.parse_body())
+            form = form_class(data, instance=obj)
+            if not form.is_valid():
+                raise ApiError("Invalid request.", errors=form.errors.get_json_data())
+            # Only new requests are auto-assigned; edits keep the engineer unless the body changes it.
+            _save(form.save(commit=False))
+            return JsonResponse(_request_payload(obj.pk, self.selected_fields()))
+
+        # ``If-Match`` with a stale ETag is answered with 412.
+        response = self.conditional(self.etag(obj), build)
+        if response.status_code == 200:
+            obj.refresh_from_db(fields=["updated_at"])
+            response["ETag"] = self.etag(obj)
+        return response
+
+
+class RequestBulkApiView(ApiView):
+    """Admin actions over many requests; the body mirrors ``BulkActionForm``.
+
+    Responds with the ids that changed and an ``errors`` object naming each
+    skipped request and why.
+    """
+
+    def post(self, request):
+        if request.user.role != User.Roles.ADMIN:
+            raise ApiError("Only admins can run bulk actions.", status=403)
+        form = BulkActionForm(self.parse_body())
+        if not form.is_valid():
+            raise ApiError("Invalid bulk action.", errors=form.errors.get_json_data())
+        outcome = form.apply(request.user)
+        return JsonResponse({"updated": outcome.updated, "errors": outcome.errors})
+
+
+class StatusLogListApiView(ApiListView):
+    fields = {
+        "id": "id",
+        "request": "request_id",
+        "author": "author_id",
+        "message": "message",
+        "created_at": "created_at",
+    }
+    version = {"last": Max("pk"), "total": Count("pk")}
+
+    def get_queryset(self):
+        queryset = StatusLog.objects.filter(request__in=visible_requests(self.request.user).values("pk"))
+        request_id = self.request.GET.get("request")
+        if request_id:
+            if not request_id.isdigit():
+                raise ApiError("`request` must be a request id.")
+            queryset = queryset.filter(request_id=request_id)
+        return queryset
+
+    def post(self, request):
+        payload = self.parse_body()
+        request_obj = visible_requests(request.user).filter(pk=payload.get("request")).first()
+        if request_obj is None or not RequestDetailView._user_can_comment(request.user, request_obj):
+            raise ApiError("Unknown request.", status=404)
+        form = StatusLogForm(payload)
+        if not form.is_valid():
+            raise ApiError("Invalid status log.", errors=form.errors.get_json_data())
+        log = form.save(commit=False)
+        log.request = request_obj
+        log.author = request.user
+        log.save()
+        RequestDetailView._notify_status_update(log)
+        row = StatusLog.objects.filter(pk=log.pk).values(*self.fields.values()).get()
+        return JsonResponse(self.serialize([row], list(self.fields))[0], status=201)
+
+
+NOTIFICATION_FIELDS = {
+    "id": "id",
+    "message": "message",
+    "kind": "kind",
+    "is_read": "is_read",
+    "related_request": "related_request_id",
+    "created_at": "created_at",
+}
+
+
+class RequestEventListApiView(ApiListView):
+    """The request event log in id order; ``after`` resumes from the last event a client saw."""
+
+    fields = {
+        "id": "id",
+        "request": "request_id",
+        "kind": "kind",
+        "actor": "actor_id",
+        "data": "data",
+        "created_at": "created_at",
+    }
+    # Events are only ever appended, so the newest id changes with every addition.
+    version = {"last": Max("pk")}
+
+    def get_queryset(self):
+        queryset = RequestEvent.objects.all()
+        if self.request.user.role != User.Roles.ADMIN:
+            queryset = queryset.filter(request__in=visible_requests(self.request.user).values("pk"))
+        request_id = self.request.GET.get("request")
+        if request_id:
+            if not request_id.isdigit():
+                raise ApiError("`request` must be a request id.")
+            queryset = queryset.filter(request_id=request_id)
+        return queryset
+
+
+class NotificationListApiView(ApiListView):
+    fields = NOTIFICATION_FIELDS
+    version = {
+        "last": Max("pk"),
+        "total": Count("pk"),
+        "unread": Count("pk", filter=Q(is_read=False)),
+    }
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(recipient=self.request.user)
+        if self.request.GET.get("unread") == "1":
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+
+class NotificationDetailApiView(ApiView):
+    fields = NOTIFICATION_FIELDS
+
+    def patch(self, request, pk):
+        notification = Notification.objects.filter(pk=pk, recipient=request.user).first()
+        if notification is None:
+            raise ApiError("Not found.", status=404)
+        payload = self.parse_body()
+        if set(payload) - {"is_read"} or payload.get("is_read") is not True:
+            raise ApiError('Only {"is_read": true} is supported.')
+        notification.mark_read()
+        row = Notification.objects.filter(pk=pk).values(*self.fields.values()).get()
+        return JsonResponse(self.serialize([row], list(self.fields))[0])
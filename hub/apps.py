@@ -6,5 +6,9 @@ class HubConfig(AppConfig):
     name = "hub"
 
     def ready(self):
-        # Import signal handlers
-        from . import signals  # noqa: F401
+        # Import signal handlers and register background tasks
+        from . import signals, tasks  # noqa: F401
+        from .business_days import check_settings
+
+        # Fail at startup rather than on the first request save.
+        check_settings()
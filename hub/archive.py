@@ -0,0 +1,141 @@
+"""Moving old completed requests out of the tables the live pages query.
+
+``archive()`` moves completed requests whose ``end_date`` is more than
+``ARCHIVE_AFTER_DAYS`` ago into ``ArchivedRequest``, together with their
+status logs and notifications. Each batch is copied and deleted in one
+transaction and keeps its ids. The dashboard, capacity checks and SLA sweep
+therefore only touch active rows, while old links keep working:
+
+* ``RequestDetailView`` and the CSV export read through to the archive.
+* Analytics rollups count both tables.
+* ``RequestEvent`` history stays in place and gains an "archived" event.
+
+Archived requests are read-only and no longer show up in search.
+
+On PostgreSQL with ``ARCHIVE_PARTITIONING`` the archive tables are
+partitioned by year of ``created_at`` (migration 0012); a batch creates the
+partitions it needs before it is copied.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import caching, notifications
+from .models import (
+    ArchivedNotification,
+    ArchivedRequest,
+    ArchivedStatusLog,
+    Notification,
+    Request,
+    RequestEvent,
+    StatusLog,
+)
+
+BATCH_SIZE = 500
+# Live model, archive model and the column holding the request id. Children
+# come first: rows are deleted in this order and copied in reverse.
+TABLES = (
+    (Notification, ArchivedNotification, "related_request_id"),
+    (StatusLog, ArchivedStatusLog, "request_id"),
+    (Request, ArchivedRequest, "pk"),
+)
+
+
+class Archived(NamedTuple):
+    requests: int = 0
+    status_logs: int = 0
+    notifications: int = 0
+
+    def __add__(self, other):
+        return Archived(*(mine + theirs for mine, theirs in zip(self, other)))
+
+
+def cutoff(days=None, today=None):
+    """Completed requests that ended before this day are due for archiving."""
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    return (today or timezone.localdate()) - timedelta(days=days)
+
+
+def candidates(before):
+    return Request.objects.filter(status=Request.Status.COMPLETED, end_date__lt=before)
+
+
+def _partitioned():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [ArchivedRequest._meta.db_table])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def _create_partitions(years):
+    with connection.cursor() as cursor:
+        for _model, archive_model, _key in TABLES:
+            table = archive_model._meta.db_table
+            for year in sorted(years):
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table}_{year} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+                )
+
+
+def _copies(model, archive_model, key, pks, **extra):
+    names = [field.attname for field in archive_model._meta.concrete_fields if field.attname not in extra]
+    rows = model.objects.filter(**{f"{key}__in": pks}).order_by().values(*names)
+    return [archive_model(**row, **extra) for row in rows]
+
+
+def _archive_batch(before, batch_size, partitioned):
+    with transaction.atomic():
+        batch = list(
+            candidates(before).select_for_update().order_by("pk").values_list("pk", "reference_code")[:batch_size]
+        )
+        if not batch:
+            return Archived()
+        pks = [pk for pk, _code in batch]
+        now = timezone.now()
+        copies = {
+            model: _copies(model, archive_model, key, pks, **({"archived_at": now} if model is Request else {}))
+            for model, archive_model, key in TABLES
+        }
+        if partitioned:
+            _create_partitions({row.created_at.year for rows in copies.values() for row in rows})
+        for model, archive_model, _key in reversed(TABLES):
+            archive_model.objects.bulk_create(copies[model])
+        for model, _archive_model, key in TABLES:
+            # Raw deletes skip the delete signals: archiving is not a deletion,
+            # and the counters and caches they would touch are handled below.
+            model.objects.filter(**{f"{key}__in": pks})._raw_delete(connection.alias)
+
+        notes = copies[Notification]
+        unread = Counter(note.recipient_id for note in notes if not note.is_read)
+        notifications.adjust_unread({user_id: -count for user_id, count in unread.items()})
+        RequestEvent.objects.bulk_create(
+            RequestEvent(request_id=pk, kind=RequestEvent.Kind.ARCHIVED, data={"reference_code": code})
+            for pk, code in batch
+        )
+        caching.invalidate_on_commit(
+            "requests",
+            *(f"request:{pk}" for pk in pks),
+            *(f"logs:{pk}" for pk in pks),
+            *(f"notifications:{user_id}" for user_id in {note.recipient_id for note in notes}),
+        )
+    return Archived(len(batch), len(copies[StatusLog]), len(notes))
+
+
+def archive(days=None, batch_size=BATCH_SIZE):
+    """Move every completed request that ended ``days`` (default ``ARCHIVE_AFTER_DAYS``) ago or earlier."""
+    before = cutoff(days)
+    partitioned = _partitioned()
+    total = Archived()
+    while True:
+        moved = _archive_batch(before, batch_size, partitioned)
+        total += moved
+        if moved.requests < batch_size:
+            return total
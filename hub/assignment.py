@@ -0,0 +1,159 @@
+"""Automatic engineer assignment, balanced by load and product skills.
+
+``Balancer`` keeps one min-heap per product category, keyed by each
+engineer's share of their capacity in use, plus one heap for generalists
+(engineers with no ``EngineerSkill`` rows). Picking the least-loaded
+qualified engineer and recording the assignment are O(log n). Entries are
+never updated in place: a load change pushes a fresh entry and outdated ones
+are dropped when they reach the top.
+
+The balancer is built from the cached roster and skill list, so proposing an
+engineer for a new request costs no queries while nothing has changed.
+``plan_rebalance`` replays the whole ongoing backlog through an empty
+balancer, most urgent requests first, to even out the queues.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.core.exceptions import ValidationError
+
+from . import caching, roster
+from .models import EngineerSkill, Request
+
+GENERALIST = ""
+# Priority order for placing work: high priority first, then earliest due.
+URGENCY = {Request.Priority.HIGH: 0, Request.Priority.MEDIUM: 1}
+
+
+def _skills():
+    rows = EngineerSkill.objects.values_list("engineer_id", "product_category")
+    skills = defaultdict(list)
+    for engineer_id, category in rows:
+        skills[engineer_id].append(category)
+    return dict(skills)
+
+
+def skills():
+    """``{engineer pk: [product categories]}``, cached until a skill changes."""
+    return caching.summary("skills", ("skills",), _skills)
+
+
+class Balancer:
+    def __init__(self, engineers, skills, loads=None):
+        """``loads`` overrides the engineers' current ongoing counts (e.g. zeros for a replan)."""
+        self.engineers = {engineer.pk: engineer for engineer in engineers}
+        self.load = {pk: engineer.ongoing for pk, engineer in self.engineers.items()}
+        if loads is not None:
+            self.load = {pk: loads.get(pk, 0) for pk in self.engineers}
+        self.pools = {pk: set(skills.get(pk) or [GENERALIST]) for pk in self.engineers}
+        self.heaps = defaultdict(list)
+        for pk in self.engineers:
+            self._push(pk)
+
+    @classmethod
+    def current(cls, **kwargs):
+        return cls(roster.engineers(), skills(), **kwargs)
+
+    def has_room(self, pk):
+        return self.load[pk] < self.engineers[pk].capacity
+
+    def _push(self, pk):
+        if not self.has_room(pk):
+            return
+        load = self.load[pk]
+        entry = (load / self.engineers[pk].capacity, load, pk)
+        for pool in self.pools[pk]:
+            heapq.heappush(self.heaps[pool], entry)
+
+    def _peek(self, pool):
+        heap = self.heaps.get(pool)
+        while heap:
+            _share, load, pk = heap[0]
+            if load == self.load[pk] and self.has_room(pk):
+                return pk
+            heapq.heappop(heap)
+        return None
+
+    def qualified(self, pk, category):
+        return category in self.pools[pk] or GENERALIST in self.pools[pk]
+
+    def pick(self, category):
+        """Least-loaded engineer with a free slot: skilled in ``category`` first, then generalists."""
+        return self._peek(category) or self._peek(GENERALIST)
+
+    def take(self, pk):
+        self.load[pk] += 1
+        self._push(pk)
+
+    def mark_full(self, pk):
+        # The counter moved since the roster was cached.
+        self.load[pk] = self.engineers[pk].capacity
+
+
+def propose(request_obj, balancer=None):
+    """The engineer the balancer would pick for ``request_obj``, or None."""
+    balancer = balancer or Balancer.current()
+    pk = balancer.pick(request_obj.product_category)
+    return balancer.engineers[pk] if pk else None
+
+
+def save_request(request_obj, balancer=None):
+    """Save ``request_obj``, first assigning the proposed engineer if it has none.
+
+    If the chosen engineer's last slot is taken between the pick and the
+    guarded counter update in ``Request.save``, the next candidate is tried.
+    """
+    if request_obj.engineer_id or request_obj.status != Request.Status.ONGOING:
+        request_obj.save()
+        return
+    balancer = balancer or Balancer.current()
+    while True:
+        pk = balancer.pick(request_obj.product_category)
+        request_obj.engineer_id = pk
+        try:
+            request_obj.save()
+            return
+        except ValidationError as exc:
+            if pk is None or "engineer" not in exc.message_dict:
+                raise
+            balancer.mark_full(pk)
+
+
+class Move(NamedTuple):
+    pk: int
+    reference_code: str
+    old: int
+    new: int
+
+
+def plan_rebalance(max_skew=1):
+    """Moves that even out the ongoing backlog, as ``(moves, projected loads)``.
+
+    Requests are placed most urgent first on an empty balancer. A request
+    keeps its engineer while that engineer is qualified, has room and is at
+    most ``max_skew`` requests busier than the best candidate. Urgent work
+    therefore stays put and the moves fall on the least urgent requests.
+    """
+    balancer = Balancer.current(loads={})
+    backlog = Request.objects.filter(status=Request.Status.ONGOING).values_list(
+        "pk", "reference_code", "engineer_id", "product_category", "priority", "due_date"
+    )
+    ordered = sorted(backlog, key=lambda row: (URGENCY.get(row[4], len(URGENCY)), row[5] is None, row[5], row[0]))
+    moves = []
+    for pk, code, current, category, _priority, _due in ordered:
+        best = balancer.pick(category)
+        keep = (
+            current in balancer.engineers
+            and balancer.qualified(current, category)
+            and balancer.has_room(current)
+            and (best is None or balancer.load[current] - balancer.load[best] <= max_skew)
+        )
+        if keep or best is None:
+            if current in balancer.engineers:
+                balancer.take(current)
+            continue
+        balancer.take(best)
+        moves.append(Move(pk, code, current, best))
+    return moves, balancer.load
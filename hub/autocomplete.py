@@ -0,0 +1,121 @@
+"""In-memory account name index for the autocomplete endpoint.
+
+Names come from ``ACCOUNT_NAME_SUGGESTIONS`` and the ``Account`` table. They
+are normalised by case-folding and collapsing whitespace. Lookups try a
+prefix match on a sorted key list first and fall back to trigram overlap for
+typos and mid-word matches. Each process rebuilds its index only when the
+shared version number, bumped on every Account change, moves.
+"""
+
+import bisect
+import re
+import threading
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .constants import ACCOUNT_NAME_SUGGESTIONS
+from .models import Account
+
+VERSION_CACHE_KEY = "hub:accounts:index-version"
+MIN_TRIGRAM_SCORE = 0.3
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(name: str) -> str:
+    return _WHITESPACE.sub(" ", name or "").strip().casefold()
+
+
+def tidy(name: str) -> str:
+    """Collapse runs of whitespace while keeping the typed casing."""
+    return _WHITESPACE.sub(" ", name or "").strip()
+
+
+def _trigrams(key: str):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class AccountIndex:
+    def __init__(self, names, version=0):
+        self.version = version
+        # The first spelling seen for a key wins; Account rows are added
+        # before the constants so stored names stay canonical.
+        self._canonical = {}
+        for name in names:
+            key = normalize(name)
+            if key:
+                self._canonical.setdefault(key, tidy(name))
+        self._keys = sorted(self._canonical)
+        self._grams = defaultdict(set)
+        for key in self._keys:
+            for gram in _trigrams(key):
+                self._grams[gram].add(key)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def canonical(self, name):
+        """The stored spelling of ``name`` if an equivalent one exists, else ``None``."""
+        return self._canonical.get(normalize(name))
+
+    def search(self, query, limit=10):
+        key = normalize(query)
+        if not key:
+            return []
+        results = []
+        start = bisect.bisect_left(self._keys, key)
+        for candidate in self._keys[start:]:
+            if not candidate.startswith(key) or len(results) >= limit:
+                break
+            results.append(candidate)
+        if len(results) < limit:
+            grams = _trigrams(key)
+            scores = defaultdict(int)
+            for gram in grams:
+                for candidate in self._grams.get(gram, ()):
+                    scores[candidate] += 1
+            seen = set(results)
+            ranked = sorted(
+                (
+                    (shared / len(grams | _trigrams(candidate)), candidate)
+                    for candidate, shared in scores.items()
+                    if candidate not in seen
+                ),
+                key=lambda item: (-item[0], item[1]),
+            )
+            results.extend(
+                candidate for score, candidate in ranked[: limit - len(results)] if score >= MIN_TRIGRAM_SCORE
+            )
+        return [self._canonical[candidate] for candidate in results]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 1, None)
+        version = cache.get(VERSION_CACHE_KEY, 1)
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 2, None)
+
+
+def get_index():
+    global _index
+    version = current_version()
+    if _index is None or _index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                names = [*Account.objects.values_list("name", flat=True), *ACCOUNT_NAME_SUGGESTIONS]
+                _index = AccountIndex(names, version=version)
+    return _index
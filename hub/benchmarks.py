@@ -0,0 +1,100 @@
+"""Timing and query-count scenarios for ``manage.py benchmark_hub``.
+
+Each scenario runs one warm-up call and then ``repeat`` timed calls. Views go
+through the test client with the full middleware stack. SQL statements are
+counted with the same ``QueryRecorder`` that feeds ``/metrics``. Results are
+plain dicts, so runs from different releases can be saved as JSON and
+compared.
+"""
+
+import io
+import statistics
+import time
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from accounts import middleware as accounts_middleware
+from accounts.models import User
+
+from .middleware import QueryRecorder
+from .models import Request, StatusLog
+
+
+def _busiest(field, role):
+    """The user with the most requests in ``field``, so list views show full pages."""
+    row = (
+        Request.objects.filter(**{f"{field}__role": role})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .order_by("-total")
+        .first()
+    )
+    return User.objects.get(pk=row[field]) if row else None
+
+
+def _get(client, url):
+    def call():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}.")
+        if response.streaming:
+            for _chunk in response.streaming_content:
+                pass
+        return response
+
+    return call
+
+
+def _client(user):
+    client = Client()
+    client.force_login(user)
+    # Time the pages themselves, not the redirect to an unfinished profile.
+    session = client.session
+    session[accounts_middleware.SESSION_KEY] = True
+    session.save()
+    return client
+
+
+def scenarios():
+    """``{name: callable}`` for everything that can run against the current data."""
+    found = {}
+    admin = User.objects.filter(role=User.Roles.ADMIN).order_by("pk").first()
+    engineer = _busiest("engineer", User.Roles.ENGINEER)
+    requestor = _busiest("requestor", User.Roles.REQUESTOR)
+    for name, user in (("admin", admin), ("engineer", engineer), ("requestor", requestor)):
+        if user:
+            found[f"dashboard:{name}"] = _get(_client(user), reverse("hub:dashboard"))
+
+    detail = StatusLog.objects.order_by().values("request").annotate(total=Count("pk")).order_by("-total").first()
+    if admin and detail:
+        found["request_detail"] = _get(_client(admin), reverse("hub:request-detail", args=[detail["request"]]))
+    if admin:
+        found["export_csv"] = _get(_client(admin), reverse("hub:request-export"))
+    found["check_sla"] = lambda: call_command("check_sla", "--dry-run", stdout=io.StringIO())
+    return found
+
+
+def measure(func, repeat):
+    func()
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = recorder.count
+    timings.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(timings[0], 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[min(len(timings) - 1, round(0.95 * (len(timings) - 1)))], 2),
+        "queries": queries,
+    }
@@ -0,0 +1,288 @@
+"""Admin actions applied to many requests at once.
+
+Each action locks and reads the selected rows in one query, checks them
+together, writes the change with a single ``UPDATE`` (and its history with
+one ``RequestEvent`` insert) and sends its notifications in one bulk write. ``Request.save()`` and the
+``fields_changed`` handlers are bypassed, so the side effects they would
+have had (engineer load counters, notifications, cached fragments, analytics
+rollups and live updates) are applied here for the whole set.
+
+Rows that cannot take the change are skipped and reported in
+``Outcome.errors``; the rest are still applied.
+"""
+
+from collections import Counter, defaultdict
+from typing import NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import User
+
+from . import analytics, caching, notifications, realtime
+from .models import Request, RequestEvent, recount_engineer_load, release_engineer_slots
+from .tracking import FieldChange
+
+MAX_REQUESTS = 500
+ROW_FIELDS = (
+    "pk",
+    "reference_code",
+    "status",
+    "priority",
+    "engineer_id",
+    "requestor_id",
+    "start_date",
+    "due_date",
+    "end_date",
+)
+
+
+class Outcome(NamedTuple):
+    updated: list
+    # Reference code (or "#<pk>" for rows that no longer exist) -> message.
+    errors: dict
+
+
+def _lock(pks):
+    """Rows for ``pks`` ordered by due date, plus errors for the ids that were not found."""
+    rows = list(
+        Request.objects.select_for_update()
+        .filter(pk__in=pks)
+        .order_by("due_date", "pk")
+        .values(*ROW_FIELDS)
+    )
+    found = {row["pk"] for row in rows}
+    errors = {f"#{pk}": "Request no longer exists." for pk in pks if pk not in found}
+    return rows, errors
+
+
+def _reserve(engineer_id, wanted):
+    """Take up to ``wanted`` ongoing slots from an engineer.
+
+    Returns ``(taken, limit)``. Each attempt is one guarded UPDATE, as in
+    ``Request._update_engineer_load``, so concurrent assignments cannot
+    overbook the engineer.
+    """
+    users = User.objects.filter(pk=engineer_id)
+    limit = None
+    while wanted > 0:
+        taken = users.filter(ongoing_request_count__lte=F("max_ongoing_requests") - wanted).update(
+            ongoing_request_count=F("ongoing_request_count") + wanted
+        )
+        if taken:
+            caching.invalidate_on_commit("engineer-load")
+            return wanted, limit
+        load = users.values_list("ongoing_request_count", "max_ongoing_requests").first()
+        if load is None:
+            break
+        limit = load[1]
+        wanted = min(wanted - 1, load[1] - load[0])
+    return 0, limit
+
+
+def _claim_slots(rows_by_engineer, errors):
+    """Reserve a slot for each row; rows past their engineer's capacity go to ``errors``."""
+    accepted = []
+    for engineer_id, rows in rows_by_engineer.items():
+        taken, limit = _reserve(engineer_id, len(rows))
+        accepted += rows[:taken]
+        for row in rows[taken:]:
+            errors[row["reference_code"]] = Request._capacity_message(limit)
+    return accepted
+
+
+def _related(row):
+    # Notifications only need the key; avoids loading each request.
+    return Request(pk=row["pk"], reference_code=row["reference_code"])
+
+
+def _events(rows, field, new):
+    """History for setting ``field`` to ``new`` (a value, or a function of the row) on ``rows``."""
+    return [
+        event
+        for row in rows
+        for event in RequestEvent.for_changes(
+            _related(row), False, {field: FieldChange(row[field], new(row) if callable(new) else new)}
+        )
+    ]
+
+
+def _changed(pks, days=(), previous_engineers=None):
+    """Queue what ``fields_changed`` handlers would do for rows written with ``update()``."""
+    caching.invalidate_on_commit(*(f"request:{pk}" for pk in pks), "requests")
+    analytics.schedule_rebuild(days)
+    broker = realtime.get_broker()
+    if broker.publishes_saves:
+        admin_ids = notifications.admin_ids()
+        transaction.on_commit(lambda: broker.requests_updated(pks, admin_ids, previous_engineers))
+
+
+def _apply(rows, pending=(), days=(), previous_engineers=None, events=(), **values):
+    """Write ``values`` and ``events`` for ``rows`` and queue the side effects of the change."""
+    pks = [row["pk"] for row in rows]
+    if not pks:
+        return pks
+    if values:
+        Request.objects.filter(pk__in=pks).update(updated_at=timezone.now(), **values)
+        RequestEvent.objects.bulk_create(events)
+        _changed(pks, days, previous_engineers)
+    notifications.dispatch(pending)
+    return pks
+
+
+def _assignment_notices(rows, engineer_of):
+    return [
+        notification
+        for row in rows
+        for notification in notifications.build(
+            [engineer_of(row)],
+            f"You have been assigned to request {row['reference_code']}",
+            related_request=_related(row),
+        )
+    ]
+
+
+def assign(pks, engineer_id):
+    with transaction.atomic():
+        rows, errors = _lock(pks)
+        moving = [row for row in rows if row["engineer_id"] != engineer_id]
+        ongoing = [row for row in moving if row["status"] == Request.Status.ONGOING]
+        claimed = {row["pk"] for row in _claim_slots({engineer_id: ongoing}, errors)}
+        moved = [row for row in moving if row["status"] != Request.Status.ONGOING or row["pk"] in claimed]
+        release_engineer_slots(
+            Counter(row["engineer_id"] for row in moved if row["pk"] in claimed and row["engineer_id"])
+        )
+        updated = _apply(
+            moved,
+            _assignment_notices(moved, lambda row: engineer_id),
+            days=[day for row in moved for day in (row["start_date"], row["end_date"])],
+            previous_engineers={row["pk"]: row["engineer_id"] for row in moved},
+            events=_events(moved, "engineer_id", engineer_id),
+            engineer_id=engineer_id,
+        )
+    return Outcome(updated, errors)
+
+
+def reassign(moves):
+    """Move requests between engineers, ``{pk: engineer pk}``, in one transaction.
+
+    Meant for rebalancing, where requests can move both ways between the
+    same engineers: the counters of everyone involved are recomputed at the
+    end instead of reserving slots one move at a time. Raises
+    ``ValidationError`` if that leaves an engineer who received work over
+    capacity, for instance after a concurrent assignment.
+    """
+    with transaction.atomic():
+        rows, errors = _lock(list(moves))
+        moved = [row for row in rows if row["engineer_id"] != moves[row["pk"]]]
+        by_engineer = defaultdict(list)
+        for row in moved:
+            by_engineer[moves[row["pk"]]].append(row["pk"])
+        now = timezone.now()
+        for engineer_id, pks in by_engineer.items():
+            Request.objects.filter(pk__in=pks).update(engineer_id=engineer_id, updated_at=now)
+        RequestEvent.objects.bulk_create(_events(moved, "engineer_id", lambda row: moves[row["pk"]]))
+        recount_engineer_load({*by_engineer, *(row["engineer_id"] for row in moved)} - {None})
+        overloaded = User.objects.filter(
+            pk__in=list(by_engineer), ongoing_request_count__gt=F("max_ongoing_requests")
+        ).values_list("username", flat=True)
+        if overloaded:
+            raise ValidationError(f"Moving these requests would put {', '.join(overloaded)} over capacity.")
+        updated = [row["pk"] for row in moved]
+        if updated:
+            _changed(
+                updated,
+                days=[day for row in moved for day in (row["start_date"], row["end_date"])],
+                previous_engineers={row["pk"]: row["engineer_id"] for row in moved},
+            )
+        notifications.dispatch(_assignment_notices(moved, lambda row: moves[row["pk"]]))
+    return Outcome(updated, errors)
+
+
+def set_priority(pks, priority):
+    with transaction.atomic():
+        rows, errors = _lock(pks)
+        changed = [row for row in rows if row["priority"] != priority]
+        updated = _apply(
+            changed,
+            days=[day for row in changed for day in (row["start_date"], row["end_date"])],
+            events=_events(changed, "priority", priority),
+            priority=priority,
+        )
+    return Outcome(updated, errors)
+
+
+def set_status(pks, status):
+    if status == Request.Status.COMPLETED:
+        return complete(pks)
+    return reopen(pks)
+
+
+def complete(pks):
+    today = timezone.now().date()
+    with transaction.atomic():
+        rows, errors = _lock(pks)
+        closing = [row for row in rows if row["status"] == Request.Status.ONGOING]
+        release_engineer_slots(Counter(row["engineer_id"] for row in closing if row["engineer_id"]))
+        pending = []
+        for row in closing:
+            code = row["reference_code"]
+            pending += notifications.build(
+                [row["requestor_id"]], f"Request {code} has been completed.", related_request=_related(row)
+            )
+            pending += notifications.build(
+                [row["engineer_id"]], f"Request {code} closed by admin.", related_request=_related(row)
+            )
+        updated = _apply(
+            closing,
+            pending,
+            days=[today, *(row["start_date"] for row in closing)],
+            events=_events(closing, "status", Request.Status.COMPLETED),
+            status=Request.Status.COMPLETED,
+            end_date=today,
+        )
+    return Outcome(updated, errors)
+
+
+def reopen(pks):
+    with transaction.atomic():
+        rows, errors = _lock(pks)
+        reopening = [row for row in rows if row["status"] == Request.Status.COMPLETED]
+        by_engineer = defaultdict(list)
+        for row in reopening:
+            if row["engineer_id"]:
+                by_engineer[row["engineer_id"]].append(row)
+        claimed = {row["pk"] for row in _claim_slots(by_engineer, errors)}
+        reopened = [row for row in reopening if not row["engineer_id"] or row["pk"] in claimed]
+        updated = _apply(
+            reopened,
+            days=[day for row in reopened for day in (row["start_date"], row["end_date"])],
+            events=_events(reopened, "status", Request.Status.ONGOING),
+            status=Request.Status.ONGOING,
+            end_date=None,
+        )
+    return Outcome(updated, errors)
+
+
+def nudge(pks, target, sender):
+    """Ask each request's engineer or account manager (``target``) for an update."""
+    sender_name = sender.get_full_name() or sender.username
+    recipient_field = "engineer_id" if target == "engineer" else "requestor_id"
+    with transaction.atomic():
+        rows, errors = _lock(pks)
+        nudged, pending = [], []
+        for row in rows:
+            recipient = row[recipient_field]
+            if recipient is None:
+                errors[row["reference_code"]] = "This request does not have an assigned engineer yet."
+                continue
+            nudged.append(row)
+            pending += notifications.build(
+                [recipient],
+                f"{sender_name} requested an update on {row['reference_code']}.",
+                related_request=_related(row),
+            )
+        updated = _apply(nudged, pending)
+    return Outcome(updated, errors)
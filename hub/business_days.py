@@ -0,0 +1,157 @@
+"""Business-day arithmetic over a weekday calendar with public holidays.
+
+Dates are handled as proleptic ordinals (``date.toordinal()``, where ordinal 1
+is a Monday). Weekdays up to an ordinal are counted in closed form and
+holidays through a sorted ordinal index, so adding or counting business days
+costs a couple of bisects instead of a day-by-day loop.
+"""
+
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+HOLIDAY_YEARS = range(2000, 2101)
+
+
+def _weekdays_through(ordinal: int) -> int:
+    """Number of Monday-Friday ordinals in ``1..ordinal``."""
+    weeks, remainder = divmod(ordinal, 7)
+    return weeks * 5 + min(remainder, 5)
+
+
+def _weekday_ordinal(count: int) -> int:
+    """Smallest ordinal whose ``_weekdays_through`` reaches ``count``."""
+    weeks, remainder = divmod(count - 1, 5)
+    return weeks * 7 + remainder + 1
+
+
+class BusinessCalendar:
+    def __init__(self, holidays=()):
+        self.holidays = frozenset(holidays)
+        # Weekend holidays never change a business-day count, so only
+        # weekday holidays go into the index.
+        self._holiday_ordinals = sorted({day.toordinal() for day in self.holidays if day.weekday() < 5})
+
+    def _index(self, ordinal: int) -> int:
+        """Business days in ``1..ordinal``; only differences between two indexes are meaningful."""
+        return _weekdays_through(ordinal) - bisect_right(self._holiday_ordinals, ordinal)
+
+    def is_business_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """Business days after ``start`` up to and including ``end`` (negative if ``end`` is earlier)."""
+        return self._index(end.toordinal()) - self._index(start.toordinal())
+
+    def add_business_days(self, start: date, days: int) -> date:
+        """Return the ``days``-th business day after ``start``; ``start`` itself for ``days <= 0``."""
+        if days <= 0:
+            return start
+        start_ordinal = start.toordinal()
+        target = self._index(start_ordinal) + days
+        holidays = bisect_right(self._holiday_ordinals, start_ordinal)
+        # Each pass skips the holidays found so far; the candidate only moves
+        # forward, and stops once no further holiday falls before it.
+        while True:
+            candidate = _weekday_ordinal(target + holidays)
+            seen = bisect_right(self._holiday_ordinals, candidate)
+            if seen == holidays:
+                return date.fromordinal(candidate)
+            holidays = seen
+
+    def add_business_days_many(self, starts, days):
+        """Vectorised ``add_business_days`` over parallel iterables (``days`` may be a single int)."""
+        add = self.add_business_days
+        if isinstance(days, int):
+            return [add(start, days) if start else None for start in starts]
+        return [add(start, count) if start else None for start, count in zip(starts, days)]
+
+    def business_days_between_many(self, starts, ends):
+        between = self.business_days_between
+        return [between(start, end) if start and end else None for start, end in zip(starts, ends)]
+
+
+def _easter_sunday(year: int) -> date:
+    # Anonymous Gregorian algorithm (Meeus/Jones/Butcher).
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _last_monday(year: int, month: int) -> date:
+    last_day = date(year, month + 1, 1) - timedelta(days=1)
+    return last_day - timedelta(days=last_day.weekday())
+
+
+def philippine_holidays(years=HOLIDAY_YEARS):
+    """Regular and special non-working days that follow a fixed rule.
+
+    Lunar and proclaimed dates (Chinese New Year, Eid'l Fitr, Eid'l Adha,
+    ad-hoc special days) change every year; add them via
+    ``SLA_EXTRA_HOLIDAYS``.
+    """
+    holidays = set()
+    for year in years:
+        easter = _easter_sunday(year)
+        holidays.update(
+            {
+                date(year, 1, 1),  # New Year's Day
+                easter - timedelta(days=3),  # Maundy Thursday
+                easter - timedelta(days=2),  # Good Friday
+                easter - timedelta(days=1),  # Black Saturday
+                date(year, 4, 9),  # Araw ng Kagitingan
+                date(year, 5, 1),  # Labor Day
+                date(year, 6, 12),  # Independence Day
+                date(year, 8, 21),  # Ninoy Aquino Day
+                _last_monday(year, 8),  # National Heroes Day
+                date(year, 11, 1),  # All Saints' Day
+                date(year, 11, 30),  # Bonifacio Day
+                date(year, 12, 8),  # Feast of the Immaculate Conception
+                date(year, 12, 25),  # Christmas Day
+                date(year, 12, 30),  # Rizal Day
+                date(year, 12, 31),  # Last day of the year
+            }
+        )
+    return holidays
+
+
+HOLIDAY_CALENDARS = {
+    "PH": philippine_holidays,
+}
+
+
+def check_settings():
+    """Raise ``ImproperlyConfigured`` for an unknown calendar or a malformed extra holiday."""
+    calendar_name = getattr(settings, "SLA_HOLIDAY_CALENDAR", "")
+    if calendar_name and calendar_name not in HOLIDAY_CALENDARS:
+        raise ImproperlyConfigured(
+            f"SLA_HOLIDAY_CALENDAR={calendar_name!r} is not a known calendar; "
+            f"use one of {', '.join(sorted(HOLIDAY_CALENDARS))} or leave it empty."
+        )
+    for value in getattr(settings, "SLA_EXTRA_HOLIDAYS", ()):
+        try:
+            date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ImproperlyConfigured(f"SLA_EXTRA_HOLIDAYS entry {value!r} is not a YYYY-MM-DD date.") from None
+
+
+@lru_cache(maxsize=None)
+def get_calendar() -> BusinessCalendar:
+    """Calendar configured by ``SLA_HOLIDAY_CALENDAR`` and ``SLA_EXTRA_HOLIDAYS``."""
+    holidays = set()
+    calendar_name = getattr(settings, "SLA_HOLIDAY_CALENDAR", "")
+    if calendar_name:
+        holidays.update(HOLIDAY_CALENDARS[calendar_name]())
+    holidays.update(date.fromisoformat(value) for value in getattr(settings, "SLA_EXTRA_HOLIDAYS", ()))
+    return BusinessCalendar(holidays)
@@ -0,0 +1,152 @@
+"""Cached HTML fragments for the dashboard and request detail pages.
+
+Fragment keys embed version tokens that are stored in the cache as well:
+
+* ``request:<pk>`` for a request's dashboard row and change history,
+* ``logs:<pk>`` for a request's status-log list,
+* ``notifications:<user pk>`` for a user's dashboard sidebar,
+* ``engineer-load`` for the engineer roster (``hub.roster``),
+* ``skills`` for engineers' product skills (``hub.assignment``),
+* ``requests``, ``users`` and ``accounts`` for data shown across many
+  fragments (overdue totals, names and photos, account names).
+
+The signal handlers in ``hub.signals`` invalidate a token by deleting it once
+the write commits. The next read mints a new token, so old fragments are
+never read again and expire on their own. An evicted token is handled the
+same way, so losing it can only cause a miss, never a stale hit.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .metrics import registry
+
+VERSION_PREFIX = "hub:version:"
+# Bump the number when a fragment template changes, so a shared cache does
+# not keep serving fragments rendered by the previous release.
+FRAGMENT_PREFIX = "hub:fragment:2:"
+# Rendered in place of {% csrf_token %}'s value and swapped for the current
+# user's token on the way out, so one user's token never reaches another.
+CSRF_PLACEHOLDER = "__hub-csrf-token__"
+
+
+def versions(names):
+    """``{name: token}`` for ``names``, minting a token for any that are missing."""
+    keys = {f"{VERSION_PREFIX}{name}": name for name in names}
+    found = cache.get_many(keys)
+    minted = {key: uuid.uuid4().hex[:12] for key in keys if key not in found}
+    if minted:
+        cache.set_many(minted, None)
+        found.update(minted)
+    return {name: found[key] for key, name in keys.items()}
+
+
+def invalidate(*names):
+    cache.delete_many([f"{VERSION_PREFIX}{name}" for name in names])
+
+
+def invalidate_on_commit(*names):
+    # Invalidating before the commit would let a concurrent read cache the
+    # old rows again under the new token.
+    transaction.on_commit(lambda: invalidate(*names))
+
+
+def _key(kind, parts):
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f"{FRAGMENT_PREFIX}{kind}:{digest}"
+
+
+def get_or_render(kind, entries, render):
+    """``{id: html}`` for ``entries`` (``{id: (versions, parts)}``), rendering only misses.
+
+    ``versions`` names the tokens a fragment depends on and ``parts`` are any
+    other values that change its output. ``render(ids)`` returns
+    ``{id: html}`` for the misses, so they can be loaded in one query.
+    """
+    tokens = versions({name for names, _parts in entries.values() for name in names})
+    keys = {
+        ident: _key(kind, [*parts, *(tokens[name] for name in names)]) for ident, (names, parts) in entries.items()
+    }
+    cached = cache.get_many(keys.values())
+    missing = [ident for ident, key in keys.items() if key not in cached]
+    fresh = render(missing) if missing else {}
+    if fresh:
+        cache.set_many({keys[ident]: html for ident, html in fresh.items()}, settings.FRAGMENT_CACHE_TIMEOUT)
+    registry.inc("hub_fragment_cache_total", {"fragment": kind, "result": "hit"}, len(keys) - len(missing))
+    registry.inc("hub_fragment_cache_total", {"fragment": kind, "result": "miss"}, len(missing))
+    return {ident: cached[key] if key in cached else fresh.get(ident, "") for ident, key in keys.items()}
+
+
+def request_rows(request, queryset, pks, role, template_name="hub/_request_row.html"):
+    """Rendered dashboard rows for the requests ``pks``, in order, as seen by ``role``.
+
+    Only requests without a cached row are loaded from ``queryset``.
+    """
+    # Same date source as Request.is_overdue, so a row never outlives its
+    # overdue state.
+    today = timezone.now().date()
+    entries = {pk: ((f"request:{pk}", "users", "accounts"), (role, pk, today)) for pk in pks}
+
+    def render(missing):
+        items = queryset.in_bulk(missing)
+        return {
+            pk: render_to_string(template_name, {"item": item, "role": role, "csrf_token": CSRF_PLACEHOLDER})
+            for pk, item in items.items()
+        }
+
+    html = get_or_render("row", entries, render)
+    token = get_token(request) if role == "admin" else ""
+    return [mark_safe(html[pk].replace(CSRF_PLACEHOLDER, token)) for pk in pks if html[pk]]
+
+
+def status_log_list(request_obj, template_name="hub/_status_logs.html"):
+    """Rendered status-log list of ``request_obj``; the logs are only queried on a miss."""
+
+    def render(missing):
+        logs = request_obj.status_logs.select_related("author")
+        return {request_obj.pk: render_to_string(template_name, {"status_logs": logs})}
+
+    entries = {request_obj.pk: ((f"logs:{request_obj.pk}", "users"), (request_obj.pk,))}
+    return mark_safe(get_or_render("status_logs", entries, render)[request_obj.pk])
+
+
+def timeline(request_obj, template_name="hub/_timeline.html"):
+    """Rendered change history of ``request_obj`` from its ``RequestEvent`` rows (comments excluded)."""
+
+    def render(missing):
+        events = list(request_obj.events.exclude(kind="commented").select_related("actor"))
+        ids = {
+            value
+            for event in events
+            for key in ("old", "new", "engineer")
+            if isinstance(value := event.data.get(key), int)
+        }
+        users = get_user_model().objects.filter(pk__in=ids)
+        names = {user.pk: user.get_full_name() or user.username for user in users}
+        entries = [(event, event.describe(names)) for event in events]
+        return {request_obj.pk: render_to_string(template_name, {"entries": entries})}
+
+    entries = {request_obj.pk: ((f"request:{request_obj.pk}", "users"), (request_obj.pk,))}
+    return mark_safe(get_or_render("timeline", entries, render)[request_obj.pk])
+
+
+def summary(name, depends_on, build, *parts):
+    """Cached result of ``build()``, invalidated with the ``depends_on`` tokens."""
+    tokens = versions(depends_on)
+    key = _key(f"summary:{name}", [*parts, *(tokens[version] for version in depends_on)])
+    value = cache.get(key)
+    hit = value is not None
+    if not hit:
+        value = build()
+        cache.set(key, value, settings.FRAGMENT_CACHE_TIMEOUT)
+    registry.inc("hub_fragment_cache_total", {"fragment": f"summary:{name}", "result": "hit" if hit else "miss"})
+    return value
@@ -0,0 +1,59 @@
+"""Checkpointed reading of the ``RequestEvent`` log.
+
+A consumer names itself and processes events in id order::
+
+    for batch in events.read("analytics"):
+        handle(batch)
+
+Each batch is yielded inside a transaction that also moves the consumer's
+``EventCursor`` past it, so the consumer's own database writes and its
+checkpoint commit together. If ``handle`` raises, both roll back and the
+batch is read again next time. The cursor row is locked while a batch is
+processed, so two processes running the same consumer take turns.
+
+Ids are allocated at insert but become visible at commit, so a slow
+transaction can commit an event behind one that was already read. Events
+younger than ``SETTLE_SECONDS`` are therefore left for the next read; every
+transaction that writes events is far shorter than that.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EventCursor, RequestEvent
+
+BATCH_SIZE = 500
+SETTLE_SECONDS = 5
+
+
+def read(name, batch_size=BATCH_SIZE, settle=SETTLE_SECONDS):
+    """Yield lists of events after ``name``'s checkpoint until caught up."""
+    EventCursor.objects.get_or_create(name=name)
+    while True:
+        with transaction.atomic():
+            cursor = EventCursor.objects.select_for_update().get(name=name)
+            horizon = timezone.now() - timedelta(seconds=settle)
+            batch = []
+            for event in RequestEvent.objects.filter(pk__gt=cursor.position).order_by("pk")[:batch_size]:
+                if event.created_at > horizon:
+                    break
+                batch.append(event)
+            if not batch:
+                return
+            yield batch
+            cursor.position = batch[-1].pk
+            cursor.save(update_fields=["position", "updated_at"])
+        if len(batch) < batch_size:
+            return
+
+
+def position(name):
+    """Id of the last event ``name`` has processed (0 if it never ran)."""
+    return EventCursor.objects.filter(name=name).values_list("position", flat=True).first() or 0
+
+
+def reset(name, to=0):
+    """Move ``name``'s checkpoint, e.g. back to 0 to reprocess the whole log."""
+    EventCursor.objects.update_or_create(name=name, defaults={"position": to})
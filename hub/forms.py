@@ -1,14 +1,19 @@
 from django import forms
 
+from django.urls import reverse_lazy
 from django.utils import timezone
 
 from accounts.models import User
-from .constants import ACCOUNT_NAME_SUGGESTIONS
+from . import assignment, bulk, roster
+from .autocomplete import get_index, tidy
 from .models import Account, Request, StatusLog
 
 
 class AvatarSelect(forms.Select):
-    """Select widget that stores avatar metadata on each option."""
+    """Select widget that stores avatar and load metadata on each option.
+
+    Engineers at capacity are disabled unless they are the current choice.
+    """
 
     def __init__(self, *args, **kwargs):
         self.avatar_mapping = {}
@@ -24,27 +29,65 @@ class AvatarSelect(forms.Select):
                     option["attrs"]["data-avatar"] = meta["url"]
                 if meta.get("initial"):
                     option["attrs"]["data-initial"] = meta["initial"]
+                if meta.get("load"):
+                    option["attrs"]["data-load"] = meta["load"]
+                if meta.get("full") and not selected:
+                    option["attrs"]["disabled"] = True
         return option
 
 
-def _build_avatar_mapping(users):
-    mapping = {}
-    for user in users:
-        display_name = (user.get_full_name() or user.username or "?").strip()
-        initial = display_name[:1].upper() if display_name else "?"
-        avatar_url = ""
-        if getattr(user, "profile_photo", None):
-            try:
-                avatar_url = user.profile_photo.url
-            except ValueError:
-                avatar_url = ""
-        mapping[str(user.pk)] = {"url": avatar_url, "initial": initial}
-    return mapping
+class EngineerChoiceIterator:
+    """Lazily yields the roster as choices, like ``ModelChoiceIterator`` does for querysets."""
+
+    def __init__(self, field):
+        self.field = field
+
+    def __iter__(self):
+        field = self.field
+        engineers = roster.engineers()
+        if isinstance(field.widget, AvatarSelect):
+            field.widget.avatar_mapping = {
+                str(engineer.pk): {
+                    "url": engineer.avatar_url,
+                    "initial": engineer.initial,
+                    "load": f"{engineer.ongoing}/{engineer.capacity}",
+                    "full": engineer.at_capacity,
+                }
+                for engineer in engineers
+            }
+        if field.empty_label is not None:
+            yield ("", field.empty_label)
+        for engineer in engineers:
+            label = engineer.name
+            if field.show_load:
+                label = f"{label} · {engineer.ongoing}/{engineer.capacity} ongoing"
+            yield (engineer.pk, label)
+
+    def __len__(self):
+        return len(roster.engineers()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(roster.engineers())
 
 
-def _user_display(user):
-    full_name = user.get_full_name().strip() if user.get_full_name() else ""
-    return full_name or user.username
+class EngineerChoiceField(forms.ModelChoiceField):
+    """Engineer picker whose options come from the cached roster, most available first.
+
+    Rendering needs no query; the queryset is only used to validate the
+    submitted choice.
+    """
+
+    def __init__(self, *args, show_load=True, **kwargs):
+        self.show_load = show_load
+        kwargs.setdefault("queryset", User.objects.filter(role=User.Roles.ENGINEER))
+        super().__init__(*args, **kwargs)
+
+    def _get_choices(self):
+        if hasattr(self, "_choices"):
+            return self._choices
+        return EngineerChoiceIterator(self)
+
+    choices = property(_get_choices, forms.ChoiceField._set_choices)
 
 
 class RequestForm(forms.ModelForm):
@@ -57,6 +100,7 @@ class RequestForm(forms.ModelForm):
                 "list": "account-name-options",
                 "placeholder": "Start typing to search accounts",
                 "autocomplete": "off",
+                "data-autocomplete-url": reverse_lazy("hub:account-autocomplete"),
             }
         ),
     )
@@ -65,13 +109,12 @@ class RequestForm(forms.ModelForm):
         widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
         error_messages={"required": "Please specify when the request is needed."},
     )
-    engineer = forms.ModelChoiceField(
-        queryset=User.objects.none(),
-        required=True,
+    engineer = EngineerChoiceField(
+        required=False,
         widget=AvatarSelect(attrs={"class": "form-select", "data-avatar-select": "true"}),
         label="Assign Engineer",
-        empty_label="Select engineer",
-        error_messages={"required": "Please choose an engineer for this request."},
+        empty_label="Assign automatically",
+        help_text="Leave on automatic to get the least-loaded engineer for the product.",
     )
 
     class Meta:
@@ -92,23 +135,23 @@ class RequestForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        engineer_qs = User.objects.filter(role=User.Roles.ENGINEER).order_by("first_name", "last_name")
-        self.fields["engineer"].queryset = engineer_qs
-        widget = self.fields["engineer"].widget
-        if isinstance(widget, AvatarSelect):
-            widget.avatar_mapping = _build_avatar_mapping(engineer_qs)
-        self.fields["engineer"].label_from_instance = _user_display
+        self._engineer_id = self.instance.engineer_id
         if self.instance.pk:
             self.fields["account_name"].initial = self.instance.account.name
             if self.instance.due_date:
                 self.fields["needed_by"].initial = self.instance.due_date
-        self.account_name_suggestions = ACCOUNT_NAME_SUGGESTIONS
+            # Engineers are only picked automatically for new requests.
+            engineer = self.fields["engineer"]
+            engineer.empty_label = "Unassigned"
+            engineer.help_text = "Change this only to hand the request to someone else."
 
     def clean_account_name(self):
-        value = self.cleaned_data["account_name"].strip()
+        value = tidy(self.cleaned_data["account_name"])
         if not value:
             raise forms.ValidationError("Account name is required.")
-        return value
+        # Reuse the existing spelling for case/spacing variants so near
+        # duplicates such as "acme  corp" do not become new accounts.
+        return get_index().canonical(value) or value
 
     def clean_needed_by(self):
         needed_by = self.cleaned_data["needed_by"]
@@ -116,18 +159,36 @@ class RequestForm(forms.ModelForm):
             raise forms.ValidationError("Needed-by date cannot be in the past.")
         return needed_by
 
+    def _engineer_changed(self):
+        """Whether the submitted data picks a different engineer than the instance had."""
+        return self.add_prefix("engineer") in self.data and "engineer" in self.changed_data
+
     def save(self, commit=True):
+        creating = self.instance.pk is None
         account_name = self.cleaned_data["account_name"]
         account, _ = Account.objects.get_or_create(name=account_name)
         self.instance.account = account
-        self.instance.engineer = self.cleaned_data.get("engineer")
+        if creating or self._engineer_changed():
+            self.instance.engineer = self.cleaned_data.get("engineer")
+        else:
+            # An edit that leaves the picker alone keeps whoever is assigned now.
+            self.instance.engineer_id = self._engineer_id
         self.instance.due_date = self.cleaned_data.get("needed_by")
-        return super().save(commit=commit)
+        instance = super().save(commit=False)
+        if commit:
+            if creating:
+                # Without a chosen engineer, the balancer picks one; callers
+                # using commit=False should save new requests through
+                # assignment.save_request.
+                assignment.save_request(instance)
+            else:
+                instance.save()
+            self._save_m2m()
+        return instance
 
 
 class RequestAdminForm(forms.ModelForm):
-    engineer = forms.ModelChoiceField(
-        queryset=User.objects.filter(role=User.Roles.ENGINEER),
+    engineer = EngineerChoiceField(
         required=False,
         widget=AvatarSelect(attrs={"class": "form-select", "data-avatar-select": "true"}),
     )
@@ -150,14 +211,6 @@ class RequestAdminForm(forms.ModelForm):
             "description": forms.Textarea(attrs={"class": "form-control", "rows": 4}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields["engineer"].queryset = self.fields["engineer"].queryset.order_by("first_name", "last_name")
-        widget = self.fields["engineer"].widget
-        if isinstance(widget, AvatarSelect):
-            widget.avatar_mapping = _build_avatar_mapping(self.fields["engineer"].queryset)
-        self.fields["engineer"].label_from_instance = _user_display
-
 
 class StatusLogForm(forms.ModelForm):
     class Meta:
@@ -172,3 +225,174 @@ class StatusLogForm(forms.ModelForm):
         if not message:
             raise forms.ValidationError("Message cannot be empty.")
         return message
+
+
+class BulkActionForm(forms.Form):
+    """One admin action applied to the requests ticked on the dashboard."""
+
+    ACTIONS = [
+        ("assign", "Assign engineer"),
+        ("priority", "Set priority"),
+        ("status", "Set status"),
+        ("nudge", "Nudge"),
+    ]
+    # The extra field each action needs, with the error shown when it is missing.
+    ACTION_FIELDS = {
+        "assign": ("engineer", "Choose an engineer to assign."),
+        "priority": ("priority", "Choose a priority."),
+        "status": ("status", "Choose a status."),
+        "nudge": ("target", "Choose who should receive the follow-up notification."),
+    }
+
+    action = forms.ChoiceField(
+        choices=[("", "Bulk action…"), *ACTIONS],
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    requests = forms.Field(
+        widget=forms.MultipleHiddenInput,
+        error_messages={"required": "Select at least one request."},
+    )
+    engineer = EngineerChoiceField(
+        required=False,
+        empty_label="Engineer…",
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "Priority…"), *Request.Priority.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    status = forms.ChoiceField(
+        choices=[("", "Status…"), *Request.Status.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    target = forms.ChoiceField(
+        choices=[("", "Notify…"), ("engineer", "Engineer"), ("account_manager", "Account Manager")],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+
+    def clean_requests(self):
+        values = self.cleaned_data["requests"]
+        if isinstance(values, (str, int)):
+            values = [values]
+        try:
+            pks = sorted({int(value) for value in values})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Select requests by their ids.")
+        if len(pks) > bulk.MAX_REQUESTS:
+            raise forms.ValidationError(f"Select at most {bulk.MAX_REQUESTS} requests at a time.")
+        return pks
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action:
+            field, message = self.ACTION_FIELDS[action]
+            if not cleaned_data.get(field) and field not in self.errors:
+                self.add_error(field, message)
+        return cleaned_data
+
+    def apply(self, actor):
+        data = self.cleaned_data
+        pks = data["requests"]
+        action = data["action"]
+        if action == "assign":
+            return bulk.assign(pks, data["engineer"].pk)
+        if action == "priority":
+            return bulk.set_priority(pks, data["priority"])
+        if action == "status":
+            return bulk.set_status(pks, data["status"])
+        return bulk.nudge(pks, data["target"], actor)
+
+
+class DashboardFilterForm(forms.Form):
+    status = forms.ChoiceField(
+        choices=[("", "All statuses"), *Request.Status.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    priority = forms.ChoiceField(
+        choices=[("", "All priorities"), *Request.Priority.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    engineer = EngineerChoiceField(
+        show_load=False,
+        required=False,
+        empty_label="All engineers",
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    account = forms.CharField(
+        required=False,
+        widget=forms.TextInput(
+            attrs={
+                "class": "form-control form-control-sm",
+                "list": "account-filter-options",
+                "placeholder": "Account",
+                "autocomplete": "off",
+                "data-autocomplete-url": reverse_lazy("hub:account-autocomplete"),
+            }
+        ),
+    )
+    overdue = forms.BooleanField(
+        required=False,
+        label="Overdue only",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def clean_account(self):
+        return tidy(self.cleaned_data["account"])
+
+    @staticmethod
+    def account_ids(name):
+        """Accounts called ``name`` (any case), else those whose name starts with it."""
+        canonical = get_index().canonical(name)
+        if canonical:
+            ids = list(Account.objects.filter(name=canonical).values_list("pk", flat=True))
+            if ids:
+                return ids
+        return list(Account.objects.filter(name__istartswith=name).values_list("pk", flat=True))
+
+    def filter_queryset(self, queryset):
+        data = self.cleaned_data if self.is_valid() else {}
+        if data.get("status"):
+            queryset = queryset.filter(status=data["status"])
+        if data.get("priority"):
+            queryset = queryset.filter(priority=data["priority"])
+        if data.get("engineer"):
+            queryset = queryset.filter(engineer=data["engineer"])
+        if data.get("account"):
+            # Resolved to ids first so the account/status/due-date index applies.
+            queryset = queryset.filter(account_id__in=self.account_ids(data["account"]))
+        if data.get("overdue"):
+            queryset = queryset.filter(status=Request.Status.ONGOING, due_date__lt=timezone.now().date())
+        return queryset
+
+
+class RequestExportFilterForm(DashboardFilterForm):
+    start_from = forms.DateField(required=False)
+    start_to = forms.DateField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_from = cleaned_data.get("start_from")
+        start_to = cleaned_data.get("start_to")
+        if start_from and start_to and start_from > start_to:
+            self.add_error("start_to", "End of the date range cannot be before its start.")
+        return cleaned_data
+
+    def includes_archived(self):
+        """Whether archived requests, which are all completed, can match the filters."""
+        data = self.cleaned_data if self.is_valid() else {}
+        return data.get("status") != Request.Status.ONGOING and not data.get("overdue")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        data = self.cleaned_data if self.is_valid() else {}
+        if data.get("start_from"):
+            queryset = queryset.filter(start_date__gte=data["start_from"])
+        if data.get("start_to"):
+            queryset = queryset.filter(start_date__lte=data["start_to"])
+        return queryset
@@ -0,0 +1,162 @@
+"""Database-backed background jobs.
+
+Work is queued as ``Job`` rows and run by ``manage.py run_worker``. Workers
+lease ready rows: on PostgreSQL with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+so concurrent workers never wait on each other's rows; elsewhere with a
+compare-and-set ``UPDATE`` per row. A lease that expires (a worker crashed
+mid-job) makes the job claimable again and counts as a failed attempt; if
+that was its last attempt the job is marked failed instead.
+
+Failed jobs are retried with exponential backoff until ``max_attempts``.
+Periodic tasks from ``JOB_SCHEDULE`` get one job per interval; a dedupe key
+keeps that true however many workers are running.
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+class Task(NamedTuple):
+    func: Callable
+    max_attempts: int
+    retry_backoff: int
+
+
+TASKS = {}
+
+
+def task(name, max_attempts=5, retry_backoff=30):
+    """Register ``func`` under ``name`` so jobs can refer to it; payloads are passed as kwargs."""
+
+    def decorator(func):
+        TASKS[name] = Task(func, max_attempts, retry_backoff)
+        return func
+
+    return decorator
+
+
+def enqueue(name, payload=None, run_at=None, dedupe_key=None):
+    """Queue ``name`` once the current transaction commits."""
+    if name not in TASKS:
+        raise LookupError(f"Unknown task {name!r}.")
+    job = Job(
+        task=name,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=TASKS[name].max_attempts,
+        dedupe_key=dedupe_key,
+    )
+    transaction.on_commit(lambda: Job.objects.bulk_create([job], ignore_conflicts=dedupe_key is not None))
+    return job
+
+
+def _expired(now):
+    return Q(status=Job.Status.RUNNING, locked_until__lt=now)
+
+
+def _ready(now):
+    return Q(status=Job.Status.QUEUED, run_at__lte=now) | (_expired(now) & Q(attempts__lt=F("max_attempts")))
+
+
+def claim(worker_id, limit):
+    """Lease up to ``limit`` ready jobs for ``worker_id`` and return them."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    lease = {
+        "status": Job.Status.RUNNING,
+        "locked_by": worker_id,
+        "locked_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        "attempts": F("attempts") + 1,
+    }
+    ready = Job.objects.filter(_ready(now)).order_by("run_at", "id")
+    with transaction.atomic():
+        # A worker killed mid-job never records the failure, so a job whose
+        # lease ran out on its last attempt is given up here instead.
+        exhausted = Job.objects.filter(_expired(now), attempts__gte=F("max_attempts")).update(
+            status=Job.Status.FAILED, last_error="lease expired", finished_at=now, locked_until=None
+        )
+        if exhausted:
+            logger.error("Gave up on %s jobs whose lease expired on their last attempt.", exhausted)
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(ready.select_for_update(skip_locked=True).values_list("pk", flat=True)[:limit])
+            Job.objects.filter(pk__in=ids).update(**lease)
+        else:
+            ids = [
+                pk
+                for pk in ready.values_list("pk", flat=True)[:limit]
+                if Job.objects.filter(_ready(now), pk=pk).update(**lease)
+            ]
+    return list(Job.objects.filter(pk__in=ids, locked_by=worker_id).order_by("run_at", "id"))
+
+
+def backoff(attempts, base):
+    delay = min(base * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def run(job):
+    """Run a claimed job and record the outcome; returns ``True`` on success."""
+    spec = TASKS.get(job.task)
+    owned = Job.objects.filter(pk=job.pk, locked_by=job.locked_by)
+    try:
+        if spec is None:
+            raise LookupError(f"Unknown task {job.task!r}.")
+        spec.func(**job.payload)
+    except Exception:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if spec is None or job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) failed permanently:\n%s", job.pk, job.task, error)
+            owned.update(status=Job.Status.FAILED, last_error=error, finished_at=now, locked_until=None)
+        else:
+            logger.warning("Job %s (%s) failed on attempt %s; retrying.", job.pk, job.task, job.attempts)
+            owned.update(
+                status=Job.Status.QUEUED,
+                last_error=error,
+                run_at=now + backoff(job.attempts, spec.retry_backoff),
+                locked_until=None,
+            )
+        return False
+    owned.update(status=Job.Status.SUCCEEDED, finished_at=timezone.now(), locked_until=None)
+    return True
+
+
+def schedule_periodic(now=None):
+    """Queue the current slot of every ``JOB_SCHEDULE`` entry that is not queued yet."""
+    now = now or timezone.now()
+    pending = []
+    for name, entry in settings.JOB_SCHEDULE.items():
+        every = entry["every"]
+        slot = int(now.timestamp()) // every
+        pending.append(
+            Job(
+                task=entry["task"],
+                payload=entry.get("payload", {}),
+                run_at=now,
+                max_attempts=TASKS[entry["task"]].max_attempts,
+                dedupe_key=f"periodic:{name}:{slot}",
+            )
+        )
+    Job.objects.bulk_create(pending, ignore_conflicts=True)
+
+
+def prune(older_than):
+    return Job.objects.filter(
+        status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED],
+        finished_at__lt=older_than,
+    ).delete()[0]
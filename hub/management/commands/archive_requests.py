@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hub import archive
+
+
+class Command(BaseCommand):
+    help = "Move old completed requests, with their status logs and notifications, to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Archive requests that ended more than this many days ago (default: ARCHIVE_AFTER_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=archive.BATCH_SIZE, help="Requests moved per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the requests that would move.")
+
+    def handle(self, *args, **options):
+        days = options["older_than"]
+        if days < 1:
+            raise CommandError("--older-than must be at least 1 day.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        before = archive.cutoff(days)
+        if options["dry_run"]:
+            count = archive.candidates(before).count()
+            self.stdout.write(f"{count} completed requests ended before {before} and would be archived.")
+            return
+        started = time.perf_counter()
+        moved = archive.archive(days, batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {moved.requests} requests that ended before {before}, with {moved.status_logs} "
+                f"status logs and {moved.notifications} notifications, in {elapsed * 1000:.1f} ms."
+            )
+        )
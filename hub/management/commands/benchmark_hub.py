@@ -0,0 +1,96 @@
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from hub import benchmarks
+from hub.models import Request, StatusLog
+from hub.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the database up to each size and time the dashboard, request detail, CSV export "
+        "and check_sla, optionally writing JSON results and comparing them with an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma-separated request counts to benchmark at, smallest first.",
+        )
+        parser.add_argument("--logs-per-request", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--label", default="", help="Free-form name for this run, e.g. a release tag.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Earlier JSON results to compare medians against.")
+        parser.add_argument("--force", action="store_true", help="Run even when DEBUG is off.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Refusing to seed with DEBUG off; pass --force if this database is disposable.")
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(",") if size.strip())
+        except ValueError as exc:
+            raise CommandError(f"Invalid --sizes: {exc}") from exc
+        if not sizes or options["repeat"] < 1:
+            raise CommandError("Give at least one size and --repeat >= 1.")
+        baseline = self.load(options["compare"]) if options["compare"] else {}
+
+        try:
+            seeder = Seeder(seed=options["seed"])
+        except ValueError as exc:
+            raise CommandError(exc) from exc
+
+        results = []
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for size in sizes:
+                missing = size - Request.objects.count()
+                if missing > 0:
+                    self.stdout.write(f"Seeding {missing} requests...")
+                    seeder.seed(missing, options["logs_per_request"])
+                rows = {"requests": Request.objects.count(), "status_logs": StatusLog.objects.count()}
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{rows['requests']} requests"))
+                for name, func in benchmarks.scenarios().items():
+                    result = {"size": size, "scenario": name, **rows, **benchmarks.measure(func, options["repeat"])}
+                    results.append(result)
+                    self.stdout.write(self.describe(result, baseline.get((size, name))))
+
+        report = {
+            "label": options["label"],
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}."))
+
+    def load(self, path):
+        try:
+            report = json.loads(Path(path).read_text())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+        return {(row["size"], row["scenario"]): row for row in report.get("results", [])}
+
+    def describe(self, result, previous):
+        line = (
+            f"  {result['scenario']:<22} median {result['median_ms']:>9.1f} ms  "
+            f"p95 {result['p95_ms']:>9.1f} ms  {result['queries']:>4} queries"
+        )
+        if previous and previous["median_ms"]:
+            ratio = result["median_ms"] / previous["median_ms"]
+            change = f"  x{ratio:.2f} vs {previous['median_ms']:.1f} ms, {previous['queries']} queries"
+            style = self.style.ERROR if ratio > 1.2 else self.style.SUCCESS if ratio < 0.8 else str
+            line += style(change)
+        return line
@@ -0,0 +1,200 @@
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from importlib import import_module
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts import middleware as accounts_middleware
+from accounts.models import User
+
+# Environment overrides per server profile; everything else comes from
+# gunicorn.conf.py and settings. "baseline" is the old entrypoint: one sync
+# worker and a new database connection per request.
+PROFILES = {
+    "baseline": {
+        "SERVER_MODE": "wsgi",
+        "GUNICORN_WORKER_CLASS": "sync",
+        "GUNICORN_WORKERS": "1",
+        "DB_CONN_MAX_AGE": "0",
+    },
+    "wsgi": {"SERVER_MODE": "wsgi"},
+    "asgi": {"SERVER_MODE": "asgi"},
+}
+STARTUP_SECONDS = 30
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with each server profile and measure requests per second and latency "
+        "for authenticated page loads, to compare worker and connection settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", default=",".join(PROFILES), help="Comma-separated profiles to run.")
+        parser.add_argument("--paths", default="/dashboard/", help="Comma-separated paths requested in turn.")
+        parser.add_argument("--user", help="Username to sign in as. Defaults to the first admin.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent keep-alive clients.")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of load per profile.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        profiles = [name.strip() for name in options["profiles"].split(",") if name.strip()]
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}. Choose from {', '.join(PROFILES)}.")
+        paths = [path.strip() for path in options["paths"].split(",") if path.strip()]
+        if not paths or options["concurrency"] < 1 or options["duration"] <= 0:
+            raise CommandError("Give at least one path, --concurrency >= 1 and --duration > 0.")
+
+        users = User.objects.all()
+        user = (
+            users.filter(username=options["user"]).first()
+            if options["user"]
+            else users.filter(role=User.Roles.ADMIN).order_by("pk").first()
+        )
+        if user is None:
+            raise CommandError("No user to sign in as.")
+        session = self.create_session(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+
+        results = []
+        try:
+            for profile in profiles:
+                result = self.run_profile(profile, paths, cookie, options["concurrency"], options["duration"])
+                results.append(result)
+                self.stdout.write(
+                    f"  {profile:<10} {result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>7.1f} ms  "
+                    f"p95 {result['p95_ms']:>7.1f} ms  {result['errors']} errors"
+                )
+        finally:
+            session.delete()
+
+        if results and results[0]["rps"]:
+            base = results[0]
+            for result in results[1:]:
+                self.stdout.write(f"  {result['profile']} vs {base['profile']}: x{result['rps'] / base['rps']:.2f} throughput")
+        if options["output"]:
+            report = {
+                "created_at": timezone.now().isoformat(),
+                "cpu_count": os.cpu_count(),
+                "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+                "paths": paths,
+                "concurrency": options["concurrency"],
+                "duration": options["duration"],
+                "results": results,
+            }
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}."))
+
+    def create_session(self, user):
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        # Measure the pages, not the redirect to an unfinished profile.
+        session[accounts_middleware.SESSION_KEY] = True
+        session.save()
+        return session
+
+    def run_profile(self, profile, paths, cookie, concurrency, duration):
+        port = _free_port()
+        env = {**os.environ, **PROFILES[profile], "GUNICORN_ACCESS_LOG": "", "GUNICORN_LOG_LEVEL": "warning"}
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            str(settings.BASE_DIR / "gunicorn.conf.py"),
+            "--bind",
+            f"127.0.0.1:{port}",
+        ]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        try:
+            self.wait_until_ready(server, port)
+            # Warm up every worker (imports, template loading, connections)
+            # before measuring.
+            self.load(port, paths, cookie, concurrency, min(duration, 2))
+            latencies, errors, elapsed = self.load(port, paths, cookie, concurrency, duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=STARTUP_SECONDS)
+        latencies.sort()
+        return {
+            "profile": profile,
+            "env": PROFILES[profile],
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+        }
+
+    def wait_until_ready(self, server, port):
+        deadline = time.monotonic() + STARTUP_SECONDS
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}.")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not start listening within {STARTUP_SECONDS} s.")
+
+    def load(self, port, paths, cookie, concurrency, duration):
+        """Hit ``paths`` from ``concurrency`` keep-alive clients for ``duration`` seconds."""
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        started = time.perf_counter()
+        deadline = started + duration
+
+        def client(offset):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            index = offset
+            mine, failed = [], 0
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += 1
+                sent = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers={"Cookie": cookie})
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                    continue
+                if response.status != 200:
+                    failed += 1
+                    continue
+                mine.append((time.perf_counter() - sent) * 1000)
+            connection.close()
+            with lock:
+                latencies.extend(mine)
+                errors[0] += failed
+
+        threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors[0], time.perf_counter() - started
@@ -0,0 +1,55 @@
+import statistics
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from hub import assignment, bulk, roster
+
+
+class Command(BaseCommand):
+    help = (
+        "Even out the ongoing backlog across engineers by load and product skills. "
+        "Shows the planned moves; pass --apply to make them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--apply", action="store_true", help="Reassign the requests instead of only listing the moves.")
+        parser.add_argument(
+            "--max-skew",
+            type=int,
+            default=1,
+            help="How many more requests than the best candidate an engineer may keep before work moves away.",
+        )
+
+    def handle(self, *args, **options):
+        if options["max_skew"] < 0:
+            raise CommandError("--max-skew must not be negative.")
+        started = time.perf_counter()
+        engineers = {engineer.pk: engineer for engineer in roster.engineers()}
+        moves, projected = assignment.plan_rebalance(max_skew=options["max_skew"])
+        elapsed = time.perf_counter() - started
+
+        def name(pk):
+            return engineers[pk].name if pk in engineers else "Unassigned"
+
+        for move in moves:
+            self.stdout.write(f"  {move.reference_code}: {name(move.old)} -> {name(move.new)}")
+        before = [engineer.ongoing for engineer in engineers.values()]
+        after = [projected[pk] for pk in engineers]
+        if before:
+            self.stdout.write(
+                f"Load per engineer: max {max(before)} -> {max(after)}, "
+                f"spread (stdev) {statistics.pstdev(before):.2f} -> {statistics.pstdev(after):.2f}."
+            )
+        self.stdout.write(f"Planned {len(moves)} moves in {elapsed * 1000:.1f} ms.")
+
+        if not options["apply"] or not moves:
+            return
+        try:
+            outcome = bulk.reassign({move.pk: move.new for move in moves})
+        except ValidationError as exc:
+            raise CommandError(f"{' '.join(exc.messages)} Run the command again.") from exc
+        for code, message in outcome.errors.items():
+            self.stdout.write(self.style.WARNING(f"  {code}: {message}"))
+        self.stdout.write(self.style.SUCCESS(f"Reassigned {len(outcome.updated)} requests."))
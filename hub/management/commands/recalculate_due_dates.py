@@ -0,0 +1,91 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from hub import analytics, caching
+from hub.business_days import get_calendar
+from hub.models import Request, RequestEvent
+
+
+class Command(BaseCommand):
+    help = (
+        "Move request due dates to their SLA target (start date plus the priority's business days), "
+        "e.g. after the holiday calendar changes. Only due dates still equal to the previous SLA target "
+        "are moved; dates chosen by the requestor are kept."
+    )
+
+    batch_size = 2000
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--status",
+            choices=[*Request.Status.values, "all"],
+            default=Request.Status.ONGOING,
+            help="Only recalculate requests with this status (default: ongoing).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many due dates would change without writing them.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Request.objects.all()
+        if options["status"] != "all":
+            queryset = queryset.filter(status=options["status"])
+
+        started = time.perf_counter()
+        rows = list(queryset.values_list("pk", "start_date", "priority", "due_date", "sla_due_date", "end_date"))
+        loaded_at = time.perf_counter()
+
+        calendar = get_calendar()
+        sla_days = [Request.SLA_DAYS.get(row[2], 5) for row in rows]
+        targets = calendar.add_business_days_many((row[1] for row in rows), sla_days)
+        now = timezone.now()
+        moved, retargeted, events, end_dates = [], [], [], set()
+        kept = 0
+        for (pk, _, _, due_date, sla_due_date, end_date), target in zip(rows, targets):
+            if not target or target == sla_due_date:
+                continue
+            if due_date == sla_due_date and due_date != target:
+                moved.append(Request(pk=pk, due_date=target, sla_due_date=target, updated_at=now))
+                events.append(
+                    RequestEvent(
+                        request_id=pk,
+                        kind=RequestEvent.Kind.DUE_DATE_CHANGED,
+                        data={"old": due_date, "new": target},
+                        created_at=now,
+                    )
+                )
+                if end_date:
+                    end_dates.add(end_date)
+            else:
+                kept += due_date != sla_due_date
+                retargeted.append(Request(pk=pk, sla_due_date=target))
+        computed_at = time.perf_counter()
+
+        if not options["dry_run"]:
+            with transaction.atomic():
+                Request.objects.bulk_update(moved, ["due_date", "sla_due_date", "updated_at"], batch_size=self.batch_size)
+                Request.objects.bulk_update(retargeted, ["sla_due_date"], batch_size=self.batch_size)
+                RequestEvent.objects.bulk_create(events, batch_size=self.batch_size)
+                # Completed requests may have changed from late to on time.
+                analytics.rebuild(days=end_dates)
+            if moved:
+                caching.invalidate("requests", *(f"request:{obj.pk}" for obj in moved))
+        finished = time.perf_counter()
+
+        verb = "would change" if options["dry_run"] else "updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {len(rows)} requests, {verb} {len(moved)} due dates; "
+                f"kept {kept} chosen by hand."
+            )
+        )
+        self.stdout.write(
+            f"Timings: load {(loaded_at - started) * 1000:.1f} ms, "
+            f"compute {(computed_at - loaded_at) * 1000:.1f} ms, "
+            f"write {(finished - computed_at) * 1000:.1f} ms."
+        )
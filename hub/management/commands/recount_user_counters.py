@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from hub.models import recount_engineer_load
+from hub.notifications import recount_unread
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalised per-user counters (unread notifications, ongoing requests per engineer) "
+        "from their source tables, e.g. after bulk imports or manual SQL."
+    )
+
+    def handle(self, *args, **options):
+        recount_unread()
+        recount_engineer_load()
+        self.stdout.write(self.style.SUCCESS("User counters recomputed."))
@@ -0,0 +1,75 @@
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from hub import jobs
+
+SCHEDULE_CHECK_SECONDS = 15
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs and the periodic tasks in JOB_SCHEDULE."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.JOB_WORKER_THREADS,
+            help="Number of jobs to run concurrently (default: JOB_WORKER_THREADS).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are ready now, then exit.",
+        )
+        parser.add_argument(
+            "--no-schedule",
+            action="store_true",
+            help="Do not queue periodic tasks from JOB_SCHEDULE.",
+        )
+
+    def handle(self, *args, **options):
+        threads = max(1, options["threads"])
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        self.stdout.write(f"Worker {worker_id} running with {threads} threads.")
+        next_schedule = 0.0
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job") as pool:
+            while not stopping.is_set():
+                if not options["no_schedule"] and time.monotonic() >= next_schedule:
+                    jobs.schedule_periodic()
+                    next_schedule = time.monotonic() + SCHEDULE_CHECK_SECONDS
+                in_flight = {future for future in in_flight if not future.done()}
+                claimed = jobs.claim(worker_id, threads - len(in_flight))
+                in_flight.update(pool.submit(self.run_job, job) for job in claimed)
+
+                if len(in_flight) >= threads or (options["once"] and in_flight and not claimed):
+                    wait(in_flight, timeout=settings.JOB_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                elif options["once"] and not in_flight:
+                    break
+                elif not claimed:
+                    stopping.wait(settings.JOB_POLL_INTERVAL)
+            # Leaving the executor lets the running jobs finish first.
+        self.stdout.write(f"Worker {worker_id} stopped.")
+
+    def run_job(self, job):
+        close_old_connections()
+        try:
+            started = time.perf_counter()
+            succeeded = jobs.run(job)
+            elapsed = (time.perf_counter() - started) * 1000
+            outcome = self.style.SUCCESS("done") if succeeded else self.style.ERROR("failed")
+            self.stdout.write(f"{job.task} #{job.pk} (attempt {job.attempts}): {outcome} in {elapsed:.1f} ms")
+        finally:
+            close_old_connections()
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hub.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = "Insert synthetic requests and status logs for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000, help="Number of requests to create.")
+        parser.add_argument(
+            "--logs-per-request",
+            type=int,
+            default=3,
+            help="Average number of status logs per request.",
+        )
+        parser.add_argument("--days", type=int, default=365, help="Spread start dates over this many past days.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, for repeatable data sets.")
+        parser.add_argument("--force", action="store_true", help="Run even when DEBUG is off.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["force"]:
+            raise CommandError("Refusing to seed with DEBUG off; pass --force if this database is disposable.")
+        if options["requests"] < 0 or options["logs_per_request"] < 0 or options["days"] < 1:
+            raise CommandError("--requests and --logs-per-request must be >= 0 and --days >= 1.")
+
+        started = time.perf_counter()
+        try:
+            seeder = Seeder(seed=options["seed"], days=options["days"])
+        except ValueError as exc:
+            raise CommandError(exc) from exc
+
+        def progress(requests, logs):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {requests} requests, {logs} status logs")
+
+        requests, logs = seeder.seed(options["requests"], options["logs_per_request"], progress=progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {requests} requests and {logs} status logs in {elapsed * 1000:.1f} ms.")
+        )
@@ -0,0 +1,225 @@
+"""In-process request metrics rendered in the Prometheus text format.
+
+Each process keeps its own counters and histograms. With ``METRICS_DIR`` set,
+every process also writes a snapshot to ``<METRICS_DIR>/<pid>.json`` at most
+every ``FLUSH_SECONDS``. ``/metrics`` then sums all snapshots, so a scrape
+that lands on any gunicorn worker reports the totals for the whole host.
+
+Counters and histograms must never go down, or Prometheus reads a reset. When
+a worker exits, ``retire()`` folds its snapshot into ``retired.json`` and
+removes the per-pid file (see ``gunicorn.conf.py``). ``collect()`` does the
+same for any snapshot whose process is gone, so recycled workers keep
+counting toward the totals. All metrics here are counters or histograms;
+there are no per-pid gauges to drop.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+FLUSH_SECONDS = 5
+RETIRED_FILE = "retired.json"
+LOCK_FILE = ".lock"
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "hub_http_requests_total": ("counter", "HTTP responses by view, method and status.", None),
+    "hub_http_request_duration_seconds": ("histogram", "Time spent producing a response.", LATENCY_BUCKETS),
+    "hub_db_queries_per_request": ("histogram", "SQL queries executed per request.", QUERY_COUNT_BUCKETS),
+    "hub_db_query_duration_seconds_total": ("counter", "Time spent in SQL queries.", None),
+    "hub_template_render_duration_seconds": ("histogram", "Time spent rendering templates.", LATENCY_BUCKETS),
+    "hub_fragment_cache_total": ("counter", "Cached page fragments served (hit) or rendered (miss).", None),
+}
+
+
+def _key(labels):
+    return json.dumps(sorted(labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._last_flush = 0.0
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self._counters[(name, _key(labels))] += value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        with self._lock:
+            histogram = self._histograms.get((name, _key(labels)))
+            if histogram is None:
+                histogram = self._histograms[(name, _key(labels))] = {
+                    "buckets": [0] * len(buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [[name, key, value] for (name, key), value in self._counters.items()],
+                "histograms": [
+                    [name, key, {**data, "buckets": list(data["buckets"])}]
+                    for (name, key), data in self._histograms.items()
+                ],
+            }
+
+    def maybe_flush(self, force=False):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_SECONDS:
+            return
+        self._last_flush = now
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        _write(path / f"{os.getpid()}.json", self.snapshot())
+
+
+registry = Registry()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read(file):
+    try:
+        return json.loads(file.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write(file, snapshot):
+    with tempfile.NamedTemporaryFile("w", dir=file.parent, suffix=".tmp", delete=False) as handle:
+        json.dump(snapshot, handle)
+    os.replace(handle.name, file)
+
+
+@contextmanager
+def _locked(directory, exclusive):
+    # Readers share the lock so they never see a snapshot both retired and
+    # still on disk, or neither.
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_FILE, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def _retire(directory, pid):
+    file = directory / f"{pid}.json"
+    snapshot = _read(file)
+    if snapshot is not None:
+        retired = _read(directory / RETIRED_FILE)
+        _write(directory / RETIRED_FILE, merge([retired, snapshot] if retired else [snapshot]))
+    file.unlink(missing_ok=True)
+
+
+def retire(directory, pid):
+    """Fold the snapshot of exited process ``pid`` into the retired totals."""
+    directory = Path(directory)
+    with _locked(directory, exclusive=True):
+        _retire(directory, pid)
+
+
+def collect():
+    """Snapshots from every process sharing ``METRICS_DIR``, or just this one."""
+    if not settings.METRICS_DIR:
+        return [registry.snapshot()]
+    registry.maybe_flush(force=True)
+    directory = Path(settings.METRICS_DIR)
+    dead = [int(file.stem) for file in directory.glob("*.json") if file.stem.isdigit() and not _alive(int(file.stem))]
+    if dead:
+        with _locked(directory, exclusive=True):
+            for pid in dead:
+                _retire(directory, pid)
+    with _locked(directory, exclusive=False):
+        snapshots = [_read(file) for file in directory.glob("*.json")]
+    return [snapshot for snapshot in snapshots if snapshot is not None]
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(key, extra=()):
+    pairs = [*json.loads(key), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _totals(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in snapshots:
+        for name, key, value in snapshot["counters"]:
+            counters[(name, key)] += value
+        for name, key, data in snapshot["histograms"]:
+            merged = histograms.setdefault((name, key), {"buckets": [0] * len(data["buckets"]), "sum": 0.0, "count": 0})
+            merged["buckets"] = [a + b for a, b in zip(merged["buckets"], data["buckets"])]
+            merged["sum"] += data["sum"]
+            merged["count"] += data["count"]
+    return counters, histograms
+
+
+def merge(snapshots):
+    """One snapshot holding the sums of ``snapshots``."""
+    counters, histograms = _totals(snapshots)
+    return {
+        "counters": [[name, key, value] for (name, key), value in counters.items()],
+        "histograms": [[name, key, data] for (name, key), data in histograms.items()],
+    }
+
+
+def render(snapshots):
+    counters, histograms = _totals(snapshots)
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, key), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(key)} {_number(value)}")
+            continue
+        for (metric, key), data in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets, data["buckets"]):
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', f'{bound:g}')])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {data['count']}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_number(data['sum'])}")
+            lines.append(f"{name}_count{_format_labels(key)} {data['count']}")
+    return "\n".join(lines) + "\n"
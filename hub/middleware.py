@@ -0,0 +1,126 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .metrics import registry
+
+slow_logger = logging.getLogger("hub.slow_requests")
+
+SLOW_QUERY_SAMPLES = 5
+MAX_LOGGED_SQL = 1000
+
+
+class QueryRecorder:
+    """``execute_wrapper`` hook timing each SQL statement, grouped by statement text.
+
+    Statements are recorded with their placeholders, so an N+1 loop shows up
+    as one statement with a high count.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            entry = self.statements.setdefault(sql, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def worst(self, limit=SLOW_QUERY_SAMPLES):
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [(count, total, sql) for sql, (count, total) in ranked[:limit]]
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "<unresolved>"
+
+
+class InstrumentationMiddleware:
+    """Record latency, SQL and template render time per view for ``/metrics``.
+
+    Requests slower than ``SLOW_REQUEST_SECONDS`` or running more than
+    ``SLOW_REQUEST_QUERIES`` statements are logged to ``hub.slow_requests``
+    together with their most expensive SQL.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, recorder)
+        return response
+
+    async def __acall__(self, request):
+        # Queries in async views run on worker threads, outside any wrapper
+        # installed here, so only latency is recorded.
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, None)
+        return response
+
+    def process_template_response(self, request, response):
+        started = time.perf_counter()
+        view = _view_name(request)
+
+        def observe(rendered):
+            registry.observe("hub_template_render_duration_seconds", {"view": view}, time.perf_counter() - started)
+
+        response.add_post_render_callback(observe)
+        return response
+
+    def record(self, request, response, duration, recorder):
+        view = _view_name(request)
+        registry.inc(
+            "hub_http_requests_total",
+            {"view": view, "method": request.method, "status": response.status_code},
+        )
+        registry.observe("hub_http_request_duration_seconds", {"view": view}, duration)
+        if recorder is not None:
+            registry.observe("hub_db_queries_per_request", {"view": view}, recorder.count)
+            registry.inc("hub_db_query_duration_seconds_total", {"view": view}, recorder.duration)
+            if duration >= settings.SLOW_REQUEST_SECONDS or recorder.count > settings.SLOW_REQUEST_QUERIES:
+                self.log_slow(request, view, duration, recorder)
+        registry.maybe_flush()
+
+    @staticmethod
+    def log_slow(request, view, duration, recorder):
+        statements = "\n".join(
+            f"  {count}x {total * 1000:.1f} ms: {sql[:MAX_LOGGED_SQL]}" for count, total, sql in recorder.worst()
+        )
+        slow_logger.warning(
+            "Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms\n%s",
+            request.method,
+            request.path,
+            view,
+            duration * 1000,
+            recorder.count,
+            recorder.duration * 1000,
+            statements,
+        )
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0002_statuslog"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["status", "due_date", "id"], name="hub_req_status_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["priority", "status", "due_date", "id"], name="hub_req_priority_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["engineer", "status", "due_date", "id"], name="hub_req_engineer_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["account", "status", "due_date", "id"], name="hub_req_account_due_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+SLA_MESSAGE_SUFFIX = "exceeded its SLA target date."
+
+
+def tag_existing_sla_notifications(apps, schema_editor):
+    Notification = apps.get_model("hub", "Notification")
+    Request = apps.get_model("hub", "Request")
+    Notification.objects.filter(
+        message__endswith=SLA_MESSAGE_SUFFIX,
+        related_request__isnull=False,
+    ).update(
+        kind="sla_breach",
+        sla_date=Subquery(Request.objects.filter(pk=OuterRef("related_request_id")).values("due_date")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0003_request_dashboard_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="kind",
+            field=models.CharField(
+                choices=[("general", "General"), ("sla_breach", "SLA breach")],
+                default="general",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="sla_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(tag_existing_sla_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(kind="sla_breach"),
+                fields=("related_request", "recipient", "kind", "sla_date"),
+                name="hub_notification_sla_dedupe",
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0004_notification_sla_dedupe"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["recipient", "is_read", "created_at"], name="hub_notif_recipient_unread_idx"),
+        ),
+    ]
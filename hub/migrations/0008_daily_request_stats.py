@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("hub", "0007_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRequestStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                (
+                    "engineer",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="hub.account"),
+                ),
+                ("priority", models.CharField(choices=[("medium", "Medium"), ("high", "High")], max_length=10)),
+                ("product_category", models.CharField(max_length=50)),
+                ("opened", models.PositiveIntegerField(default=0)),
+                ("completed", models.PositiveIntegerField(default=0)),
+                ("completed_on_time", models.PositiveIntegerField(default=0)),
+                ("completion_days", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "daily request stats",
+                "indexes": [models.Index(fields=["day"], name="hub_daily_stats_day_idx")],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["start_date"], name="hub_req_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="request",
+            index=models.Index(fields=["end_date"], name="hub_req_end_idx"),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("hub", "0008_daily_request_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EngineerSkill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "product_category",
+                    models.CharField(
+                        choices=[
+                            ("Azure", "Azure"),
+                            ("M365", "M365"),
+                            ("VMware", "VMware"),
+                            ("Omnissa", "Omnissa"),
+                            ("Hybrid", "Hybrid"),
+                            ("Others", "Others"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                (
+                    "engineer",
+                    models.ForeignKey(
+                        limit_choices_to={"role": "engineer"},
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="skills",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["engineer", "product_category"],
+                "constraints": [
+                    models.UniqueConstraint(fields=("engineer", "product_category"), name="hub_engineer_skill_unique"),
+                ],
+            },
+        ),
+    ]
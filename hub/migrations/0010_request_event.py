@@ -0,0 +1,109 @@
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_events(apps, schema_editor):
+    """Reconstruct the history that can still be read from the current rows.
+
+    Every request gets a "created" event, completed requests a "completed"
+    one at their last update and every status log a "commented" one. Events
+    are inserted in time order so their ids follow it.
+    """
+    Request = apps.get_model("hub", "Request")
+    StatusLog = apps.get_model("hub", "StatusLog")
+    RequestEvent = apps.get_model("hub", "RequestEvent")
+    history = []
+    requests = Request.objects.values_list("pk", "status", "priority", "engineer_id", "created_at", "updated_at")
+    for pk, status, priority, engineer_id, created_at, updated_at in requests.iterator():
+        data = {"status": "ongoing", "priority": priority, "engineer": engineer_id}
+        history.append((created_at, pk, "created", None, data))
+        if status == "completed":
+            data = {"old": "ongoing", "new": "completed"}
+            history.append((max(created_at, updated_at), pk, "completed", None, data))
+    logs = StatusLog.objects.values_list("pk", "request_id", "author_id", "created_at")
+    for pk, request_id, author_id, created_at in logs.iterator():
+        history.append((created_at, request_id, "commented", author_id, {"status_log": pk}))
+    history.sort(key=lambda event: (event[0], event[1]))
+    for start in range(0, len(history), BATCH_SIZE):
+        RequestEvent.objects.bulk_create(
+            [
+                RequestEvent(created_at=created_at, request_id=request_id, kind=kind, actor_id=actor_id, data=data)
+                for created_at, request_id, kind, actor_id, data in history[start : start + BATCH_SIZE]
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("hub", "0009_engineer_skill"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventCursor",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("position", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RequestEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("assigned", "Assigned"),
+                            ("reassigned", "Reassigned"),
+                            ("priority_changed", "Priority changed"),
+                            ("completed", "Completed"),
+                            ("reopened", "Reopened"),
+                            ("commented", "Commented"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "request",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="events",
+                        to="hub.request",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "indexes": [models.Index(fields=["request", "created_at"], name="hub_event_request_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
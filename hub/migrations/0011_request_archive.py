@@ -0,0 +1,192 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("hub", "0010_request_event"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="requestevent",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("created", "Created"),
+                    ("assigned", "Assigned"),
+                    ("reassigned", "Reassigned"),
+                    ("priority_changed", "Priority changed"),
+                    ("completed", "Completed"),
+                    ("reopened", "Reopened"),
+                    ("commented", "Commented"),
+                    ("deleted", "Deleted"),
+                    ("archived", "Archived"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArchivedRequest",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("reference_code", models.CharField(max_length=20)),
+                ("account_manager", models.CharField(max_length=255)),
+                (
+                    "product_category",
+                    models.CharField(
+                        choices=[
+                            ("Azure", "Azure"),
+                            ("M365", "M365"),
+                            ("VMware", "VMware"),
+                            ("Omnissa", "Omnissa"),
+                            ("Hybrid", "Hybrid"),
+                            ("Others", "Others"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("priority", models.CharField(choices=[("medium", "Medium"), ("high", "High")], max_length=10)),
+                (
+                    "engagement_type",
+                    models.CharField(
+                        choices=[
+                            ("opportunity", "Opportunity"),
+                            ("training", "Training"),
+                            ("support", "Support"),
+                            ("inquiry", "Inquiry"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("due_date", models.DateField(blank=True, null=True)),
+                ("end_date", models.DateField(blank=True, null=True)),
+                ("status", models.CharField(choices=[("ongoing", "Ongoing"), ("completed", "Completed")], max_length=20)),
+                ("description", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="hub.account",
+                    ),
+                ),
+                (
+                    "engineer",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "requestor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["reference_code"], name="hub_arch_req_code_idx"),
+                    models.Index(fields=["requestor"], name="hub_arch_req_requestor_idx"),
+                    models.Index(fields=["engineer"], name="hub_arch_req_engineer_idx"),
+                    models.Index(fields=["account"], name="hub_arch_req_account_idx"),
+                    models.Index(fields=["start_date"], name="hub_arch_req_start_idx"),
+                    models.Index(fields=["end_date"], name="hub_arch_req_end_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedStatusLog",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "request",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_logs",
+                        to="hub.archivedrequest",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(fields=["request", "created_at"], name="hub_arch_log_request_idx"),
+                    models.Index(fields=["author"], name="hub_arch_log_author_idx"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedNotification",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("message", models.CharField(max_length=255)),
+                ("created_at", models.DateTimeField()),
+                ("is_read", models.BooleanField(default=False)),
+                (
+                    "kind",
+                    models.CharField(choices=[("general", "General"), ("sla_breach", "SLA breach")], max_length=20),
+                ),
+                ("sla_date", models.DateField(blank=True, null=True)),
+                (
+                    "recipient",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "related_request",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="hub.archivedrequest",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(fields=["recipient", "created_at"], name="hub_arch_notif_recipient_idx"),
+                    models.Index(fields=["related_request"], name="hub_arch_notif_request_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import migrations
+
+ARCHIVE_MODELS = ("ArchivedRequest", "ArchivedStatusLog", "ArchivedNotification")
+
+
+def partition_archive(apps, schema_editor):
+    """With ARCHIVE_PARTITIONING on PostgreSQL, rebuild the (still empty) archive tables partitioned by year.
+
+    Every unique index of a partitioned table must contain the partition key,
+    so the primary key becomes ``(id, created_at)`` and the foreign keys are
+    left to Django's ``on_delete`` handling. ``hub.archive`` creates the
+    yearly partitions as rows arrive.
+    """
+    if schema_editor.connection.vendor != "postgresql" or not settings.ARCHIVE_PARTITIONING:
+        return
+    for name in ARCHIVE_MODELS:
+        model = apps.get_model("hub", name)
+        table = schema_editor.quote_name(model._meta.db_table)
+        plain = schema_editor.quote_name(f"{model._meta.db_table}_plain")
+        schema_editor.execute(f"ALTER TABLE {table} RENAME TO {plain}")
+        schema_editor.execute(f"CREATE TABLE {table} (LIKE {plain}) PARTITION BY RANGE (created_at)")
+        schema_editor.execute(f"DROP TABLE {plain}")
+        schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+        for index in model._meta.indexes:
+            schema_editor.add_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0011_request_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_archive, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def install_search(apps, schema_editor):
+    from hub import search
+
+    search.install(schema_editor.connection)
+
+
+def restore_expression_index(apps, schema_editor):
+    from hub import search
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    search.uninstall(schema_editor.connection)
+    for table, column in search.SEARCHABLE:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} "
+            f"USING GIN (to_tsvector('english', {column}))"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0013_request_updated_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, restore_expression_index),
+    ]
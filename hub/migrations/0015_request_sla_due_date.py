@@ -0,0 +1,56 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def backfill_sla_due_dates(apps, schema_editor):
+    """Record the SLA target under the current calendar; matching due dates count as derived from it."""
+    from hub.business_days import get_calendar
+    from hub.models import Request as CurrentRequest
+
+    Request = apps.get_model("hub", "Request")
+    rows = list(Request.objects.values_list("pk", "start_date", "priority"))
+    targets = get_calendar().add_business_days_many(
+        (start for _pk, start, _priority in rows),
+        [CurrentRequest.SLA_DAYS.get(priority, 5) for _pk, _start, priority in rows],
+    )
+    Request.objects.bulk_update(
+        [Request(pk=pk, sla_due_date=target) for (pk, _start, _priority), target in zip(rows, targets)],
+        ["sla_due_date"],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hub", "0014_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="request",
+            name="sla_due_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="requestevent",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("created", "Created"),
+                    ("assigned", "Assigned"),
+                    ("reassigned", "Reassigned"),
+                    ("priority_changed", "Priority changed"),
+                    ("due_date_changed", "Due date changed"),
+                    ("completed", "Completed"),
+                    ("reopened", "Reopened"),
+                    ("commented", "Commented"),
+                    ("deleted", "Deleted"),
+                    ("archived", "Archived"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(backfill_sla_due_dates, migrations.RunPython.noop),
+    ]
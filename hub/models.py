@@ -1,19 +1,46 @@
-from datetime import date, timedelta
+from datetime import date
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from . import caching
+from .business_days import get_calendar
+from .tracking import FieldTrackerMixin
+
 
 def add_working_days(start: date, days: int) -> date:
-    current = start
-    added = 0
-    while added < days:
-        current += timedelta(days=1)
-        if current.weekday() < 5:  # Monday-Friday
-            added += 1
-    return current
+    return get_calendar().add_business_days(start, days)
+
+
+def release_engineer_slots(counts):
+    """Decrement ongoing counters by ``{engineer_id: n}``."""
+    users = get_user_model().objects
+    for engineer_id, count in counts.items():
+        users.filter(pk=engineer_id, ongoing_request_count__gte=count).update(
+            ongoing_request_count=models.F("ongoing_request_count") - count
+        )
+    caching.invalidate_on_commit("engineer-load")
+
+
+def recount_engineer_load(engineer_ids=None):
+    """Recompute ongoing counters from the request table."""
+    ongoing = (
+        Request.objects.filter(engineer=models.OuterRef("pk"), status=Request.Status.ONGOING)
+        .order_by()
+        .values("engineer")
+        .annotate(total=models.Count("pk"))
+        .values("total")
+    )
+    users = get_user_model().objects.all()
+    if engineer_ids is not None:
+        users = users.filter(pk__in=engineer_ids)
+    users.update(ongoing_request_count=Coalesce(models.Subquery(ongoing), models.Value(0)))
+    caching.invalidate_on_commit("engineer-load")
 
 
 class Account(models.Model):
@@ -27,7 +54,7 @@ class Account(models.Model):
         return self.name
 
 
-class Request(models.Model):
+class Request(FieldTrackerMixin, models.Model):
     class Priority(models.TextChoices):
         MEDIUM = "medium", "Medium"
         HIGH = "high", "High"
@@ -42,11 +69,32 @@ class Request(models.Model):
         ONGOING = "ongoing", "Ongoing"
         COMPLETED = "completed", "Completed"
 
+    class ProductCategory(models.TextChoices):
+        AZURE = "Azure", "Azure"
+        M365 = "M365", "M365"
+        VMWARE = "VMware", "VMware"
+        OMNISSA = "Omnissa", "Omnissa"
+        HYBRID = "Hybrid", "Hybrid"
+        OTHERS = "Others", "Others"
+
+    is_archived = False
+
     SLA_DAYS = {
         Priority.MEDIUM: 5,
         Priority.HIGH: 3,
     }
 
+    tracked_fields = (
+        "status",
+        "engineer_id",
+        "priority",
+        "due_date",
+        "start_date",
+        "end_date",
+        "account_id",
+        "product_category",
+    )
+
     reference_code = models.CharField(max_length=20, unique=True, editable=False, blank=True)
     requestor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -56,21 +104,15 @@ class Request(models.Model):
     )
     account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="requests")
     account_manager = models.CharField(max_length=255)
-    product_category = models.CharField(
-        max_length=50,
-        choices=[
-            ("Azure", "Azure"),
-            ("M365", "M365"),
-            ("VMware", "VMware"),
-            ("Omnissa", "Omnissa"),
-            ("Hybrid", "Hybrid"),
-            ("Others", "Others"),
-        ],
-    )
+    product_category = models.CharField(max_length=50, choices=ProductCategory.choices)
     priority = models.CharField(max_length=10, choices=Priority.choices, default=Priority.MEDIUM)
     engagement_type = models.CharField(max_length=20, choices=Engagement.choices)
     start_date = models.DateField(auto_now_add=True)
     due_date = models.DateField(blank=True, null=True)
+    # SLA target (start date plus the priority's business days) worked out
+    # when the request was created. A due date equal to it was not chosen by
+    # hand, so ``recalculate_due_dates`` may move it.
+    sla_due_date = models.DateField(blank=True, null=True, editable=False)
     end_date = models.DateField(blank=True, null=True)
     engineer = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -87,6 +129,15 @@ class Request(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "due_date", "id"], name="hub_req_status_due_idx"),
+            models.Index(fields=["priority", "status", "due_date", "id"], name="hub_req_priority_due_idx"),
+            models.Index(fields=["engineer", "status", "due_date", "id"], name="hub_req_engineer_due_idx"),
+            models.Index(fields=["account", "status", "due_date", "id"], name="hub_req_account_due_idx"),
+            models.Index(fields=["start_date"], name="hub_req_start_idx"),
+            models.Index(fields=["end_date"], name="hub_req_end_idx"),
+            models.Index(fields=["updated_at", "id"], name="hub_req_updated_idx"),
+        ]
 
     def get_absolute_url(self):
         from django.urls import reverse
@@ -95,15 +146,17 @@ class Request(models.Model):
 
     def clean(self):
         super().clean()
-        if self.engineer and self.status == self.Status.ONGOING:
-            assigned = Request.objects.filter(
-                engineer=self.engineer,
-                status=self.Status.ONGOING,
+        assignment_changed = self.pk is None or self.has_changed("engineer_id") or self.has_changed("status")
+        if self.engineer_id and self.status == self.Status.ONGOING and assignment_changed:
+            # Early, friendly check for forms; save() re-checks atomically.
+            load = (
+                get_user_model()
+                .objects.filter(pk=self.engineer_id)
+                .values_list("ongoing_request_count", "max_ongoing_requests")
+                .first()
             )
-            if self.pk:
-                assigned = assigned.exclude(pk=self.pk)
-            if assigned.count() >= 5:
-                raise ValidationError({"engineer": "Selected engineer already has 5 ongoing requests."})
+            if load and load[0] >= load[1]:
+                raise ValidationError({"engineer": self._capacity_message(load[1])})
         if self.end_date and self.status != self.Status.COMPLETED:
             raise ValidationError({"end_date": "Mark the request as completed before setting an end date."})
         if self.status == self.Status.COMPLETED and not self.end_date:
@@ -113,14 +166,57 @@ class Request(models.Model):
         creating = self.pk is None
         if creating and not self.start_date:
             self.start_date = timezone.now().date()
+        if not creating:
+            self._ensure_loaded_values()
         sla_days = self.SLA_DAYS.get(self.priority, 5)
+        if creating and not self.sla_due_date:
+            self.sla_due_date = add_working_days(self.start_date, sla_days)
         if not self.due_date:
             self.due_date = add_working_days(self.start_date, sla_days)
         self.full_clean()
-        super().save(*args, **kwargs)
-        if creating and not self.reference_code:
-            self.reference_code = f"REQ-{self.pk:05d}"
-            Request.objects.filter(pk=self.pk).update(reference_code=self.reference_code)
+        changes = self.get_changes(kwargs.get("update_fields"))
+        with transaction.atomic():
+            self._update_engineer_load(changes)
+            super().save(*args, **kwargs)
+            if creating and not self.reference_code:
+                self.reference_code = f"REQ-{self.pk:05d}"
+                Request.objects.filter(pk=self.pk).update(reference_code=self.reference_code)
+            RequestEvent.objects.bulk_create(RequestEvent.for_changes(self, creating, changes))
+        self._send_field_changes(creating, changes)
+        self._reset_loaded_values(kwargs.get("update_fields"))
+
+    def _update_engineer_load(self, changes):
+        """Move this request between engineers' ongoing counters.
+
+        Taking a slot is a single conditional UPDATE
+        (``ongoing < max``), so concurrent assignments serialise on the
+        engineer's row and the loser gets a validation error instead of
+        overbooking the engineer. This works the same on PostgreSQL and SQLite.
+        """
+        if "engineer_id" not in changes and "status" not in changes:
+            return
+        old_engineer = self.previous_value("engineer_id") if "engineer_id" in changes else self.engineer_id
+        old_status = self.previous_value("status") if "status" in changes else self.status
+        counted_before = old_engineer if old_status == self.Status.ONGOING else None
+        counted_after = self.engineer_id if self.status == self.Status.ONGOING else None
+        if counted_before == counted_after:
+            return
+        users = get_user_model().objects
+        if counted_after:
+            reserved = users.filter(
+                pk=counted_after,
+                ongoing_request_count__lt=models.F("max_ongoing_requests"),
+            ).update(ongoing_request_count=models.F("ongoing_request_count") + 1)
+            if not reserved:
+                limit = users.filter(pk=counted_after).values_list("max_ongoing_requests", flat=True).first()
+                raise ValidationError({"engineer": self._capacity_message(limit)})
+            caching.invalidate_on_commit("engineer-load")
+        if counted_before:
+            release_engineer_slots({counted_before: 1})
+
+    @staticmethod
+    def _capacity_message(limit):
+        return f"Selected engineer already has {limit} ongoing requests."
 
     @property
     def is_overdue(self) -> bool:
@@ -132,23 +228,59 @@ class Request(models.Model):
         return f"{self.reference_code or 'Request'} - {self.account.name}"
 
 
-class Notification(models.Model):
+class Notification(FieldTrackerMixin, models.Model):
+    class Kind(models.TextChoices):
+        GENERAL = "general", "General"
+        SLA_BREACH = "sla_breach", "SLA breach"
+
     recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
     message = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
     related_request = models.ForeignKey(Request, on_delete=models.CASCADE, related_name="notifications", null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices, default=Kind.GENERAL)
+    sla_date = models.DateField(blank=True, null=True)
+
+    tracked_fields = ("is_read",)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "is_read", "created_at"], name="hub_notif_recipient_unread_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["related_request", "recipient", "kind", "sla_date"],
+                condition=models.Q(kind="sla_breach"),
+                name="hub_notification_sla_dedupe",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.message
 
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        if not creating:
+            self._ensure_loaded_values()
+        changes = self.get_changes()
+        super().save(*args, **kwargs)
+        self._send_field_changes(creating, changes)
+        self._reset_loaded_values(kwargs.get("update_fields"))
+
     def mark_read(self):
-        if not self.is_read:
-            self.is_read = True
-            self.save(update_fields=["is_read"])
+        if self.is_read:
+            return
+        with transaction.atomic():
+            # Conditional UPDATE so two concurrent clicks only decrement once.
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True)
+            if updated:
+                get_user_model().objects.filter(pk=self.recipient_id, unread_notification_count__gt=0).update(
+                    unread_notification_count=models.F("unread_notification_count") - 1
+                )
+                caching.invalidate_on_commit(f"notifications:{self.recipient_id}")
+        self.is_read = True
+        self._reset_loaded_values(["is_read"])
 
     @property
     def icon_class(self) -> str:
@@ -162,6 +294,30 @@ class Notification(models.Model):
         return "bi-bell"
 
 
+class EngineerSkill(models.Model):
+    """A product category an engineer takes requests for; see ``hub.assignment``.
+
+    Engineers without any skill rows are treated as generalists.
+    """
+
+    engineer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="skills",
+        limit_choices_to={"role": "engineer"},
+    )
+    product_category = models.CharField(max_length=50, choices=Request.ProductCategory.choices)
+
+    class Meta:
+        ordering = ["engineer", "product_category"]
+        constraints = [
+            models.UniqueConstraint(fields=["engineer", "product_category"], name="hub_engineer_skill_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.engineer}: {self.product_category}"
+
+
 class StatusLog(models.Model):
     request = models.ForeignKey(Request, on_delete=models.CASCADE, related_name="status_logs")
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="status_logs")
@@ -173,3 +329,297 @@ class StatusLog(models.Model):
 
     def __str__(self) -> str:
         return f"{self.request.reference_code or 'Request'}: {self.author.get_full_name() or self.author.username}"
+
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating:
+                RequestEvent.objects.create(
+                    request_id=self.request_id,
+                    kind=RequestEvent.Kind.COMMENTED,
+                    actor_id=self.author_id,
+                    data={"status_log": self.pk},
+                    created_at=self.created_at,
+                )
+
+
+class RequestEvent(models.Model):
+    """Append-only history of request changes, written in the same transaction as each change.
+
+    ``id`` grows monotonically, so consumers can resume after the last id
+    they handled (see ``hub.events``). Rows outlive their request: the
+    foreign key has no database constraint and deletions are recorded as
+    events of their own.
+    """
+
+    class Kind(models.TextChoices):
+        CREATED = "created", "Created"
+        ASSIGNED = "assigned", "Assigned"
+        REASSIGNED = "reassigned", "Reassigned"
+        PRIORITY_CHANGED = "priority_changed", "Priority changed"
+        DUE_DATE_CHANGED = "due_date_changed", "Due date changed"
+        COMPLETED = "completed", "Completed"
+        REOPENED = "reopened", "Reopened"
+        COMMENTED = "commented", "Commented"
+        DELETED = "deleted", "Deleted"
+        ARCHIVED = "archived", "Archived"
+
+    request = models.ForeignKey(
+        Request,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="events",
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    # Old and new values of the changed field, e.g. {"old": 4, "new": 7}.
+    data = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["request", "created_at"], name="hub_event_request_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"#{self.pk} {self.kind} request {self.request_id}"
+
+    def describe(self, names):
+        """One-line summary for timelines; ``names`` maps user ids in ``data`` to display names."""
+        data = self.data
+        if self.kind in (self.Kind.ASSIGNED, self.Kind.REASSIGNED):
+            new = names.get(data.get("new"), "nobody") if data.get("new") else "nobody"
+            if self.kind == self.Kind.ASSIGNED:
+                return f"Assigned to {new}"
+            return f"Reassigned from {names.get(data.get('old'), 'a former engineer')} to {new}"
+        if self.kind == self.Kind.PRIORITY_CHANGED:
+            return f"Priority changed from {data.get('old')} to {data.get('new')}"
+        if self.kind == self.Kind.DUE_DATE_CHANGED:
+            return f"Due date moved from {data.get('old') or 'none'} to {data.get('new') or 'none'}"
+        if self.kind == self.Kind.CREATED and data.get("engineer"):
+            return f"Created and assigned to {names.get(data['engineer'], 'a former engineer')}"
+        return self.get_kind_display()
+
+    @classmethod
+    def for_changes(cls, request_obj, created, changes):
+        """Unsaved events describing a ``Request`` save with ``changes`` (attname -> FieldChange)."""
+        if created:
+            data = {"status": request_obj.status, "priority": request_obj.priority, "engineer": request_obj.engineer_id}
+            return [cls(request=request_obj, kind=cls.Kind.CREATED, data=data)]
+        events = []
+        engineer = changes.get("engineer_id")
+        if engineer:
+            kind = cls.Kind.ASSIGNED if engineer.old is None else cls.Kind.REASSIGNED
+            events.append(cls(request=request_obj, kind=kind, data={"old": engineer.old, "new": engineer.new}))
+        priority = changes.get("priority")
+        if priority:
+            data = {"old": priority.old, "new": priority.new}
+            events.append(cls(request=request_obj, kind=cls.Kind.PRIORITY_CHANGED, data=data))
+        due_date = changes.get("due_date")
+        if due_date:
+            data = {"old": due_date.old, "new": due_date.new}
+            events.append(cls(request=request_obj, kind=cls.Kind.DUE_DATE_CHANGED, data=data))
+        status = changes.get("status")
+        if status:
+            kind = cls.Kind.COMPLETED if status.new == Request.Status.COMPLETED else cls.Kind.REOPENED
+            events.append(cls(request=request_obj, kind=kind, data={"old": status.old, "new": status.new}))
+        return events
+
+
+class EventCursor(models.Model):
+    """How far a named consumer has read ``RequestEvent``; see ``hub.events.read``."""
+
+    name = models.CharField(max_length=100, unique=True)
+    position = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} at #{self.position}"
+
+
+class DailyRequestStats(models.Model):
+    """Per-day request counts, one row per (engineer, account, priority, category).
+
+    Requests count as opened on their ``start_date`` and as completed on their
+    ``end_date``. Rows are rebuilt by ``hub.analytics`` and never edited by
+    hand.
+    """
+
+    day = models.DateField()
+    engineer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="+")
+    priority = models.CharField(max_length=10, choices=Request.Priority.choices)
+    product_category = models.CharField(max_length=50)
+    opened = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    completed_on_time = models.PositiveIntegerField(default=0)
+    completion_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["day"], name="hub_daily_stats_day_idx"),
+        ]
+        verbose_name_plural = "daily request stats"
+
+    def __str__(self) -> str:
+        return f"{self.day}: {self.opened} opened, {self.completed} completed"
+
+
+class Job(models.Model):
+    """A unit of background work claimed and run by ``manage.py run_worker``."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    dedupe_key = models.CharField(max_length=150, unique=True, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_at", "id"], name="hub_job_ready_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.status})"
+
+
+class ArchivedRequest(models.Model):
+    """A completed request moved out of ``Request`` by ``hub.archive``.
+
+    Rows keep their original id, so links, cache keys and ``RequestEvent``
+    history stay valid. Archived requests are read-only.
+    """
+
+    is_archived = True
+    is_overdue = False
+
+    id = models.BigIntegerField(primary_key=True)
+    reference_code = models.CharField(max_length=20)
+    requestor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+", db_index=False)
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="+", db_index=False)
+    account_manager = models.CharField(max_length=255)
+    product_category = models.CharField(max_length=50, choices=Request.ProductCategory.choices)
+    priority = models.CharField(max_length=10, choices=Request.Priority.choices)
+    engagement_type = models.CharField(max_length=20, choices=Request.Engagement.choices)
+    start_date = models.DateField()
+    due_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True)
+    engineer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="+",
+        blank=True,
+        null=True,
+        db_index=False,
+    )
+    status = models.CharField(max_length=20, choices=Request.Status.choices)
+    description = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        # Declared here rather than through db_index so that a partitioned
+        # archive (see hub.archive) can recreate them on the new table.
+        indexes = [
+            models.Index(fields=["reference_code"], name="hub_arch_req_code_idx"),
+            models.Index(fields=["requestor"], name="hub_arch_req_requestor_idx"),
+            models.Index(fields=["engineer"], name="hub_arch_req_engineer_idx"),
+            models.Index(fields=["account"], name="hub_arch_req_account_idx"),
+            models.Index(fields=["start_date"], name="hub_arch_req_start_idx"),
+            models.Index(fields=["end_date"], name="hub_arch_req_end_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.reference_code} (archived)"
+
+    def get_absolute_url(self):
+        from django.urls import reverse
+
+        return reverse("hub:request-detail", args=[self.pk])
+
+    @property
+    def events(self):
+        return RequestEvent.objects.filter(request_id=self.pk)
+
+
+class ArchivedStatusLog(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    request = models.ForeignKey(
+        ArchivedRequest,
+        on_delete=models.CASCADE,
+        related_name="status_logs",
+        db_constraint=False,
+        db_index=False,
+    )
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    message = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["request", "created_at"], name="hub_arch_log_request_idx"),
+            models.Index(fields=["author"], name="hub_arch_log_author_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Archived log #{self.pk} on request {self.request_id}"
+
+
+class ArchivedNotification(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField()
+    is_read = models.BooleanField(default=False)
+    related_request = models.ForeignKey(
+        ArchivedRequest,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        null=True,
+        blank=True,
+        db_constraint=False,
+        db_index=False,
+    )
+    kind = models.CharField(max_length=20, choices=Notification.Kind.choices)
+    sla_date = models.DateField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "created_at"], name="hub_arch_notif_recipient_idx"),
+            models.Index(fields=["related_request"], name="hub_arch_notif_request_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.message
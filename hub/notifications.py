@@ -0,0 +1,132 @@
+"""Notification dispatch shared by views, signal handlers and commands.
+
+Recipients are resolved to primary keys up front and rows are written with a
+single ``bulk_create`` once the surrounding transaction commits, so fanning
+out to every admin costs the same as notifying one user.
+"""
+
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from accounts.models import User
+
+from . import caching, jobs, realtime
+from .models import Notification
+
+ADMIN_ROSTER_CACHE_KEY = "hub:notifications:admin-ids"
+ADMIN_ROSTER_TIMEOUT = 300
+BULK_BATCH_SIZE = 1000
+# Columns carried in a queued notification write.
+ROW_FIELDS = ("recipient_id", "message", "related_request_id", "kind", "sla_date", "is_read")
+
+
+def admin_ids():
+    """Primary keys of every admin user, cached until an admin changes."""
+    return cache.get_or_set(
+        ADMIN_ROSTER_CACHE_KEY,
+        lambda: list(User.objects.filter(role=User.Roles.ADMIN).values_list("pk", flat=True)),
+        ADMIN_ROSTER_TIMEOUT,
+    )
+
+
+def invalidate_admin_roster():
+    cache.delete(ADMIN_ROSTER_CACHE_KEY)
+
+
+def build(recipient_ids, message, related_request=None, exclude=(), **fields):
+    """Return unsaved notifications for each distinct recipient not in ``exclude``."""
+    skipped = {pk for pk in exclude if pk is not None}
+    recipients = dict.fromkeys(pk for pk in recipient_ids if pk is not None and pk not in skipped)
+    return [
+        Notification(recipient_id=pk, message=message, related_request=related_request, **fields)
+        for pk in recipients
+    ]
+
+
+def dispatch(notifications, ignore_conflicts=False):
+    """Write ``notifications`` in bulk after the current transaction commits.
+
+    With ``JOB_QUEUE_NOTIFICATIONS`` the write is handed to the background
+    worker instead, keeping large fan-outs out of the request cycle.
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return
+    if settings.JOB_QUEUE_NOTIFICATIONS:
+        rows = [{field: getattr(notification, field) for field in ROW_FIELDS} for notification in notifications]
+        jobs.enqueue("hub.write_notifications", {"rows": rows, "ignore_conflicts": ignore_conflicts})
+        return
+    transaction.on_commit(lambda: write(notifications, ignore_conflicts=ignore_conflicts))
+
+
+def write(notifications, ignore_conflicts=False):
+    with transaction.atomic():
+        Notification.objects.bulk_create(
+            notifications,
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=ignore_conflicts,
+        )
+        unread = [notification.recipient_id for notification in notifications if not notification.is_read]
+        if ignore_conflicts:
+            # Rows skipped as duplicates are not reported back, so count
+            # from the table instead of incrementing blindly.
+            recount_unread(set(unread))
+        else:
+            adjust_unread(Counter(unread))
+    caching.invalidate_on_commit(*{f"notifications:{pk}" for pk in unread})
+    realtime.get_broker().notifications_created(notifications)
+
+
+def notify(recipient_ids, message, related_request=None, exclude=(), **fields):
+    dispatch(build(recipient_ids, message, related_request=related_request, exclude=exclude, **fields))
+
+
+def notify_admins(message, related_request=None, also=(), exclude=(), **fields):
+    notify([*admin_ids(), *also], message, related_request=related_request, exclude=exclude, **fields)
+
+
+def adjust_unread(deltas):
+    """Apply ``{user_id: delta}`` to the unread counters, one UPDATE per distinct delta."""
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        users = User.objects.filter(pk__in=user_ids)
+        if delta < 0:
+            users = users.filter(unread_notification_count__gte=-delta)
+        users.update(unread_notification_count=F("unread_notification_count") + delta)
+
+
+def recount_unread(user_ids=None):
+    """Recompute unread counters from the notification table."""
+    unread = (
+        Notification.objects.filter(recipient=OuterRef("pk"), is_read=False)
+        .order_by()
+        .values("recipient")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    users = User.objects.all() if user_ids is None else User.objects.filter(pk__in=user_ids)
+    users.update(unread_notification_count=Coalesce(Subquery(unread), Value(0)))
+
+
+def mark_all_read(user):
+    with transaction.atomic():
+        updated = Notification.objects.filter(recipient=user, is_read=False).update(is_read=True)
+        # Notifications created while this runs stay unread and counted; the
+        # floor keeps a drifted counter from going negative.
+        if updated:
+            User.objects.filter(pk=user.pk).update(
+                unread_notification_count=Greatest(F("unread_notification_count") - updated, Value(0))
+            )
+        caching.invalidate_on_commit(f"notifications:{user.pk}")
+    user.unread_notification_count = (
+        User.objects.filter(pk=user.pk).values_list("unread_notification_count", flat=True).get()
+    )
+    return updated
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPaginator:
+    """Cursor pagination over an ordered tuple of columns.
+
+    Pages are selected with a ``WHERE (key) > (cursor)`` predicate instead of
+    ``OFFSET`` so every page costs the same, however deep the reader goes.
+    The last key must be unique (normally ``id``). ``None`` values sort last,
+    matching the PostgreSQL default for ascending indexes. Querysets may
+    return model instances or ``values()`` dicts.
+    """
+
+    def __init__(self, queryset, keys, per_page=50):
+        self.queryset = queryset
+        self.keys = tuple(keys)
+        self.per_page = per_page
+
+    def ordered(self, reverse=False):
+        ordering = [
+            F(key).desc(nulls_first=True) if reverse else F(key).asc(nulls_last=True)
+            for key in self.keys
+        ]
+        return self.queryset.order_by(*ordering)
+
+    def page(self, cursor=None, direction="next"):
+        reverse = direction == "prev" and cursor is not None
+        qs = self.ordered(reverse=reverse)
+        if cursor is not None:
+            qs = qs.filter(self._seek(self.decode(cursor), before=reverse))
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode(rows[-1]) if rows and has_next else None,
+            previous_cursor=self.encode(rows[0]) if rows and has_previous else None,
+        )
+
+    def _seek(self, values, before=False):
+        condition = Q(pk__in=[])
+        for index, key in enumerate(self.keys):
+            prefix = Q()
+            for earlier, value in zip(self.keys[:index], values[:index]):
+                prefix &= Q(**{f"{earlier}__isnull": True}) if value is None else Q(**{earlier: value})
+            value = values[index]
+            if before:
+                step = Q(**{f"{key}__isnull": False}) if value is None else Q(**{f"{key}__lt": value})
+            else:
+                if value is None:
+                    continue
+                step = Q(**{f"{key}__gt": value}) | Q(**{f"{key}__isnull": True})
+            condition |= prefix & step
+        return condition
+
+    def encode(self, obj):
+        values = []
+        for key in self.keys:
+            value = obj[key] if isinstance(obj, dict) else getattr(obj, key)
+            values.append(value.isoformat() if isinstance(value, date) else value)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, ValueError, UnicodeDecodeError) as exc:
+            raise InvalidCursor("Malformed page cursor.") from exc
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            raise InvalidCursor("Malformed page cursor.")
+        decoded = []
+        for key, value in zip(self.keys, values):
+            field = self.queryset.model._meta.get_field(key)
+            try:
+                decoded.append(None if value is None else field.to_python(value))
+            except ValidationError as exc:
+                raise InvalidCursor("Malformed page cursor.") from exc
+        return decoded
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
@@ -0,0 +1,310 @@
+"""Per-user push channel behind the Server-Sent Events endpoint.
+
+Each ASGI process keeps one subscriber queue per open stream. Events are
+delivered to the queues of the users who may see them:
+
+* ``LocalBroker`` publishes straight from signal handlers in the same
+  process. It is the stand-in backend for runserver and single-process
+  deployments.
+* ``PollingBroker`` runs a single background poll per process that reads new
+  notifications and recently updated requests from the database, so writes
+  made by any worker reach every stream.
+"""
+
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from accounts.models import User
+
+from .events import SETTLE_SECONDS
+from .models import Notification, Request
+
+POLL_BATCH_SIZE = 500
+REQUEST_EVENT_FIELDS = (
+    "id",
+    "reference_code",
+    "status",
+    "priority",
+    "engineer_id",
+    "requestor_id",
+    "due_date",
+    "updated_at",
+)
+
+
+class Event(NamedTuple):
+    name: str
+    data: dict
+    id: str = ""
+
+    def encode(self) -> str:
+        lines = []
+        if self.id:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.name}")
+        lines.append(f"data: {json.dumps(self.data, cls=DjangoJSONEncoder)}")
+        return "\n".join(lines) + "\n\n"
+
+
+def notification_event(notification, unread_count=None) -> Event:
+    data = {
+        "id": notification.pk,
+        "message": notification.message,
+        "created_at": notification.created_at,
+        "related_request": notification.related_request_id,
+    }
+    if unread_count is not None:
+        data["unread_count"] = unread_count
+    return Event("notification", data, id=f"n:{notification.pk}")
+
+
+def request_event(values) -> Event:
+    return Event(
+        "request",
+        {
+            "id": values["id"],
+            "reference_code": values["reference_code"],
+            "status": values["status"],
+            "status_display": Request.Status(values["status"]).label,
+            "priority": values["priority"],
+            "engineer": values["engineer_id"],
+            "due_date": values["due_date"],
+            "updated_at": values["updated_at"],
+        },
+    )
+
+
+def request_audience(values, admin_ids, *extra):
+    return {values["requestor_id"], values["engineer_id"], *admin_ids, *extra} - {None}
+
+
+class LocalBroker:
+    publishes_saves = True
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribed_user_ids(self):
+        with self._lock:
+            return set(self._subscribers)
+
+    def publish(self, user_ids, event):
+        """Queue ``event`` for every open stream of ``user_ids``; safe to call from any thread."""
+        with self._lock:
+            targets = [entry for user_id in user_ids for entry in self._subscribers.get(user_id, ())]
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue, event):
+        if queue.full():
+            # A stalled client loses its oldest events rather than growing
+            # memory without bound.
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def subscribe(self, user_id):
+        """Async context manager registering a stream; ``async with`` yields its event queue."""
+        return Subscription(self, user_id)
+
+    def _register(self, user_id, entry):
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        self.on_subscribe()
+
+    def _unregister(self, user_id, entry):
+        with self._lock:
+            self._subscribers[user_id].discard(entry)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def on_subscribe(self):
+        pass
+
+    def request_saved(self, instance, admin_ids, previous_engineer_id=None):
+        if not self.publishes_saves:
+            return
+        values = {field: getattr(instance, field) for field in REQUEST_EVENT_FIELDS}
+        self.publish(request_audience(values, admin_ids, previous_engineer_id), request_event(values))
+
+    def requests_updated(self, pks, admin_ids, previous_engineer_ids=None):
+        """Publish rows changed by a queryset ``update()``, read back in one query."""
+        if not self.publishes_saves:
+            return
+        previous_engineer_ids = previous_engineer_ids or {}
+        for values in Request.objects.filter(pk__in=pks).values(*REQUEST_EVENT_FIELDS):
+            audience = request_audience(values, admin_ids, previous_engineer_ids.get(values["id"]))
+            self.publish(audience, request_event(values))
+
+    def notifications_created(self, notifications):
+        if not self.publishes_saves:
+            return
+        for notification in notifications:
+            if notification.pk:
+                self.publish([notification.recipient_id], notification_event(notification))
+
+
+class Subscription:
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=broker.queue_size)
+        self._entry = None
+
+    async def __aenter__(self):
+        self._entry = (asyncio.get_running_loop(), self.queue)
+        self.broker._register(self.user_id, self._entry)
+        return self.queue
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.broker._unregister(self.user_id, self._entry)
+        return False
+
+
+class Feed(NamedTuple):
+    """Read position in one polled table.
+
+    Rows become visible at commit, not in key order, so the position only
+    moves past rows older than ``SETTLE_SECONDS``. Newer rows are read again
+    on the next poll, and ``seen`` keeps them from being published twice.
+    """
+
+    position: object
+    seen: frozenset
+
+    def advance(self, rows, horizon):
+        """The feed after reading ``rows``, a key-ordered list of ``(key, written_at)``."""
+        position = self.position
+        for key, written_at in rows:
+            if written_at > horizon:
+                break
+            position = key
+        seen = frozenset(key for key in self.seen.union(key for key, _at in rows) if key > position)
+        return Feed(position, seen)
+
+
+class Cursor(NamedTuple):
+    notifications: Feed
+    requests: Feed
+
+
+class PollingBroker(LocalBroker):
+    """Polls notifications by id and requests by ``(updated_at, id)``; see ``Feed``."""
+
+    publishes_saves = False
+
+    def __init__(self, queue_size=100, interval=2.0):
+        super().__init__(queue_size=queue_size)
+        self.interval = interval
+        self._poller = None
+
+    def on_subscribe(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll_forever())
+
+    async def _poll_forever(self):
+        cursor = await sync_to_async(self._initial_cursor)()
+        while self.subscribed_user_ids():
+            await asyncio.sleep(self.interval)
+            users = self.subscribed_user_ids()
+            if not users:
+                break
+            try:
+                batch, cursor = await sync_to_async(self.poll)(cursor, users)
+            except DatabaseError:
+                # Keep the streams open and retry from the same cursor.
+                continue
+            for user_ids, event in batch:
+                self.publish(user_ids, event)
+
+    @staticmethod
+    def _initial_cursor():
+        last_id = Notification.objects.aggregate(last=Max("pk"))["last"] or 0
+        return Cursor(Feed(last_id, frozenset()), Feed((timezone.now(), 0), frozenset()))
+
+    def poll(self, cursor, user_ids):
+        """Return ``([(user_ids, event), ...], new_cursor)`` for rows written since ``cursor``."""
+        horizon = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+        batch = []
+
+        notifications = list(
+            Notification.objects.filter(pk__gt=cursor.notifications.position, recipient_id__in=user_ids).order_by(
+                "pk"
+            )[:POLL_BATCH_SIZE]
+        )
+        fresh = [notification for notification in notifications if notification.pk not in cursor.notifications.seen]
+        if fresh:
+            unread_counts = dict(User.objects.filter(pk__in=user_ids).values_list("pk", "unread_notification_count"))
+            for notification in fresh:
+                event = notification_event(notification, unread_counts.get(notification.recipient_id))
+                batch.append(([notification.recipient_id], event))
+        notification_feed = cursor.notifications.advance(
+            [(notification.pk, notification.created_at) for notification in notifications], horizon
+        )
+
+        position = cursor.requests.position
+        changed = list(
+            Request.objects.filter(
+                Q(updated_at__gt=position[0]) | Q(updated_at=position[0], pk__gt=position[1])
+            )
+            .order_by("updated_at", "pk")
+            .values(*REQUEST_EVENT_FIELDS)[:POLL_BATCH_SIZE]
+        )
+        keys = [((values["updated_at"], values["id"]), values["updated_at"]) for values in changed]
+        fresh = [values for values, (key, _at) in zip(changed, keys) if key not in cursor.requests.seen]
+        if fresh:
+            admin_ids = set(User.objects.filter(role=User.Roles.ADMIN, pk__in=user_ids).values_list("pk", flat=True))
+            for values in fresh:
+                audience = request_audience(values, admin_ids) & user_ids
+                if audience:
+                    batch.append((audience, request_event(values)))
+        return batch, Cursor(notification_feed, cursor.requests.advance(keys, horizon))
+
+
+def replay_notifications(user, last_event_id):
+    """Notifications a reconnecting client missed, from an ``n:<id>`` Last-Event-ID."""
+    if not last_event_id.startswith("n:"):
+        return []
+    try:
+        after = int(last_event_id[2:])
+    except ValueError:
+        return []
+    missed = user.notifications.filter(pk__gt=after).order_by("pk")[:POLL_BATCH_SIZE]
+    return [notification_event(notification) for notification in missed]
+
+
+BROKERS = {
+    "local": "hub.realtime.LocalBroker",
+    "polling": "hub.realtime.PollingBroker",
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = settings.REALTIME_BROKER
+                broker_class = import_string(BROKERS.get(backend, backend))
+                options = {}
+                if issubclass(broker_class, PollingBroker):
+                    options["interval"] = settings.REALTIME_POLL_INTERVAL
+                _broker = broker_class(**options)
+    return _broker
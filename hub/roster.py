@@ -0,0 +1,62 @@
+"""Cached engineer roster behind the engineer pickers.
+
+One query loads every engineer with their ongoing-request counter. The
+result is cached under the ``users`` and ``engineer-load`` tokens (see
+``hub.caching``), so rendering a request form costs no queries until an
+engineer's profile or load changes.
+"""
+
+from typing import NamedTuple
+
+from accounts.models import User
+
+from . import caching
+
+
+class Engineer(NamedTuple):
+    pk: int
+    name: str
+    avatar_url: str
+    ongoing: int
+    capacity: int
+
+    @property
+    def initial(self):
+        return self.name[:1].upper() or "?"
+
+    @property
+    def free(self):
+        return max(self.capacity - self.ongoing, 0)
+
+    @property
+    def at_capacity(self):
+        return self.ongoing >= self.capacity
+
+
+def _load():
+    engineers = User.objects.filter(role=User.Roles.ENGINEER).only(
+        "pk",
+        "username",
+        "first_name",
+        "last_name",
+        "profile_photo",
+        "profile_photo_hash",
+        "ongoing_request_count",
+        "max_ongoing_requests",
+    )
+    return [
+        Engineer(
+            user.pk,
+            user.get_full_name().strip() or user.username,
+            user.avatar_url(),
+            user.ongoing_request_count,
+            user.max_ongoing_requests,
+        )
+        for user in engineers
+    ]
+
+
+def engineers():
+    """Every engineer, those with the most free slots first, then by name."""
+    roster = caching.summary("roster", ("users", "engineer-load"), _load)
+    return sorted(roster, key=lambda engineer: (engineer.at_capacity, -engineer.free, engineer.name.casefold()))
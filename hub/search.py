@@ -0,0 +1,169 @@
+"""Full-text search over request descriptions and status-log messages.
+
+* PostgreSQL adds a stored generated ``search_vector`` column holding
+  ``to_tsvector('english', ...)`` to each source table, with a GIN index on
+  it. The database keeps the column current on every write, and ranking
+  reads it instead of re-parsing the text.
+* SQLite keeps FTS5 tables (``hub_request_fts``, ``hub_statuslog_fts``)
+  keyed by row id. Triggers on the source tables keep them current, so ORM
+  saves, ``update()`` calls and cascading deletes all reach the index.
+* Other databases fall back to ``icontains``.
+
+A status-log hit counts toward its request with half the weight of a
+description hit. Hits are restricted to the caller's queryset before they
+are ranked and cut to the result limit.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+TERM = re.compile(r"\w+")
+MAX_TERMS = 16
+MAX_RESULTS = 50
+LOG_WEIGHT = 0.5
+VECTOR = "search_vector"
+
+SEARCHABLE = (
+    ("hub_request", "description"),
+    ("hub_statuslog", "message"),
+)
+
+
+def terms(query):
+    return TERM.findall((query or "").casefold())[:MAX_TERMS]
+
+
+def _postgres_statements(table, column):
+    return (
+        # Replaces the expression index used before the column existed.
+        f"DROP INDEX IF EXISTS {table}_search_idx",
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {VECTOR} tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('english', coalesce({column}, ''))) STORED",
+        f"CREATE INDEX IF NOT EXISTS {table}_{VECTOR}_idx ON {table} USING GIN ({VECTOR})",
+    )
+
+
+def _sqlite_statements(table, column):
+    fts = f"{table}_fts"
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END",
+    )
+
+
+def install(conn=connection):
+    """Create the search index for ``conn``; safe to run repeatedly.
+
+    On SQLite a table rebuild drops its triggers, so missing triggers are
+    recreated and the FTS table re-synced from its source.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for table, column in SEARCHABLE:
+                for statement in _postgres_statements(table, column):
+                    cursor.execute(statement)
+        elif conn.vendor == "sqlite":
+            for table, column in SEARCHABLE:
+                fts = f"{table}_fts"
+                cursor.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                    [f"{fts}_a_"],
+                )
+                if cursor.fetchone()[0] == 3:
+                    continue
+                for statement in _sqlite_statements(table, column):
+                    cursor.execute(statement)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def uninstall(conn=connection):
+    with conn.cursor() as cursor:
+        for table, _column in SEARCHABLE:
+            if conn.vendor == "postgresql":
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_{VECTOR}_idx")
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {VECTOR}")
+            elif conn.vendor == "sqlite":
+                for suffix in ("ai", "ad", "au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+def _postgres_hits(words, scope_sql):
+    tsquery = " & ".join([*words[:-1], f"{words[-1]}:*"])
+    sql = (
+        f"SELECT r.id AS request_id, ts_rank(r.{VECTOR}, q) AS rank "
+        "FROM hub_request r, to_tsquery('english', %s) q "
+        f"WHERE r.{VECTOR} @@ q AND r.id IN ({scope_sql}) "
+        "UNION ALL "
+        f"SELECT l.request_id, ts_rank(l.{VECTOR}, q) * {LOG_WEIGHT} "
+        "FROM hub_statuslog l, to_tsquery('english', %s) q "
+        f"WHERE l.{VECTOR} @@ q AND l.request_id IN ({scope_sql})"
+    )
+    return sql, tsquery
+
+
+def _sqlite_hits(words, scope_sql):
+    # Quoted terms cannot be read as FTS5 operators; the last one matches
+    # as a prefix so partially typed words still find results.
+    match = " ".join(f'"{word}"' for word in words) + "*"
+    sql = (
+        "SELECT rowid AS request_id, -bm25(hub_request_fts) AS rank "
+        f"FROM hub_request_fts WHERE hub_request_fts MATCH %s AND rowid IN ({scope_sql}) "
+        "UNION ALL "
+        f"SELECT l.request_id, -bm25(hub_statuslog_fts) * {LOG_WEIGHT} "
+        "FROM hub_statuslog_fts JOIN hub_statuslog l ON l.id = hub_statuslog_fts.rowid "
+        f"WHERE hub_statuslog_fts MATCH %s AND l.request_id IN ({scope_sql})"
+    )
+    return sql, match
+
+
+BACKENDS = {
+    "postgresql": _postgres_hits,
+    "sqlite": _sqlite_hits,
+}
+
+
+def search(query, queryset, limit=MAX_RESULTS):
+    """Requests from ``queryset`` matching ``query``, best first, each with a ``search_rank``."""
+    words = terms(query)
+    if not words:
+        return []
+    hits = BACKENDS.get(connection.vendor)
+    if hits is None:
+        return _search_fallback(words, queryset, limit)
+
+    scope_sql, scope_params = queryset.order_by().values("pk").query.sql_with_params()
+    hits_sql, match = hits(words, scope_sql)
+    sql = (
+        f"SELECT hits.request_id, MAX(hits.rank) AS best FROM ({hits_sql}) hits "
+        "GROUP BY hits.request_id ORDER BY best DESC, hits.request_id DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *scope_params, match, *scope_params, limit])
+        ranked = cursor.fetchall()
+
+    found = queryset.in_bulk([pk for pk, _rank in ranked])
+    results = []
+    for pk, rank in ranked:
+        if pk in found:
+            found[pk].search_rank = rank
+            results.append(found[pk])
+    return results
+
+
+def _search_fallback(words, queryset, limit):
+    for word in words:
+        queryset = queryset.filter(Q(description__icontains=word) | Q(status_logs__message__icontains=word))
+    results = list(queryset.distinct()[:limit])
+    for obj in results:
+        obj.search_rank = None
+    return results
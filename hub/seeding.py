@@ -0,0 +1,234 @@
+"""Synthetic request data for load testing (``seed_hub`` and ``benchmark_hub``).
+
+Rows are written with ``bulk_create`` in batches. Accounts follow a Zipf-like
+popularity curve over ``ACCOUNT_NAME_SUGGESTIONS``. Completion times are
+log-normal around each priority's SLA, and engineers are never pushed past
+``max_ongoing_requests``. Derived data (engineer load counters, analytics
+rollups, the autocomplete index) is refreshed once at the end instead of per
+row.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.db.models.functions import Cast, Concat, LPad
+from django.utils import timezone
+
+from accounts.models import User
+
+from . import analytics, autocomplete, caching
+from .business_days import get_calendar
+from .constants import ACCOUNT_NAME_SUGGESTIONS
+from .models import Account, Request, RequestEvent, StatusLog, recount_engineer_load
+
+BATCH_SIZE = 2000
+PRIORITY_WEIGHTS = {Request.Priority.MEDIUM: 7, Request.Priority.HIGH: 3}
+ENGAGEMENT_WEIGHTS = {
+    Request.Engagement.SUPPORT: 5,
+    Request.Engagement.OPPORTUNITY: 3,
+    Request.Engagement.INQUIRY: 2,
+    Request.Engagement.TRAINING: 1,
+}
+CATEGORY_WEIGHTS = {"Azure": 6, "M365": 5, "VMware": 3, "Hybrid": 2, "Omnissa": 1, "Others": 1}
+# Median completion as a share of the SLA; about four in five requests finish on time.
+COMPLETION_MEDIAN_SHARE = 0.7
+COMPLETION_SIGMA = 0.6
+
+DESCRIPTIONS = (
+    "Customer needs help sizing a {category} deployment for {account}.",
+    "Follow-up on the {category} licensing questions raised by {account}.",
+    "{account} reported intermittent issues after the latest {category} update.",
+    "Prepare a {category} proof of concept environment for {account}.",
+    "Review the {category} migration plan and timeline with {account}.",
+    "Schedule a {category} enablement session for the {account} team.",
+)
+LOG_MESSAGES = (
+    "Reached out to the customer for more details.",
+    "Shared the initial assessment and next steps.",
+    "Waiting on the customer to confirm the schedule.",
+    "Environment reviewed; no blockers found.",
+    "Escalated to the vendor for confirmation.",
+    "Call completed, notes sent to the account manager.",
+)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let ``bulk_create`` keep the dates set on the objects instead of stamping ``now``.
+
+    Flips ``auto_now``/``auto_now_add`` on the model fields for the duration,
+    so it must not run alongside request handling in the same process.
+    """
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _reference_code():
+    padded = Concat(Value("REQ-"), LPad(Cast("pk", CharField()), 5, Value("0")))
+    return Case(
+        When(pk__lt=100000, then=padded),
+        default=Concat(Value("REQ-"), Cast("pk", CharField())),
+        output_field=CharField(),
+    )
+
+
+class Seeder:
+    def __init__(self, seed=None, days=365):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.today = timezone.now().date()
+        self.calendar = get_calendar()
+        self.free_slots = {
+            pk: limit - load
+            for pk, limit, load in User.objects.filter(role=User.Roles.ENGINEER).values_list(
+                "pk", "max_ongoing_requests", "ongoing_request_count"
+            )
+        }
+        self.engineers = list(self.free_slots)
+        self.requestors = [
+            (pk, f"{first} {last}".strip() or username)
+            for pk, first, last, username in User.objects.filter(role=User.Roles.REQUESTOR).values_list(
+                "pk", "first_name", "last_name", "username"
+            )
+        ]
+        if not self.engineers or not self.requestors:
+            raise ValueError("Seeding needs at least one engineer and one requestor user.")
+        Account.objects.bulk_create(
+            [Account(name=name) for name in ACCOUNT_NAME_SUGGESTIONS],
+            ignore_conflicts=True,
+        )
+        names = dict(Account.objects.filter(name__in=ACCOUNT_NAME_SUGGESTIONS).values_list("name", "pk"))
+        self.accounts = [(names[name], name) for name in ACCOUNT_NAME_SUGGESTIONS if name in names]
+        self.account_weights = [1 / rank for rank in range(1, len(self.accounts) + 1)]
+
+    def _pick(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _moment(self, day):
+        seconds = self.rng.randrange(8 * 3600, 18 * 3600)
+        return timezone.make_aware(datetime.combine(day, time()) + timedelta(seconds=seconds))
+
+    def _request(self, placeholder):
+        rng = self.rng
+        priority = self._pick(PRIORITY_WEIGHTS)
+        sla_days = Request.SLA_DAYS[priority]
+        start = self.today - timedelta(days=rng.randrange(self.days))
+        due = self.calendar.add_business_days(start, sla_days)
+        business_days = round(rng.lognormvariate(0, COMPLETION_SIGMA) * sla_days * COMPLETION_MEDIAN_SHARE)
+        end = self.calendar.add_business_days(start, business_days)
+        requestor_id, manager = rng.choice(self.requestors)
+        account_id, account_name = rng.choices(self.accounts, weights=self.account_weights)[0]
+        engineer_id = rng.choice(self.engineers)
+        category = self._pick(CATEGORY_WEIGHTS)
+
+        status = Request.Status.COMPLETED
+        if end > self.today:
+            open_slots = [pk for pk, free in self.free_slots.items() if free > 0]
+            if open_slots:
+                engineer_id = engineer_id if self.free_slots[engineer_id] > 0 else rng.choice(open_slots)
+                self.free_slots[engineer_id] -= 1
+                status = Request.Status.ONGOING
+            end = self.today
+        created_at = self._moment(start)
+        return Request(
+            reference_code=placeholder,
+            requestor_id=requestor_id,
+            account_id=account_id,
+            account_manager=manager,
+            product_category=category,
+            priority=priority,
+            engagement_type=self._pick(ENGAGEMENT_WEIGHTS),
+            start_date=start,
+            due_date=due,
+            sla_due_date=due,
+            end_date=end if status == Request.Status.COMPLETED else None,
+            engineer_id=engineer_id,
+            status=status,
+            description=rng.choice(DESCRIPTIONS).format(category=category, account=account_name),
+            created_at=created_at,
+            updated_at=max(created_at, self._moment(end)),
+        )
+
+    def _logs(self, request, logs_per_request):
+        rng = self.rng
+        count = rng.randint(0, 2 * logs_per_request) if logs_per_request else 0
+        last_day = request.end_date or self.today
+        span = max((last_day - request.start_date).days, 0)
+        return [
+            StatusLog(
+                request_id=request.pk,
+                author_id=rng.choice((request.engineer_id, request.requestor_id)),
+                message=rng.choice(LOG_MESSAGES),
+                created_at=self._moment(request.start_date + timedelta(days=rng.randint(0, span))),
+            )
+            for _ in range(count)
+        ]
+
+    def _events(self, requests, logs):
+        Kind = RequestEvent.Kind
+        events = []
+        for request in requests:
+            data = {"status": Request.Status.ONGOING, "priority": request.priority, "engineer": request.engineer_id}
+            events.append(
+                RequestEvent(request_id=request.pk, kind=Kind.CREATED, data=data, created_at=request.created_at)
+            )
+            if request.status == Request.Status.COMPLETED:
+                data = {"old": Request.Status.ONGOING, "new": Request.Status.COMPLETED}
+                events.append(
+                    RequestEvent(request_id=request.pk, kind=Kind.COMPLETED, data=data, created_at=request.updated_at)
+                )
+        events.extend(
+            RequestEvent(
+                request_id=log.request_id,
+                kind=Kind.COMMENTED,
+                actor_id=log.author_id,
+                data={"status_log": log.pk},
+                created_at=log.created_at,
+            )
+            for log in logs
+        )
+        return events
+
+    def seed(self, requests, logs_per_request=3, progress=None):
+        """Insert ``requests`` requests with about ``logs_per_request`` status logs each."""
+        token = f"{self.rng.getrandbits(32):08x}"
+        created = logs = 0
+        with explicit_timestamps(Request, StatusLog):
+            while created < requests:
+                size = min(BATCH_SIZE, requests - created)
+                # Unique placeholders satisfy the reference_code constraint
+                # until the real codes are derived from the new primary keys.
+                batch = [self._request(f"~{token}{created + i:09d}") for i in range(size)]
+                with transaction.atomic():
+                    Request.objects.bulk_create(batch)
+                    Request.objects.filter(pk__in=[obj.pk for obj in batch]).update(reference_code=_reference_code())
+                    pending = [log for obj in batch for log in self._logs(obj, logs_per_request)]
+                    StatusLog.objects.bulk_create(pending, batch_size=BATCH_SIZE)
+                    RequestEvent.objects.bulk_create(self._events(batch, pending), batch_size=BATCH_SIZE)
+                created += size
+                logs += len(pending)
+                if progress:
+                    progress(created, logs)
+        self.finish()
+        return created, logs
+
+    def finish(self):
+        recount_engineer_load(self.engineers)
+        analytics.rebuild(start=self.today - timedelta(days=self.days), end=self.today)
+        autocomplete.bump_version()
+        caching.invalidate("requests")
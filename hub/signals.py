@@ -1,60 +1,160 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.db import connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
 from django.dispatch import receiver
 
-from .models import Notification, Request
+from accounts.models import User
 
+from . import analytics, autocomplete, caching, notifications, realtime, search
+from .models import Account, EngineerSkill, Notification, Request, RequestEvent, StatusLog, release_engineer_slots
+from .tracking import fields_changed
 
-@receiver(pre_save, sender=Request)
-def cache_previous_status(sender, instance, **kwargs):
-    if not instance.pk:
-        instance._previous_status = None
-        return
-    try:
-        previous = sender.objects.get(pk=instance.pk)
-        instance._previous_status = previous.status
-    except sender.DoesNotExist:
-        instance._previous_status = None
 
+@receiver(fields_changed, sender=Request)
+def notify_on_completion(sender, instance, created, changes, **kwargs):
+    status_change = changes.get("status")
+    if status_change and status_change.new == Request.Status.COMPLETED:
+        code = instance.reference_code
+        pending = notifications.build(
+            [instance.requestor_id],
+            f"Request {code} has been completed.",
+            related_request=instance,
+        )
+        pending += notifications.build(
+            [instance.engineer_id],
+            f"Request {code} closed by admin.",
+            related_request=instance,
+        )
+        notifications.dispatch(pending)
 
-@receiver(post_save, sender=Request)
-def notify_on_completion(sender, instance, created, **kwargs):
-    previous_status = getattr(instance, "_previous_status", None)
-    if instance.status == Request.Status.COMPLETED and previous_status != Request.Status.COMPLETED:
-        code = instance.reference_code or f"REQ-{instance.pk:05d}"
-        Notification.objects.create(
-            recipient=instance.requestor,
+
+@receiver(fields_changed, sender=Request)
+def notify_on_assignment(sender, instance, created, changes, **kwargs):
+    if instance.engineer_id and "engineer_id" in changes:
+        notifications.notify(
+            [instance.engineer_id],
+            f"You have been assigned to request {instance.reference_code}",
             related_request=instance,
-            message=f"Request {code} has been completed.",
         )
-        if instance.engineer:
-            Notification.objects.create(
-                recipient=instance.engineer,
-                related_request=instance,
-                message=f"Request {code} closed by admin.",
-            )
+
+
+@receiver(fields_changed, sender=Request)
+def push_request_change(sender, instance, created, changes, **kwargs):
+    broker = realtime.get_broker()
+    if not broker.publishes_saves:
+        return
+    engineer_change = changes.get("engineer_id")
+    previous_engineer_id = engineer_change.old if engineer_change else None
+    admin_ids = notifications.admin_ids()
+    transaction.on_commit(lambda: broker.request_saved(instance, admin_ids, previous_engineer_id))
+
+
+@receiver(fields_changed, sender=Request)
+def refresh_request_stats(sender, instance, created, changes, **kwargs):
+    analytics.schedule_rebuild(analytics.affected_days(instance, changes))
+
+
+@receiver(post_delete, sender=Request)
+def release_engineer_slot(sender, instance, **kwargs):
+    if instance.engineer_id and instance.status == Request.Status.ONGOING:
+        release_engineer_slots({instance.engineer_id: 1})
+
+
+@receiver(post_delete, sender=Request)
+def record_request_deletion(sender, instance, **kwargs):
+    # Sent inside the delete's transaction, like the other event writes.
+    RequestEvent.objects.create(
+        request_id=instance.pk,
+        kind=RequestEvent.Kind.DELETED,
+        data={"reference_code": instance.reference_code},
+    )
+
+
+@receiver(post_delete, sender=Request)
+def drop_request_stats(sender, instance, **kwargs):
+    analytics.schedule_rebuild(analytics.affected_days(instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_admin_roster(sender, instance, update_fields=None, **kwargs):
+    # The roster holds admin ids only, so logins (last_login saves) leave it valid.
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    notifications.invalidate_admin_roster()
+
+
+@receiver(fields_changed, sender=Notification)
+def track_unread_on_save(sender, instance, created, changes, **kwargs):
+    if created:
+        if not instance.is_read:
+            notifications.adjust_unread({instance.recipient_id: 1})
+        transaction.on_commit(lambda: realtime.get_broker().notifications_created([instance]))
+    elif "is_read" in changes:
+        notifications.adjust_unread({instance.recipient_id: -1 if instance.is_read else 1})
+
+
+@receiver(post_delete, sender=Notification)
+def track_unread_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        notifications.adjust_unread({instance.recipient_id: -1})
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def refresh_account_index(sender, instance, **kwargs):
+    autocomplete.bump_version()
 
 
 @receiver(post_save, sender=Request)
-def notify_on_assignment(sender, instance, created, **kwargs):
-    if not instance.engineer:
+def invalidate_request_fragments(sender, instance, **kwargs):
+    caching.invalidate_on_commit(f"request:{instance.pk}", "requests")
+
+
+@receiver(post_delete, sender=Request)
+def invalidate_deleted_request_fragments(sender, instance, **kwargs):
+    caching.invalidate_on_commit(f"request:{instance.pk}", f"logs:{instance.pk}", "requests")
+
+
+@receiver(post_save, sender=StatusLog)
+@receiver(post_delete, sender=StatusLog)
+def invalidate_status_log_fragments(sender, instance, **kwargs):
+    caching.invalidate_on_commit(f"logs:{instance.request_id}")
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_fragments(sender, instance, **kwargs):
+    caching.invalidate_on_commit(f"notifications:{instance.recipient_id}")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_fragments(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login only, which no fragment shows.
+    if update_fields and set(update_fields) <= {"last_login"}:
         return
-    previous_engineer_id = getattr(instance, "_previous_engineer_id", None)
-    if created or previous_engineer_id != instance.engineer_id:
-        code = instance.reference_code or f"REQ-{instance.pk:05d}"
-        Notification.objects.create(
-            recipient=instance.engineer,
-            related_request=instance,
-            message=f"You have been assigned to request {code}",
-        )
+    caching.invalidate_on_commit("users")
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_account_fragments(sender, instance, **kwargs):
+    caching.invalidate_on_commit("accounts")
+
+
+@receiver(post_save, sender=EngineerSkill)
+@receiver(post_delete, sender=EngineerSkill)
+def invalidate_engineer_skills(sender, instance, **kwargs):
+    caching.invalidate_on_commit("skills")
 
 
-@receiver(pre_save, sender=Request)
-def cache_previous_engineer(sender, instance, **kwargs):
-    if not instance.pk:
-        instance._previous_engineer_id = None
+@receiver(post_migrate)
+def repair_search_index(sender, using, plan=None, **kwargs):
+    # SQLite rebuilds a table (dropping its triggers) for many schema
+    # changes, so re-check the search triggers after every migrate.
+    if sender.name != "hub" or not plan:
         return
-    try:
-        previous = sender.objects.get(pk=instance.pk)
-        instance._previous_engineer_id = previous.engineer_id
-    except sender.DoesNotExist:
-        instance._previous_engineer_id = None
\ No newline at end of file
+    connection = connections[using]
+    if ("hub", "0006_request_search_index") in MigrationRecorder(connection).applied_migrations():
+        search.install(connection)
@@ -0,0 +1,50 @@
+"""Background tasks run by ``manage.py run_worker``."""
+
+import io
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from . import analytics, archive, jobs, notifications
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+@jobs.task("hub.check_sla", max_attempts=3)
+def check_sla():
+    output = io.StringIO()
+    call_command("check_sla", stdout=output)
+    logger.info(output.getvalue().strip())
+
+
+@jobs.task("hub.write_notifications")
+def write_notifications(rows, ignore_conflicts=False):
+    notifications.write([Notification(**row) for row in rows], ignore_conflicts=ignore_conflicts)
+
+
+@jobs.task("hub.prune_jobs", max_attempts=1)
+def prune_jobs():
+    removed = jobs.prune(timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS))
+    logger.info("Removed %s finished jobs.", removed)
+
+
+@jobs.task("hub.archive_requests", max_attempts=1)
+def archive_requests():
+    if not settings.ARCHIVE_AFTER_DAYS:
+        return
+    moved = archive.archive()
+    logger.info(
+        "Archived %s requests with %s status logs and %s notifications.",
+        moved.requests,
+        moved.status_logs,
+        moved.notifications,
+    )
+
+
+@jobs.task("hub.rebuild_request_stats", max_attempts=3)
+def rebuild_request_stats(day):
+    analytics.rebuild(days=[date.fromisoformat(day)])
@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.middleware import SESSION_KEY
+from accounts.models import User
+
+from hub.models import Account, Request
+
+
+# Views render templates without collectstatic having run, and each test
+# starts from an empty, private cache.
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class HubTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("test-admin", password="x", role=User.Roles.ADMIN)
+        cls.requestor = User.objects.create_user("test-requestor", password="x", role=User.Roles.REQUESTOR)
+        cls.engineers = [
+            User.objects.create_user(
+                f"test-engineer-{index}", password="x", role=User.Roles.ENGINEER, max_ongoing_requests=50
+            )
+            for index in range(2)
+        ]
+        cls.account = Account.objects.create(name="Acme")
+
+    def setUp(self):
+        cache.clear()
+
+    def make_request(self, **fields):
+        fields = {
+            "requestor": self.requestor,
+            "account": self.account,
+            "account_manager": "Manager",
+            "product_category": "Azure",
+            "engagement_type": "support",
+            **fields,
+        }
+        request = Request(**fields)
+        request.save()
+        return request
+
+    def login(self, user):
+        self.client.force_login(user)
+        session = self.client.session
+        session[SESSION_KEY] = True
+        session.save()
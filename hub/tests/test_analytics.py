@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.test import override_settings
+
+from hub import analytics, jobs
+from hub.models import DailyRequestStats, Job, Request
+
+from .base import HubTestCase
+
+
+class AnalyticsRebuildTests(HubTestCase):
+    def complete(self, request):
+        request.status = Request.Status.COMPLETED
+        request.save()
+        return request
+
+    def completed_on(self, day):
+        return sum(DailyRequestStats.objects.filter(day=day).values_list("completed", flat=True))
+
+    @override_settings(JOB_QUEUE_ANALYTICS=False)
+    def test_rebuilds_after_commit_without_the_worker(self):
+        request = self.make_request(engineer=self.engineers[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complete(request)
+        self.assertEqual(self.completed_on(request.end_date), 1)
+
+    @override_settings(JOB_QUEUE_ANALYTICS=True)
+    def test_queues_one_job_per_day_for_a_burst_of_changes(self):
+        first = self.make_request(engineer=self.engineers[0])
+        second = self.make_request(engineer=self.engineers[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complete(first)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.complete(second)
+        self.assertEqual(self.completed_on(first.end_date), 0)
+
+        queued = Job.objects.filter(task="hub.rebuild_request_stats")
+        self.assertEqual(
+            sorted(job.payload["day"] for job in queued),
+            sorted({first.start_date.isoformat(), first.end_date.isoformat()}),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            for job in queued:
+                jobs.run(job)
+        self.assertEqual(self.completed_on(first.end_date), 2)
+
+    def test_rebuild_replaces_the_rows_of_the_given_days(self):
+        request = self.complete(self.make_request(engineer=self.engineers[0]))
+        other_day = request.end_date - timedelta(days=3)
+        DailyRequestStats.objects.create(
+            day=other_day, account=self.account, priority="low", product_category="Azure", opened=9
+        )
+        analytics.rebuild(days=[request.end_date])
+        analytics.rebuild(days=[request.end_date])
+        self.assertEqual(self.completed_on(request.end_date), 1)
+        self.assertTrue(DailyRequestStats.objects.filter(day=other_day, opened=9).exists())
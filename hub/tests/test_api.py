@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from hub.models import Request
+
+from .base import HubTestCase
+
+
+class RequestListApiTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.requests = [self.make_request() for _ in range(3)]
+        self.login(self.admin)
+        self.url = reverse("hub:api-requests")
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 3)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_does_not_count_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse([query["sql"] for query in queries if "COUNT(" in query["sql"].upper()])
+
+    def test_etag_changes_when_a_request_changes(self):
+        etag = self.client.get(self.url)["ETag"]
+        request = self.requests[0]
+        request.description = "Updated"
+        request.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_changes_when_an_older_request_is_deleted(self):
+        # Deleting a row that is not the latest change leaves Max(updated_at) alone.
+        etag = self.client.get(self.url)["ETag"]
+        self.requests[0].delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_since_returns_only_later_changes(self):
+        moment = timezone.now()
+        Request.objects.filter(pk__in=[request.pk for request in self.requests]).update(
+            updated_at=moment - timedelta(hours=1)
+        )
+        Request.objects.filter(pk=self.requests[1].pk).update(updated_at=moment + timedelta(minutes=1))
+
+        response = self.client.get(self.url, {"since": moment.isoformat()})
+        self.assertEqual([row["id"] for row in response.json()["results"]], [self.requests[1].pk])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from hub import archive
+from hub.models import ArchivedRequest, Notification, Request
+
+from .base import HubTestCase
+
+
+class ArchiveTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        ended = timezone.localdate() - timedelta(days=400)
+        self.old = self.make_request(engineer=self.engineers[0])
+        self.old.status = Request.Status.COMPLETED
+        self.old.end_date = ended
+        self.old.save()
+        self.recent = self.make_request(engineer=self.engineers[0])
+        Notification.objects.create(recipient=self.admin, message="Old", related_request=self.old)
+        Notification.objects.create(recipient=self.admin, message="Recent", related_request=self.recent)
+
+    def test_archive_keeps_unread_counter_in_step(self):
+        moved = archive.archive(days=180)
+        self.assertEqual(moved.requests, 1)
+        self.assertTrue(ArchivedRequest.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Request.objects.filter(pk=self.old.pk).exists())
+        self.admin.refresh_from_db()
+        self.assertEqual(
+            self.admin.unread_notification_count,
+            Notification.objects.filter(recipient=self.admin, is_read=False).count(),
+        )
+
+    def test_detail_view_reads_archived_request(self):
+        archive.archive(days=180)
+        self.login(self.admin)
+        response = self.client.get(reverse("hub:request-detail", args=[self.old.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.old.reference_code)
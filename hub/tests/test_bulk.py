@@ -0,0 +1,62 @@
+from accounts.models import User
+
+from hub import bulk
+from hub.models import Notification, Request, RequestEvent
+
+from .base import HubTestCase
+
+
+class BulkActionTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = self.engineers
+        self.requests = [self.make_request(engineer=self.first) for _ in range(3)]
+        self.pks = [request.pk for request in self.requests]
+
+    def load(self, engineer):
+        return User.objects.values_list("ongoing_request_count", flat=True).get(pk=engineer.pk)
+
+    def test_assign_moves_the_counters_and_records_history(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            outcome = bulk.assign(self.pks, self.second.pk)
+        self.assertCountEqual(outcome.updated, self.pks)
+        self.assertEqual(outcome.errors, {})
+        self.assertEqual(self.load(self.first), 0)
+        self.assertEqual(self.load(self.second), 3)
+        self.assertEqual(
+            RequestEvent.objects.filter(request_id__in=self.pks, kind=RequestEvent.Kind.REASSIGNED).count(), 3
+        )
+        self.assertEqual(Notification.objects.filter(recipient=self.second).count(), 3)
+
+    def test_assign_skips_requests_past_the_engineers_capacity(self):
+        User.objects.filter(pk=self.second.pk).update(max_ongoing_requests=2)
+        outcome = bulk.assign(self.pks, self.second.pk)
+        self.assertEqual(len(outcome.updated), 2)
+        self.assertEqual(list(outcome.errors), [self.requests[2].reference_code])
+        self.assertEqual(self.load(self.first), 1)
+        self.assertEqual(self.load(self.second), 2)
+
+    def test_complete_and_reopen_keep_the_counters_in_step(self):
+        outcome = bulk.complete(self.pks)
+        self.assertCountEqual(outcome.updated, self.pks)
+        self.assertEqual(self.load(self.first), 0)
+        self.assertFalse(Request.objects.filter(pk__in=self.pks, end_date=None).exists())
+
+        outcome = bulk.reopen(self.pks[:2])
+        self.assertCountEqual(outcome.updated, self.pks[:2])
+        self.assertEqual(self.load(self.first), 2)
+
+    def test_unchanged_and_missing_requests_are_reported_not_written(self):
+        missing = max(self.pks) + 100
+        outcome = bulk.set_priority([*self.pks, missing], self.requests[0].priority)
+        self.assertEqual(outcome.updated, [])
+        self.assertEqual(outcome.errors, {f"#{missing}": "Request no longer exists."})
+        self.assertFalse(RequestEvent.objects.filter(kind=RequestEvent.Kind.PRIORITY_CHANGED).exists())
+
+    def test_nudge_reports_requests_without_an_engineer(self):
+        unassigned = self.make_request(engineer=None)
+        with self.captureOnCommitCallbacks(execute=True):
+            outcome = bulk.nudge([self.pks[0], unassigned.pk], "engineer", self.admin)
+        self.assertEqual(outcome.updated, [self.pks[0]])
+        self.assertIn(unassigned.reference_code, outcome.errors)
+        self.assertEqual(Notification.objects.filter(recipient=self.first).count(), 1)
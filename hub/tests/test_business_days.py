@@ -0,0 +1,98 @@
+import io
+from datetime import date, timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from hub import analytics
+from hub.business_days import BusinessCalendar, check_settings, get_calendar
+from hub.models import DailyRequestStats, Request, RequestEvent
+
+from .base import HubTestCase
+
+# Monday 2 March 2026; Wednesday 4 March is a holiday.
+MONDAY = date(2026, 3, 2)
+HOLIDAY = date(2026, 3, 4)
+
+
+class BusinessCalendarTests(SimpleTestCase):
+    def setUp(self):
+        self.calendar = BusinessCalendar([HOLIDAY, date(2026, 3, 7)])
+
+    def test_add_business_days_skips_weekends_and_holidays(self):
+        self.assertEqual(self.calendar.add_business_days(MONDAY, 0), MONDAY)
+        self.assertEqual(self.calendar.add_business_days(MONDAY, 1), date(2026, 3, 3))
+        self.assertEqual(self.calendar.add_business_days(MONDAY, 2), date(2026, 3, 5))
+        self.assertEqual(self.calendar.add_business_days(MONDAY, 4), date(2026, 3, 9))
+
+    def test_matches_a_day_by_day_walk(self):
+        for offset in range(14):
+            start = MONDAY + timedelta(days=offset)
+            for days in range(12):
+                day, left = start, days
+                while left:
+                    day += timedelta(days=1)
+                    left -= self.calendar.is_business_day(day)
+                self.assertEqual(self.calendar.add_business_days(start, days), day, (start, days))
+                self.assertEqual(self.calendar.business_days_between(start, day), days)
+
+    @override_settings(SLA_HOLIDAY_CALENDAR="XX")
+    def test_unknown_calendar_is_improperly_configured(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "PH"):
+            check_settings()
+
+    @override_settings(SLA_EXTRA_HOLIDAYS=["2026-02-30"])
+    def test_malformed_extra_holiday_is_improperly_configured(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_settings()
+
+
+class RecalculateDueDatesTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        get_calendar.cache_clear()
+        self.addCleanup(get_calendar.cache_clear)
+
+    def recalculate(self, *args):
+        call_command("recalculate_due_dates", *args, stdout=io.StringIO())
+
+    def test_moves_only_due_dates_still_on_the_sla_target(self):
+        derived = self.make_request()
+        chosen = self.make_request(due_date=derived.due_date + timedelta(days=30))
+        before = Request.objects.get(pk=derived.pk).updated_at
+
+        with override_settings(SLA_EXTRA_HOLIDAYS=[derived.start_date.isoformat(), derived.due_date.isoformat()]):
+            get_calendar.cache_clear()
+            target = get_calendar().add_business_days(derived.start_date, Request.SLA_DAYS[derived.priority])
+            self.recalculate()
+
+        derived_after = Request.objects.get(pk=derived.pk)
+        self.assertNotEqual(target, derived.due_date)
+        self.assertEqual(derived_after.due_date, target)
+        self.assertGreater(derived_after.updated_at, before)
+        event = RequestEvent.objects.get(request_id=derived.pk, kind=RequestEvent.Kind.DUE_DATE_CHANGED)
+        self.assertEqual(event.data, {"old": derived.due_date.isoformat(), "new": target.isoformat()})
+
+        self.assertEqual(Request.objects.get(pk=chosen.pk).due_date, chosen.due_date)
+        self.assertFalse(RequestEvent.objects.filter(request_id=chosen.pk, kind=RequestEvent.Kind.DUE_DATE_CHANGED))
+
+    def test_rebuilds_analytics_for_completed_requests(self):
+        request = self.make_request(engineer=self.engineers[0])
+        request.status = Request.Status.COMPLETED
+        request.end_date = request.due_date + timedelta(days=1)
+        request.save()
+        analytics.rebuild(days=[request.end_date])
+        self.assertEqual(self.on_time(request.end_date), 0)
+
+        # Making the old due date a holiday moves the target past the end date.
+        with override_settings(SLA_EXTRA_HOLIDAYS=[request.due_date.isoformat()]):
+            get_calendar.cache_clear()
+            self.recalculate("--status", "completed")
+
+        self.assertGreaterEqual(Request.objects.get(pk=request.pk).due_date, request.end_date)
+        self.assertEqual(self.on_time(request.end_date), 1)
+
+    @staticmethod
+    def on_time(day):
+        return sum(DailyRequestStats.objects.filter(day=day).values_list("completed_on_time", flat=True))
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.test import RequestFactory
+from django.utils import timezone
+
+from hub import caching
+from hub.models import Request
+
+from .base import HubTestCase
+
+
+class RequestRowCacheTests(HubTestCase):
+    def render_row(self, request):
+        return caching.request_rows(RequestFactory().get("/"), Request.objects.all(), [request.pk], "requestor")[0]
+
+    def test_row_turns_overdue_when_the_overdue_date_changes(self):
+        request = self.make_request()
+        due = datetime.combine(request.due_date, datetime.min.time(), tzinfo=dt_timezone.utc)
+        # 17:00 UTC on the due date is already the next day in Manila; the
+        # row must not be cached under that day while it is not overdue yet.
+        with mock.patch.object(timezone, "now", return_value=due + timedelta(hours=17)):
+            self.assertNotIn("table-danger", self.render_row(request))
+        with mock.patch.object(timezone, "now", return_value=due + timedelta(days=1, hours=3)):
+            self.assertIn("table-danger", self.render_row(request))
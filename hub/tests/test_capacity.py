@@ -0,0 +1,53 @@
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+
+from accounts.models import User
+
+from hub.models import Request
+
+from .base import HubTestCase
+
+
+class EngineerCapacityTests(HubTestCase):
+    def assertCountersMatchRecount(self):
+        ongoing = Counter(
+            Request.objects.filter(status=Request.Status.ONGOING, engineer__isnull=False).values_list(
+                "engineer_id", flat=True
+            )
+        )
+        for engineer in User.objects.filter(pk__in=[user.pk for user in self.engineers]):
+            self.assertEqual(engineer.ongoing_request_count, ongoing[engineer.pk], engineer.username)
+
+    def test_full_engineer_rejects_new_assignment(self):
+        engineer = self.engineers[0]
+        User.objects.filter(pk=engineer.pk).update(max_ongoing_requests=2)
+        self.make_request(engineer=engineer)
+        self.make_request(engineer=engineer)
+        with self.assertRaises(ValidationError) as raised:
+            self.make_request(engineer=engineer)
+        self.assertIn("engineer", raised.exception.message_dict)
+        self.assertEqual(Request.objects.filter(engineer=engineer).count(), 2)
+        self.assertCountersMatchRecount()
+
+    def test_counters_follow_assign_reassign_complete_and_delete(self):
+        first, second = self.engineers
+        request = self.make_request()
+        self.assertCountersMatchRecount()
+
+        request.engineer = first
+        request.save()
+        self.assertCountersMatchRecount()
+
+        request.engineer = second
+        request.save()
+        self.assertCountersMatchRecount()
+
+        request.status = Request.Status.COMPLETED
+        request.save()
+        self.assertCountersMatchRecount()
+
+        other = self.make_request(engineer=first)
+        self.assertCountersMatchRecount()
+        other.delete()
+        self.assertCountersMatchRecount()
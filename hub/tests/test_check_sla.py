@@ -0,0 +1,56 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from accounts.models import User
+
+from hub.management.commands.check_sla import Command
+from hub.models import Notification, Request
+
+from .base import HubTestCase
+
+
+class CheckSlaTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        # The sweep, like Request.is_overdue, compares against the UTC date.
+        self.today = timezone.now().date()
+        self.overdue = self.make_request(engineer=self.engineers[0])
+        self.move_due_date(self.overdue, self.today - timedelta(days=3))
+        self.make_request(engineer=self.engineers[1])
+        admins = User.objects.filter(role=User.Roles.ADMIN).values_list("pk", flat=True)
+        self.recipients = {*admins, self.engineers[0].pk}
+
+    def move_due_date(self, request, due_date):
+        Request.objects.filter(pk=request.pk).update(due_date=due_date)
+
+    def sweep(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("check_sla", stdout=io.StringIO())
+
+    def sla_notifications(self):
+        return Notification.objects.filter(kind=Notification.Kind.SLA_BREACH, related_request=self.overdue)
+
+    def test_notifies_admins_and_the_engineer_once(self):
+        self.sweep()
+        self.sweep()
+        self.assertCountEqual(self.sla_notifications().values_list("recipient_id", flat=True), self.recipients)
+
+    def test_second_run_finds_nothing_missing(self):
+        self.sweep()
+        self.assertEqual(Command().find_missing_notifications(self.today), [])
+
+    def test_a_new_due_date_is_notified_again(self):
+        self.sweep()
+        self.move_due_date(self.overdue, self.today - timedelta(days=1))
+        self.sweep()
+        self.assertEqual(self.sla_notifications().count(), 2 * len(self.recipients))
+
+    def test_concurrent_writes_are_ignored(self):
+        missing = Command().find_missing_notifications(self.today)
+        with self.captureOnCommitCallbacks(execute=True):
+            Command().create_notifications(missing)
+            Command().create_notifications(missing)
+        self.assertEqual(self.sla_notifications().count(), len(self.recipients))
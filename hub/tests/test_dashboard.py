@@ -0,0 +1,56 @@
+from hub.forms import DashboardFilterForm
+from hub.models import Account, Request
+from hub.pagination import KeysetPaginator
+
+from .base import HubTestCase
+
+
+class KeysetPaginationTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        # Few distinct engineers (and no engineer at all) so the leading
+        # key is heavily tied and includes NULLs.
+        for index in range(23):
+            self.make_request(engineer=self.engineers[index % 2] if index % 3 else None)
+        self.paginator = KeysetPaginator(Request.objects.all(), ("engineer_id", "id"), per_page=4)
+        self.expected = list(self.paginator.ordered().values_list("pk", flat=True))
+
+    def test_forward_pages_have_no_gaps_or_duplicates(self):
+        seen, cursor = [], None
+        while True:
+            page = self.paginator.page(cursor)
+            seen += [request.pk for request in page]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_backward_pages_have_no_gaps_or_duplicates(self):
+        cursor = None
+        while True:
+            page = self.paginator.page(cursor)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        seen = [request.pk for request in page]
+        while page.previous_cursor is not None:
+            page = self.paginator.page(page.previous_cursor, direction="prev")
+            seen = [request.pk for request in page] + seen
+        self.assertEqual(seen, self.expected)
+
+
+class DashboardFilterTests(HubTestCase):
+    def test_account_filter_matches_exact_name_then_prefix(self):
+        other = Account.objects.create(name="Acme Holdings")
+        first = self.make_request()
+        second = self.make_request(account=other)
+        unrelated = self.make_request(account=Account.objects.create(name="Globex"))
+
+        def matching(value):
+            form = DashboardFilterForm({"account": value})
+            return set(form.filter_queryset(Request.objects.all()).values_list("pk", flat=True))
+
+        self.assertEqual(matching(" acme "), {first.pk})
+        self.assertEqual(matching("acm"), {first.pk, second.pk})
+        self.assertEqual(matching("holdings"), set())
+        self.assertNotIn(unrelated.pk, matching("a"))
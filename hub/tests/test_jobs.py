@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from hub import jobs
+from hub.models import Job
+
+calls = []
+
+
+@jobs.task("tests.record", max_attempts=2, retry_backoff=60)
+def record(value):
+    calls.append(value)
+    if value == "fail":
+        raise RuntimeError("boom")
+
+
+class JobLeaseTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def queue(self, value="ok", **fields):
+        fields = {"task": "tests.record", "payload": {"value": value}, "max_attempts": 2, **fields}
+        return Job.objects.create(**fields)
+
+    def test_a_job_is_leased_to_one_worker(self):
+        job = self.queue()
+        self.assertEqual([claimed.pk for claimed in jobs.claim("first", 5)], [job.pk])
+        self.assertEqual(jobs.claim("second", 5), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.Status.RUNNING, "first", 1))
+
+    def test_jobs_are_not_claimed_before_run_at(self):
+        self.queue(run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(jobs.claim("first", 5), [])
+
+    def test_claim_respects_the_limit(self):
+        queued = [self.queue() for _ in range(3)]
+        self.assertEqual([job.pk for job in jobs.claim("first", 2)], [job.pk for job in queued[:2]])
+
+    def test_an_expired_lease_is_claimed_again(self):
+        job = self.queue(status=Job.Status.RUNNING, locked_by="dead", locked_until=timezone.now(), attempts=1)
+        self.assertEqual([claimed.pk for claimed in jobs.claim("first", 5)], [job.pk])
+        job.refresh_from_db()
+        self.assertEqual((job.locked_by, job.attempts), ("first", 2))
+
+    def test_an_expired_lease_on_the_last_attempt_fails_the_job(self):
+        job = self.queue(status=Job.Status.RUNNING, locked_by="dead", locked_until=timezone.now(), attempts=2)
+        with self.assertLogs("hub.jobs", "ERROR"):
+            self.assertEqual(jobs.claim("first", 5), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (Job.Status.FAILED, "lease expired"))
+
+    def test_a_failed_attempt_is_retried_later_then_given_up(self):
+        job = self.queue("fail")
+        [claimed] = jobs.claim("first", 5)
+        with self.assertLogs("hub.jobs", "WARNING"):
+            self.assertFalse(jobs.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("RuntimeError: boom", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        [claimed] = jobs.claim("first", 5)
+        with self.assertLogs("hub.jobs", "ERROR"):
+            self.assertFalse(jobs.run(claimed))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, calls), (Job.Status.FAILED, 2, ["fail", "fail"]))
+
+    def test_a_worker_that_lost_its_lease_does_not_record_the_outcome(self):
+        self.queue()
+        [claimed] = jobs.claim("slow", 5)
+        Job.objects.filter(pk=claimed.pk).update(locked_by="other")
+        self.assertTrue(jobs.run(claimed))
+        self.assertEqual(Job.objects.get(pk=claimed.pk).status, Job.Status.RUNNING)
+
+    def test_enqueue_with_a_dedupe_key_queues_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue("tests.record", {"value": "ok"}, dedupe_key="tests:once")
+            jobs.enqueue("tests.record", {"value": "ok"}, dedupe_key="tests:once")
+        self.assertEqual(Job.objects.filter(dedupe_key="tests:once").count(), 1)
+
+    @override_settings(JOB_SCHEDULE={"record": {"task": "tests.record", "every": 3600, "payload": {"value": "ok"}}})
+    def test_periodic_jobs_are_queued_once_per_interval(self):
+        now = timezone.now()
+        jobs.schedule_periodic(now)
+        jobs.schedule_periodic(now)
+        self.assertEqual(Job.objects.filter(dedupe_key__startswith="periodic:record:").count(), 1)
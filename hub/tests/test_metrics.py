@@ -0,0 +1,47 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from hub import metrics
+
+DEAD_PID = 999_999_999
+
+
+class MetricsDirectoryTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        override = override_settings(METRICS_DIR=str(self.directory))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write_dead_worker(self, requests):
+        registry = metrics.Registry()
+        registry.inc("hub_http_requests_total", {"view": "dead"}, requests)
+        registry.observe("hub_db_queries_per_request", {"view": "dead"}, 3)
+        (self.directory / f"{DEAD_PID}.json").write_text(json.dumps(registry.snapshot()))
+
+    def dead_total(self):
+        counters, histograms = metrics._totals(metrics.collect())
+        key = metrics._key({"view": "dead"})
+        return counters[("hub_http_requests_total", key)], histograms[("hub_db_queries_per_request", key)]["count"]
+
+    def test_retired_worker_keeps_counting(self):
+        self.write_dead_worker(5)
+        metrics.retire(self.directory, DEAD_PID)
+        self.assertFalse((self.directory / f"{DEAD_PID}.json").exists())
+        self.assertEqual(self.dead_total(), (5, 1))
+
+        # A second worker that used the same pid is added on top.
+        self.write_dead_worker(2)
+        metrics.retire(self.directory, DEAD_PID)
+        self.assertEqual(self.dead_total(), (7, 2))
+
+    def test_collect_folds_snapshots_of_exited_processes(self):
+        self.write_dead_worker(4)
+        self.assertEqual(self.dead_total(), (4, 1))
+        self.assertFalse((self.directory / f"{DEAD_PID}.json").exists())
+        self.assertEqual(self.dead_total(), (4, 1))
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+
+from accounts.models import User
+
+from hub import notifications
+from hub.models import Notification
+
+from .base import HubTestCase
+
+
+class UnreadCounterTests(HubTestCase):
+    def unread(self, user):
+        return User.objects.values_list("unread_notification_count", flat=True).get(pk=user.pk)
+
+    def test_dispatch_counts_new_notifications_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notifications.notify([self.admin.pk, self.requestor.pk], "Hello")
+        self.assertEqual(self.unread(self.admin), 1)
+        self.assertEqual(self.unread(self.requestor), 1)
+
+    def test_mark_all_read_only_removes_the_rows_it_marked(self):
+        Notification.objects.create(recipient=self.admin, message="One")
+        Notification.objects.create(recipient=self.admin, message="Two")
+        # A notification counted by another transaction but not yet visible.
+        User.objects.filter(pk=self.admin.pk).update(unread_notification_count=3)
+        self.assertEqual(notifications.mark_all_read(self.admin), 2)
+        self.assertEqual(self.admin.unread_notification_count, 1)
+
+    def test_mark_all_read_floors_a_drifted_counter_at_zero(self):
+        Notification.objects.create(recipient=self.admin, message="One")
+        Notification.objects.create(recipient=self.admin, message="Two")
+        User.objects.filter(pk=self.admin.pk).update(unread_notification_count=1)
+        self.assertEqual(notifications.mark_all_read(self.admin), 2)
+        self.assertEqual(self.admin.unread_notification_count, 0)
+
+    def test_recount_matches_the_notification_table(self):
+        Notification.objects.create(recipient=self.admin, message="One")
+        Notification.objects.create(recipient=self.admin, message="Two", is_read=True)
+        User.objects.filter(pk=self.admin.pk).update(unread_notification_count=7)
+        notifications.recount_unread([self.admin.pk])
+        self.assertEqual(self.unread(self.admin), 1)
+
+
+class AdminRosterTests(HubTestCase):
+    def test_login_keeps_the_cached_roster(self):
+        self.assertIn(self.admin.pk, notifications.admin_ids())
+        self.client.force_login(self.admin)
+        self.assertIsNotNone(cache.get(notifications.ADMIN_ROSTER_CACHE_KEY))
+
+    def test_role_change_refreshes_the_roster(self):
+        notifications.admin_ids()
+        self.requestor.role = User.Roles.ADMIN
+        self.requestor.save()
+        self.assertIn(self.requestor.pk, notifications.admin_ids())
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from hub.forms import RequestForm
+from hub.models import Request
+
+from .base import HubTestCase
+
+
+class RequestFormEngineerTests(HubTestCase):
+    def data(self, **fields):
+        return {
+            "account_name": "Acme",
+            "needed_by": (timezone.localdate() + timedelta(days=7)).isoformat(),
+            "product_category": "Azure",
+            "engagement_type": "support",
+            "description": "Edited",
+            **fields,
+        }
+
+    def save(self, instance=None, **fields):
+        form = RequestForm(self.data(**fields), instance=instance)
+        self.assertTrue(form.is_valid(), form.errors)
+        if instance is None:
+            form.instance.requestor = self.requestor
+            form.instance.account_manager = "Manager"
+        return form.save()
+
+    def test_new_request_without_engineer_is_assigned_automatically(self):
+        request = self.save(engineer="")
+        self.assertIsNotNone(request.engineer_id)
+
+    def test_edit_without_engineer_keeps_the_current_one(self):
+        request = self.make_request(engineer=self.engineers[1])
+        self.save(instance=Request.objects.get(pk=request.pk))
+        request.refresh_from_db()
+        self.assertEqual(request.engineer_id, self.engineers[1].pk)
+
+    def test_edit_does_not_assign_an_unassigned_request(self):
+        request = self.make_request(engineer=None)
+        self.save(instance=Request.objects.get(pk=request.pk), engineer="")
+        request.refresh_from_db()
+        self.assertIsNone(request.engineer_id)
+        self.assertEqual(request.description, "Edited")
+
+    def test_edit_can_reassign_explicitly(self):
+        request = self.make_request(engineer=self.engineers[0])
+        self.save(instance=Request.objects.get(pk=request.pk), engineer=self.engineers[1].pk)
+        request.refresh_from_db()
+        self.assertEqual(request.engineer_id, self.engineers[1].pk)
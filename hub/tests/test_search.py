@@ -0,0 +1,49 @@
+from unittest import skipUnless
+
+from django.db import connection
+
+from accounts.models import User
+
+from hub import search
+from hub.models import Request, StatusLog
+
+from .base import HubTestCase
+
+
+class SearchIndexTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.described = self.make_request(description="Firewall migration for the billing cluster")
+        self.logged = self.make_request(description="Quarterly review")
+        StatusLog.objects.create(request=self.logged, author=self.admin, message="Firewall rules exported")
+
+    def found(self, query, queryset=None):
+        return [request.pk for request in search.search(query, queryset or Request.objects.all())]
+
+    def test_description_hits_rank_above_status_log_hits(self):
+        self.assertEqual(self.found("firewall"), [self.described.pk, self.logged.pk])
+
+    def test_last_term_matches_as_a_prefix(self):
+        self.assertEqual(self.found("billing clus"), [self.described.pk])
+
+    def test_queryset_update_reaches_the_index(self):
+        Request.objects.filter(pk=self.described.pk).update(description="Network audit")
+        self.assertEqual(self.found("firewall"), [self.logged.pk])
+        self.assertEqual(self.found("audit"), [self.described.pk])
+
+    def test_cascading_delete_removes_status_log_hits(self):
+        self.logged.delete()
+        self.assertEqual(self.found("exported"), [])
+
+    def test_results_are_limited_to_the_queryset(self):
+        other = User.objects.create_user("other-requestor", password="x", role=User.Roles.REQUESTOR)
+        Request.objects.filter(pk=self.logged.pk).update(requestor=other)
+        self.assertEqual(self.found("firewall", Request.objects.filter(requestor=self.requestor)), [self.described.pk])
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 triggers only exist on SQLite")
+    def test_install_restores_dropped_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER hub_request_fts_au")
+        search.install()
+        Request.objects.filter(pk=self.described.pk).update(description="Network audit")
+        self.assertEqual(self.found("audit"), [self.described.pk])
@@ -0,0 +1,79 @@
+from typing import Any, NamedTuple
+
+from django.dispatch import Signal
+
+# Sent after a tracked model is saved with ``instance``, ``created`` and
+# ``changes`` (a dict of field attname -> FieldChange).
+fields_changed = Signal()
+
+
+class FieldChange(NamedTuple):
+    old: Any
+    new: Any
+
+
+class FieldTrackerMixin:
+    """Remember the database values of ``tracked_fields`` when a row is loaded.
+
+    ``from_db`` keeps a snapshot of the loaded values so callers can ask what
+    changed before a save without re-reading the row. ``tracked_fields`` use
+    attnames (``engineer_id`` rather than ``engineer``).
+    """
+
+    tracked_fields: tuple = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.tracked_fields
+        }
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._reset_loaded_values(fields)
+
+    def previous_value(self, field):
+        return getattr(self, "_loaded_values", {}).get(field)
+
+    def has_changed(self, field):
+        return self.previous_value(field) != getattr(self, field)
+
+    def get_changes(self, fields=None):
+        """Changed tracked fields, limited to ``fields`` (e.g. ``update_fields``) when given."""
+        names = self.tracked_fields
+        if fields is not None:
+            saved = {self._meta.get_field(name).attname for name in fields}
+            names = [name for name in names if name in saved]
+        return {
+            field: FieldChange(self.previous_value(field), getattr(self, field))
+            for field in names
+            if self.has_changed(field)
+        }
+
+    def _ensure_loaded_values(self):
+        """Fetch the snapshot for instances that were not loaded through ``from_db``."""
+        if self.pk is None:
+            return
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            loaded = self._loaded_values = {}
+        missing = [field for field in self.tracked_fields if field not in loaded]
+        if missing:
+            row = type(self)._base_manager.filter(pk=self.pk).values(*missing).first()
+            loaded.update(row or {})
+
+    def _reset_loaded_values(self, fields=None):
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            loaded = self._loaded_values = {}
+        names = set(self.tracked_fields)
+        if fields is not None:
+            names &= {self._meta.get_field(name).attname for name in fields}
+        for name in names:
+            loaded[name] = getattr(self, name)
+
+    def _send_field_changes(self, created, changes):
+        if created or changes:
+            fields_changed.send(sender=type(self), instance=self, created=created, changes=changes)
@@ -1,15 +1,31 @@
 from django.urls import path
 
+from .api import (
+    NotificationDetailApiView,
+    NotificationListApiView,
+    RequestBulkApiView,
+    RequestDetailApiView,
+    RequestEventListApiView,
+    RequestListApiView,
+    StatusLogListApiView,
+)
 from .views import (
+    AccountAutocompleteView,
+    AnalyticsView,
     DashboardView,
+    MetricsView,
     NotificationListView,
+    NotificationMarkAllReadView,
+    NotificationStreamView,
     NotificationReadView,
     RequestAdminUpdateView,
+    RequestBulkActionView,
     RequestDeleteView,
     RequestDetailView,
     RequestExportCSVView,
     RequestNudgeView,
     RequestOutlookRedirectView,
+    RequestSearchView,
     RequestTeamsRedirectView,
     RequestUpdateView,
 )
@@ -18,7 +34,19 @@ app_name = "hub"
 
 urlpatterns = [
     path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("analytics/", AnalyticsView.as_view(), name="analytics"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("api/requests/", RequestListApiView.as_view(), name="api-requests"),
+    path("api/requests/bulk/", RequestBulkApiView.as_view(), name="api-request-bulk"),
+    path("api/requests/<int:pk>/", RequestDetailApiView.as_view(), name="api-request"),
+    path("api/status-logs/", StatusLogListApiView.as_view(), name="api-status-logs"),
+    path("api/request-events/", RequestEventListApiView.as_view(), name="api-request-events"),
+    path("api/notifications/", NotificationListApiView.as_view(), name="api-notifications"),
+    path("api/notifications/<int:pk>/", NotificationDetailApiView.as_view(), name="api-notification"),
+    path("api/accounts/autocomplete/", AccountAutocompleteView.as_view(), name="account-autocomplete"),
+    path("requests/search/", RequestSearchView.as_view(), name="request-search"),
     path("requests/export/csv/", RequestExportCSVView.as_view(), name="request-export"),
+    path("requests/bulk/", RequestBulkActionView.as_view(), name="request-bulk"),
     path("requests/<int:pk>/", RequestDetailView.as_view(), name="request-detail"),
     path("requests/<int:pk>/edit/", RequestUpdateView.as_view(), name="request-edit"),
     path("requests/<int:pk>/manage/", RequestAdminUpdateView.as_view(), name="request-manage"),
@@ -27,5 +55,7 @@ urlpatterns = [
     path("requests/<int:pk>/outlook/", RequestOutlookRedirectView.as_view(), name="request-outlook"),
     path("requests/<int:pk>/delete/", RequestDeleteView.as_view(), name="request-delete"),
     path("notifications/", NotificationListView.as_view(), name="notifications"),
+    path("notifications/stream/", NotificationStreamView.as_view(), name="notification-stream"),
+    path("notifications/read-all/", NotificationMarkAllReadView.as_view(), name="notification-read-all"),
     path("notifications/<int:pk>/read/", NotificationReadView.as_view(), name="notification-read"),
 ]
@@ -1,8 +1,14 @@
+import asyncio
 import csv
+import heapq
+import zlib
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponse, HttpResponseRedirect
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseNotModified, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
@@ -12,10 +18,16 @@ from urllib.parse import quote
 
 from accounts.models import User
 
-from .forms import RequestAdminForm, RequestForm, StatusLogForm
-from .constants import ACCOUNT_NAME_SUGGESTIONS
-from .models import Notification, Request
+from . import analytics, assignment, caching, metrics, notifications, realtime, search
+from .autocomplete import get_index
+from .forms import BulkActionForm, DashboardFilterForm, RequestAdminForm, RequestExportFilterForm, RequestForm, StatusLogForm
+from .models import ArchivedRequest, Notification, Request
 from .mixins import AdminRequiredMixin
+from .pagination import InvalidCursor, KeysetPaginator
+
+PRIORITY_LABELS = dict(Request.Priority.choices)
+STATUS_LABELS = dict(Request.Status.choices)
+ENGAGEMENT_LABELS = dict(Request.Engagement.choices)
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
@@ -25,27 +37,58 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         context["role"] = user.role
-        context["notifications"] = user.notifications.filter(is_read=False)[:10]
+        context["notifications"] = (
+            caching.summary(
+                "notifications",
+                (f"notifications:{user.pk}",),
+                lambda: list(user.notifications.filter(is_read=False)[:10]),
+                user.pk,
+            )
+            if user.unread_notification_count
+            else []
+        )
 
+        # Rows come from the fragment cache, so only their keys are listed here.
         if user.role == User.Roles.REQUESTOR:
-            context["requests"] = Request.objects.filter(requestor=user).select_related("account", "engineer")
+            requests = Request.objects.filter(requestor=user).values_list("pk", flat=True)
             context["form"] = kwargs.get("form") or RequestForm()
-            context["account_name_choices"] = ACCOUNT_NAME_SUGGESTIONS
         elif user.role == User.Roles.ENGINEER:
-            context["requests"] = (
-                Request.objects.filter(engineer=user)
-                .select_related("account", "requestor")
-                .order_by("status", "due_date")
-            )
+            requests = Request.objects.filter(engineer=user).order_by("status", "due_date").values_list("pk", flat=True)
         else:
-            context["requests"] = (
-                Request.objects.select_related("account", "engineer", "requestor")
-                .order_by("status", "due_date")
+            filter_form = DashboardFilterForm(self.request.GET or None)
+            queryset = filter_form.filter_queryset(Request.objects.only("pk", "status", "due_date"))
+            paginator = KeysetPaginator(
+                queryset,
+                keys=("status", "due_date", "id"),
+                per_page=settings.DASHBOARD_PAGE_SIZE,
+            )
+            before = self.request.GET.get("before")
+            cursor = before or self.request.GET.get("after")
+            try:
+                page = paginator.page(cursor, direction="prev" if before else "next")
+            except InvalidCursor:
+                page = paginator.page()
+            params = self.request.GET.copy()
+            params.pop("after", None)
+            params.pop("before", None)
+            requests = [item.pk for item in page]
+            context["page"] = page
+            context["filter_form"] = filter_form
+            context["bulk_form"] = BulkActionForm()
+            context["filter_query"] = params.urlencode()
+            today = timezone.now().date()
+            context["overdue_count"] = caching.summary(
+                "overdue",
+                ("requests",),
+                lambda: Request.objects.filter(status=Request.Status.ONGOING, due_date__lt=today).count(),
+                today,
             )
-            context["overdue_count"] = Request.objects.filter(
-                status=Request.Status.ONGOING,
-                due_date__lt=timezone.now().date(),
-            ).count()
+        context["request_rows"] = caching.request_rows(
+            self.request,
+            Request.objects.select_related("account", "engineer", "requestor"),
+            list(requests),
+            user.role,
+        )
         return context
 
     def post(self, request, *args, **kwargs):
@@ -57,31 +100,44 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             req.requestor = request.user
             full_name = request.user.get_full_name().strip()
             req.account_manager = full_name or request.user.username
-            req.save()
+            assignment.save_request(req)
             messages.success(request, "Request submitted successfully.")
             return redirect("hub:dashboard")
         context = self.get_context_data(form=form)
         return self.render_to_response(context)
 
 
+def visible_requests(user, queryset=None):
+    """Requests ``user`` may read: their own as requestor or engineer, all for admins."""
+    qs = Request.objects.all() if queryset is None else queryset
+    if user.role == User.Roles.REQUESTOR:
+        return qs.filter(requestor=user)
+    if user.role == User.Roles.ENGINEER:
+        return qs.filter(engineer=user)
+    return qs
+
+
 class RequestDetailView(LoginRequiredMixin, DetailView):
     model = Request
     template_name = "hub/request_detail.html"
     context_object_name = "request_obj"
 
     def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
-        if user.role == User.Roles.REQUESTOR:
-            return qs.filter(requestor=user)
-        if user.role == User.Roles.ENGINEER:
-            return qs.filter(engineer=user)
-        return qs
+        return visible_requests(self.request.user, super().get_queryset().select_related("account", "engineer"))
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            # Old completed requests live on in the archive (hub.archive).
+            archived = ArchivedRequest.objects.select_related("account", "engineer")
+            return get_object_or_404(visible_requests(self.request.user, archived), pk=self.kwargs["pk"])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         request_obj = context["request_obj"]
-        context["status_logs"] = request_obj.status_logs.select_related("author")
+        context["status_log_list"] = caching.status_log_list(request_obj)
+        context["timeline"] = caching.timeline(request_obj)
         can_comment = self._user_can_comment(self.request.user, request_obj)
         context["can_comment"] = can_comment
         if can_comment:
@@ -106,7 +162,7 @@ class RequestDetailView(LoginRequiredMixin, DetailView):
 
     @staticmethod
     def _user_can_comment(user, request_obj):
-        if not user.is_authenticated:
+        if not user.is_authenticated or request_obj.is_archived:
             return False
         if user.role == User.Roles.ADMIN:
             return True
@@ -116,28 +172,66 @@ class RequestDetailView(LoginRequiredMixin, DetailView):
             return True
         return False
 
-    def _notify_status_update(self, log):
+    @staticmethod
+    def _notify_status_update(log):
         request_obj = log.request
         author = log.author
         author_name = author.get_full_name() or author.username
-        recipients = {}
-
-        if request_obj.engineer:
-            recipients[request_obj.engineer.pk] = request_obj.engineer
-        if request_obj.requestor:
-            recipients[request_obj.requestor.pk] = request_obj.requestor
-
-        for admin in User.objects.filter(role=User.Roles.ADMIN):
-            recipients[admin.pk] = admin
-
-        for user in recipients.values():
-            if user.pk == author.pk:
-                continue
-            Notification.objects.create(
-                recipient=user,
-                message=f"{author_name} posted an update on {request_obj.reference_code or 'a request'}.",
-                related_request=request_obj,
-            )
+        notifications.notify_admins(
+            f"{author_name} posted an update on {request_obj.reference_code or 'a request'}.",
+            related_request=request_obj,
+            also=(request_obj.engineer_id, request_obj.requestor_id),
+            exclude=(author.pk,),
+        )
+
+
+class AnalyticsView(AdminRequiredMixin, LoginRequiredMixin, TemplateView):
+    """SLA and throughput reports, read from the daily rollups only."""
+
+    template_name = "hub/analytics.html"
+    month_choices = (3, 6, 12, 24)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            months = int(self.request.GET.get("months", 12))
+        except ValueError:
+            months = 12
+        if months not in self.month_choices:
+            months = 12
+        since, until = analytics.default_window(months)
+        monthly = analytics.monthly(since, until)
+        engineers = analytics.by_engineer(since, until)
+        names = User.objects.in_bulk([row["engineer_id"] for row in engineers if row["engineer_id"]])
+        for row in engineers:
+            engineer = names.get(row["engineer_id"])
+            row["name"] = (engineer.get_full_name() or engineer.username) if engineer else "Unassigned"
+        totals = {metric: sum(row[metric] for row in monthly) for metric in analytics.METRICS}
+        context.update(
+            months=months,
+            month_choices=self.month_choices,
+            since=since,
+            monthly=monthly,
+            peak_opened=max([row["opened"] for row in monthly] + [1]),
+            engineers=engineers,
+            accounts=analytics.by_account(since, until),
+            totals=analytics.with_rates(totals),
+        )
+        return context
+
+
+class RequestSearchView(LoginRequiredMixin, TemplateView):
+    template_name = "hub/search.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "").strip()
+        context["query"] = query
+        context["results"] = search.search(
+            query,
+            visible_requests(self.request.user).select_related("account", "engineer"),
+        )
+        return context
 
 
 class RequestAdminUpdateView(AdminRequiredMixin, LoginRequiredMixin, UpdateView):
@@ -146,6 +240,15 @@ class RequestAdminUpdateView(AdminRequiredMixin, LoginRequiredMixin, UpdateView)
     template_name = "hub/request_admin_form.html"
     success_url = reverse_lazy("hub:dashboard")
 
+    def get_initial(self):
+        initial = super().get_initial()
+        request_obj = self.object
+        if not request_obj.engineer_id and request_obj.status == Request.Status.ONGOING:
+            proposed = assignment.propose(request_obj)
+            if proposed:
+                initial["engineer"] = proposed.pk
+        return initial
+
     def form_valid(self, form):
         messages.success(self.request, "Request updated.")
         return super().form_valid(form)
@@ -172,7 +275,6 @@ class RequestUpdateView(LoginRequiredMixin, UpdateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["account_name_choices"] = context["form"].account_name_suggestions
         context["is_edit"] = True
         return context
 
@@ -201,15 +303,45 @@ class RequestNudgeView(AdminRequiredMixin, LoginRequiredMixin, View):
             target_label = "Account Manager"
 
         sender_name = request.user.get_full_name() or request.user.username
-        Notification.objects.create(
-            recipient=recipient,
-            message=f"{sender_name} requested an update on {request_obj.reference_code}.",
+        notifications.notify(
+            [recipient.pk],
+            f"{sender_name} requested an update on {request_obj.reference_code}.",
             related_request=request_obj,
         )
         messages.success(request, f"{target_label} notified for {request_obj.reference_code}.")
         return redirect("hub:dashboard")
 
 
+class RequestBulkActionView(AdminRequiredMixin, LoginRequiredMixin, View):
+    """Apply one action to every request ticked on the dashboard."""
+
+    listed_errors = 10
+
+    def post(self, request):
+        redirect_to = request.META.get("HTTP_REFERER", reverse("hub:dashboard"))
+        form = BulkActionForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return HttpResponseRedirect(redirect_to)
+
+        outcome = form.apply(request.user)
+        count = len(outcome.updated)
+        verb = "notified" if form.cleaned_data["action"] == "nudge" else "updated"
+        if count:
+            messages.success(request, f"{count} request{'s' if count != 1 else ''} {verb}.")
+        elif not outcome.errors:
+            messages.info(request, "The selected requests already had that value.")
+        if outcome.errors:
+            skipped = [f"{code}: {message}" for code, message in list(outcome.errors.items())[: self.listed_errors]]
+            remaining = len(outcome.errors) - len(skipped)
+            if remaining:
+                skipped.append(f"and {remaining} more")
+            messages.warning(request, "Skipped " + "; ".join(skipped))
+        return HttpResponseRedirect(redirect_to)
+
+
 class RequestDeleteView(LoginRequiredMixin, DeleteView):
     model = Request
     success_url = reverse_lazy("hub:dashboard")
@@ -317,8 +449,23 @@ class RequestOutlookRedirectView(AdminRequiredMixin, LoginRequiredMixin, View):
         )
 
 
+class Echo:
+    """File-like object whose ``write`` hands the value back for streaming."""
+
+    def write(self, value):
+        return value
+
+
 class RequestExportCSVView(AdminRequiredMixin, LoginRequiredMixin, View):
-    """Allow administrators to export all requests to a CSV download."""
+    """Allow administrators to export requests to a streamed CSV download.
+
+    Rows are read in chunks as plain tuples and written out as they arrive, so
+    memory stays flat regardless of how many requests match. Archived
+    requests are included. Accepts the dashboard filters plus
+    ``start_from``/``start_to`` and ``gzip=1``.
+    """
+
+    chunk_size = 2000
 
     columns = (
         "Reference",
@@ -338,40 +485,125 @@ class RequestExportCSVView(AdminRequiredMixin, LoginRequiredMixin, View):
         "Updated",
     )
 
+    fields = (
+        "reference_code",
+        "account__name",
+        "requestor__first_name",
+        "requestor__last_name",
+        "requestor__username",
+        "requestor__email",
+        "engineer__first_name",
+        "engineer__last_name",
+        "engineer__username",
+        "engineer__email",
+        "priority",
+        "status",
+        "engagement_type",
+        "start_date",
+        "due_date",
+        "end_date",
+        "description",
+        "created_at",
+        "updated_at",
+    )
+
     def get(self, request, *args, **kwargs):
-        timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="requests-{timestamp}.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow(self.columns)
-
-        queryset = Request.objects.select_related("account", "requestor", "engineer").order_by("reference_code")
-        for req in queryset:
-            requestor = req.requestor
-            engineer = req.engineer
-            writer.writerow(
-                [
-                    req.reference_code,
-                    req.account.name if req.account else "",
-                    requestor.get_full_name() or requestor.username if requestor else "",
-                    requestor.email if requestor else "",
-                    engineer.get_full_name() or engineer.username if engineer else "",
-                    engineer.email if engineer else "",
-                    req.get_priority_display(),
-                    req.get_status_display(),
-                    req.get_engagement_type_display(),
-                    req.start_date.strftime("%Y-%m-%d") if req.start_date else "",
-                    req.due_date.strftime("%Y-%m-%d") if req.due_date else "",
-                    req.end_date.strftime("%Y-%m-%d") if req.end_date else "",
-                    (req.description or "").replace("\r\n", " ").replace("\n", " "),
-                    req.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    req.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                ]
-            )
+        filter_form = RequestExportFilterForm(request.GET or None)
+        if filter_form.is_bound and not filter_form.is_valid():
+            messages.error(request, "Unable to export requests. Check the export filters and try again.")
+            return redirect("hub:dashboard")
 
+        rows = self.rows(filter_form, Request.objects.all())
+        if filter_form.includes_archived():
+            # Both streams are sorted by reference code; merging keeps the file sorted.
+            rows = heapq.merge(rows, self.rows(filter_form, ArchivedRequest.objects.all()), key=lambda row: row[0])
+        timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+        content = self.stream_rows(rows)
+        filename = f"requests-{timestamp}.csv"
+        content_type = "text/csv"
+        if request.GET.get("gzip") in {"1", "true", "on"}:
+            content = self.gzip_stream(content)
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
+    def rows(self, filter_form, queryset):
+        return (
+            filter_form.filter_queryset(queryset)
+            .order_by("reference_code")
+            .values_list(*self.fields)
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def stream_rows(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.columns)
+        for row in rows:
+            yield writer.writerow(self.format_row(row))
+
+    @staticmethod
+    def gzip_stream(chunks, min_flush=64 * 1024):
+        compressor = zlib.compressobj(wbits=31)
+        pending = []
+        pending_size = 0
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                pending.append(data)
+                pending_size += len(data)
+            if pending_size >= min_flush:
+                yield b"".join(pending)
+                pending = []
+                pending_size = 0
+        pending.append(compressor.flush())
+        yield b"".join(pending)
+
+    @staticmethod
+    def format_row(row):
+        (
+            reference_code,
+            account_name,
+            requestor_first,
+            requestor_last,
+            requestor_username,
+            requestor_email,
+            engineer_first,
+            engineer_last,
+            engineer_username,
+            engineer_email,
+            priority,
+            status,
+            engagement_type,
+            start_date,
+            due_date,
+            end_date,
+            description,
+            created_at,
+            updated_at,
+        ) = row
+        requestor_name = f"{requestor_first or ''} {requestor_last or ''}".strip() or requestor_username or ""
+        engineer_name = f"{engineer_first or ''} {engineer_last or ''}".strip() or engineer_username or ""
+        return [
+            reference_code,
+            account_name or "",
+            requestor_name,
+            requestor_email or "",
+            engineer_name,
+            engineer_email or "",
+            PRIORITY_LABELS.get(priority, priority),
+            STATUS_LABELS.get(status, status),
+            ENGAGEMENT_LABELS.get(engagement_type, engagement_type),
+            start_date.strftime("%Y-%m-%d") if start_date else "",
+            due_date.strftime("%Y-%m-%d") if due_date else "",
+            end_date.strftime("%Y-%m-%d") if end_date else "",
+            (description or "").replace("\r\n", " ").replace("\n", " "),
+            created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+        ]
+
 
 class NotificationListView(LoginRequiredMixin, ListView):
     model = Notification
@@ -387,3 +619,96 @@ class NotificationReadView(LoginRequiredMixin, View):
         notification = get_object_or_404(Notification, pk=pk, recipient=request.user)
         notification.mark_read()
         return HttpResponseRedirect(request.META.get("HTTP_REFERER", reverse("hub:notifications")))
+
+
+class NotificationMarkAllReadView(LoginRequiredMixin, View):
+    def post(self, request):
+        notifications.mark_all_read(request.user)
+        return HttpResponseRedirect(request.META.get("HTTP_REFERER", reverse("hub:notifications")))
+
+
+class NotificationStreamView(View):
+    """Server-Sent Events stream of new notifications and request changes.
+
+    Only served under ASGI; elsewhere, and for anonymous users, it answers
+    204 so the browser's EventSource stops reconnecting. Streams close after
+    ``REALTIME_MAX_STREAM_SECONDS`` and the client resumes with
+    ``Last-Event-ID``, which bounds the cost of clients that vanish silently.
+    """
+
+    retry_ms = 3000
+
+    async def get(self, request):
+        user = await sync_to_async(self._authenticated_user)(request)
+        if user is None or not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        missed = []
+        if last_event_id:
+            missed = await sync_to_async(realtime.replay_notifications)(user, last_event_id)
+        response = StreamingHttpResponse(self.stream(user.pk, missed), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def _authenticated_user(request):
+        user = request.user
+        return user if user.is_authenticated else None
+
+    async def stream(self, user_id, missed):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.REALTIME_MAX_STREAM_SECONDS
+        async with realtime.get_broker().subscribe(user_id) as queue:
+            yield f"retry: {self.retry_ms}\n\n"
+            for event in missed:
+                yield event.encode()
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=min(settings.REALTIME_HEARTBEAT_SECONDS, remaining),
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.encode()
+
+
+class AccountAutocompleteView(LoginRequiredMixin, View):
+    """JSON account-name suggestions for the request form's ``q`` prefix."""
+
+    max_results = 25
+
+    def get(self, request):
+        index = get_index()
+        etag = f'"accounts-{index.version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            try:
+                limit = min(int(request.GET.get("limit", 10)), self.max_results)
+            except ValueError:
+                limit = 10
+            response = JsonResponse({"results": index.search(request.GET.get("q", ""), limit=max(limit, 1))})
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, max-age=300"
+        return response
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint; needs ``METRICS_TOKEN`` as a bearer token, or an admin session."""
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        authorized = bool(token) and request.headers.get("Authorization") == f"Bearer {token}"
+        user = request.user
+        if not authorized and not (user.is_authenticated and user.role == User.Roles.ADMIN):
+            return HttpResponse(status=403)
+        return HttpResponse(
+            metrics.render(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
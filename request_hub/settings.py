@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "hub.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -49,6 +51,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "accounts.middleware.ProfileCompletionMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -74,6 +77,14 @@ WSGI_APPLICATION = "request_hub.wsgi.application"
 ASGI_APPLICATION = "request_hub.asgi.application"
 
 DB_NAME = os.getenv("DB_NAME")
+# Seconds to keep a database connection open between requests ("none" for no
+# limit). Async requests run on short-lived threads whose connections cannot be
+# reused, so the ASGI server profile defaults to closing them; put a pooler in
+# front instead (DB_POOLER=pgbouncer, with DB_HOST/DB_PORT pointing at it).
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi").lower()
+DB_POOLER = os.getenv("DB_POOLER", "").lower()
+db_conn_max_age = os.getenv("DB_CONN_MAX_AGE", "0" if SERVER_MODE == "asgi" else "60")
+DB_CONN_MAX_AGE = None if db_conn_max_age.lower() == "none" else int(db_conn_max_age)
 if DB_NAME:
     DATABASES = {
         "default": {
@@ -83,6 +94,11 @@ if DB_NAME:
             "PASSWORD": os.getenv("DB_PASSWORD", "requesthub"),
             "HOST": os.getenv("DB_HOST", "db"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_MAX_AGE != 0,
+            # Transaction-mode poolers hand each transaction to any server
+            # connection, which breaks the named cursors behind .iterator().
+            "DISABLE_SERVER_SIDE_CURSORS": DB_POOLER == "pgbouncer",
         }
     }
 else:
@@ -90,9 +106,36 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
         }
     }
 
+# CACHE_BACKEND is "file" (default; shared by every process on the host),
+# "redis" (any Redis-compatible server; needs the redis package and is what
+# docker-compose runs), "locmem" (per process, only for a single process) or a
+# dotted backend path. Invalidations and version counters must reach every
+# gunicorn worker and the job worker, so multi-process setups need a shared one.
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_LOCATIONS = {
+    "locmem": "request-hub",
+    "file": os.path.join(tempfile.gettempdir(), "request-hub-cache"),
+    "redis": "redis://localhost:6379/1",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_LOCATIONS.get(CACHE_BACKEND, "")),
+    }
+}
+if CACHE_BACKEND in ("locmem", "file"):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "20000"))}
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "3600"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -122,6 +165,50 @@ LOGOUT_REDIRECT_URL = "login"
 
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Public holidays skipped by SLA due-date maths: a calendar from
+# hub.business_days.HOLIDAY_CALENDARS (empty to disable) plus ISO dates.
+SLA_HOLIDAY_CALENDAR = os.getenv("SLA_HOLIDAY_CALENDAR", "PH")
+SLA_EXTRA_HOLIDAYS = [day.strip() for day in os.getenv("SLA_EXTRA_HOLIDAYS", "").split(",") if day.strip()]
+
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "50"))
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+
+# Server-Sent Events push channel (served only under ASGI). "polling" reads
+# new rows from the database once per process; "local" relays saves made in
+# the same process and suits runserver-style single-process setups.
+REALTIME_BROKER = os.getenv("REALTIME_BROKER", "polling")
+REALTIME_POLL_INTERVAL = float(os.getenv("REALTIME_POLL_INTERVAL", "2"))
+REALTIME_HEARTBEAT_SECONDS = 15
+REALTIME_MAX_STREAM_SECONDS = int(os.getenv("REALTIME_MAX_STREAM_SECONDS", "300"))
+
+# Request instrumentation, scraped from /metrics. Set METRICS_DIR to a
+# directory shared by the app server's worker processes to report their sum.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "50"))
+
+# Background jobs, run by ``python manage.py run_worker``.
+JOB_WORKER_THREADS = int(os.getenv("JOB_WORKER_THREADS", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+JOB_QUEUE_NOTIFICATIONS = os.getenv("JOB_QUEUE_NOTIFICATIONS", "False").lower() == "true"
+# Rebuild analytics rollups in the worker instead of after each commit.
+JOB_QUEUE_ANALYTICS = os.getenv("JOB_QUEUE_ANALYTICS", "True").lower() == "true"
+JOB_SCHEDULE = {
+    "check-sla": {"task": "hub.check_sla", "every": int(os.getenv("SLA_CHECK_INTERVAL", "3600"))},
+    "prune-jobs": {"task": "hub.prune_jobs", "every": 24 * 60 * 60},
+    "archive-requests": {"task": "hub.archive_requests", "every": 24 * 60 * 60},
+}
+
+# Completed requests older than this many days (by end date) move to the
+# archive tables, see hub.archive; 0 disables archiving. Set
+# ARCHIVE_PARTITIONING before the first migrate to create the PostgreSQL
+# archive tables partitioned by year of created_at.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_PARTITIONING = os.getenv("ARCHIVE_PARTITIONING", "False").lower() == "true"
+
 PROFILE_COMPLETION_EXEMPT_URLS = [
     "accounts:update",
     "logout",